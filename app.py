@@ -1,32 +1,246 @@
 import hashlib
 import sys
+import threading
+import time
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
 from pandas import DataFrame
-from typing import List,Dict,Any
+from typing import List,Dict,Any,Mapping
 
 from util.data_load.google_sheet import get_now_datetime
-from util.data_load.google_sheet import GoogleSheet
+from util.data_load.store import TabularStore, create_store
+from util.data_load.schema import TRACKER_SCHEMA, TIME_FORMAT
+from util.data_load.fleet_snapshot import FleetSnapshot
+from util.data_load.sheet_poller import SheetPoller
+from util.data_load.snapshot_holder import SharedState, SnapshotHolder
+from util.data_load.audit_queue import AuditQueue
+from util.map.kakao import KAKAO_SDK_URL, kakao_map
+from util.map.simplify import DOUGLAS_PEUCKER, simplify_track
+from util.map.payload import MapPayloadCache, build_map_payload, payload_time
 
 
 KAKAO_JAVASCRIPT_KEY = str(st.secrets["KAKAO_JAVASCRIPT_KEY"])
+KAKAO_SDK_SRC = KAKAO_SDK_URL.format(appkey=KAKAO_JAVASCRIPT_KEY)
 
 class SecureLoginApp:
     """Streamlit 로그인/잠금 기능을 관리하는 클래스"""
 
+    # 스프레드시트 이름
+    SPREADSHEET_NAME = "오토바이 추적DB"
+    # 아래로만 쌓이는 시트 - 새로 추가된 행만 증분으로 읽는다
+    INCREMENTAL_SHEETS = ("오토바이DB_누적",)
+    # 증분 로드로 놓칠 수 있는 위쪽 행 수정을 잡기 위해 주기적으로 전체를 다시 읽는 간격(초)
+    INCREMENTAL_FULL_RELOAD_SECONDS = 600
+    # 지도 데이터 시트
+    MAP_SHEETS = ("오토바이DB_현재", "오토바이DB_누적")
+    # 지도 데이터 시트를 백그라운드에서 다시 읽는 간격(초)
+    MAP_POLL_SECONDS = 30
+    # 변경 신호(Drive version)가 같아도 이 간격(초)마다 한 번은 시트를 다시 읽는다
+    MAP_FORCE_POLL_SECONDS = 300
+    # 새로고침 버튼을 눌렀을 때 새 데이터를 기다리는 최대 시간(초)
+    MAP_REFRESH_WAIT_SECONDS = 15
+    # 로그인 내역을 모아서 시트에 쓰는 간격(초)
+    AUDIT_FLUSH_SECONDS = 5
+    # 지도 데이터 시트를 저장해 둘 로컬 미러 폴더 (재시작 시 바로 보여주고 백그라운드에서 맞춘다)
+    MIRROR_DIR = str(Path(__file__).resolve().parent / ".sheet_mirror")
+    # 누적 페이지에서 장비 1대의 기록을 나눠 보여줄 때 한 페이지 행 수
+    DEVICE_HISTORY_PAGE_SIZE = 500
+    # 누적 지도 경로 단순화 허용 오차(m)와 방식 (util.map.simplify) - 이보다 작게 벗어나는 점은 보내지 않는다
+    TRACK_TOLERANCE_METERS = 10.0
+    TRACK_SIMPLIFY_METHOD = DOUGLAS_PEUCKER
+
     def __init__(self):
         # ✅ 이 부분은 세션당 한 번만 실행되도록 밖에서 cache_resource로 감쌀 거라,
         #    여기서 무거운 초기화 해도 괜찮음.
-        self.googlesheet = GoogleSheet("오토바이 추적DB")
-        self.USER_DB = self._init_loginDB()
-        self.recent_map_data = self.get_map_data("오토바이DB_현재")
-        self.cumulative_map_data = self.get_map_data("오토바이DB_누적")
+        # 단, 로그인 화면이 바로 뜨도록 로그인 계정만 먼저 읽고
+        # 로컬 미러 / 지도 데이터 2개(load_many 1번)는 스레드 풀에서 읽어두었다가 페이지에서 처음 쓸 때 기다린다.
+        self.started_at = time.perf_counter()
+        self.startup_metrics: Dict[str, float] = {}
+
+        self.store = self._create_store()
+
+        login_df = self.store.load_as_dataframe("[ 로그인 계정 ]", "A", "C", ["A"])
+
+        # 로그인 내역 / 계정 잠금 기록은 큐에 넣고 백그라운드에서 모아서 쓴다 (로그인 버튼이 시트 쓰기를 기다리지 않음)
+        self.audit = AuditQueue(self.store, flush_interval=self.AUDIT_FLUSH_SECONDS)
+        if len(login_df):
+            self.audit.remember_cell("[ 로그인 계정 ]", "C2", login_df.iloc[0].get("상태", ""))
+        self.audit.start()
+
+        # 모든 세션이 같이 보는 데이터(로그인 계정, 지도 스냅샷)는 SnapshotHolder에 copy-on-write로 둔다.
+        # 세션마다 다른 화면 상태(선택한 장비, 지도 위치 등)는 st.session_state에만 둔다.
+        self.holder = SnapshotHolder(SharedState(version=1, user_db=self._init_loginDB(login_df)))
+        # 한 번의 rerun 동안 같은 버전만 보도록 스크립트 스레드(세션)마다 state를 고정해 둔다
+        self._view = threading.local()
+        self._record_startup_metric("time_to_login")
+
+        # 로컬 미러가 있으면 먼저 그걸로 보여주고, 시트와는 그 다음 백그라운드 로드에서 맞춘다
+        # (작업자 1개라 미러 읽기 -> 시트 읽기 순서로 실행된다)
+        self._startup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup-load")
+        self._mirror_future: Future = self._startup_executor.submit(self._load_mirror_snapshots)
+        self._startup_future: Future = self._startup_executor.submit(self._load_startup_snapshots)
+        self._startup_executor.shutdown(wait=False)
+
+        # 백그라운드 폴러가 주기적으로 새 스냅샷을 읽어서 holder에 새 버전으로 게시한다
+        # 변경 신호가 그대로거나 지도 데이터 시트 내용이 같으면 새 버전을 게시하지 않는다
+        self.poller = SheetPoller(
+            self._poll_snapshots,
+            holder=self.holder,
+            interval=self.MAP_POLL_SECONDS,
+        )
+        self.poller.start()
+
+        # 지도 payload는 데이터 버전마다 한 번만 만들어서 모든 세션이 같이 쓴다
+        self.map_payloads = MapPayloadCache()
+
+    def _create_store(self) -> TabularStore:
+        """
+        secrets의 STORE_BACKEND로 저장소를 고른다 (기본 google)
+        - google: 구글 시트
+        - excel / memory: STORE_PATH 엑셀 파일 (memory는 파일을 메모리에 올려서 쓰고 파일에는 쓰지 않음, 오프라인 테스트용)
+        """
+        backend = st.secrets.get("STORE_BACKEND", "google")
+        if backend != "google":
+            return create_store(backend, self.SPREADSHEET_NAME, spreadsheet_path=st.secrets.get("STORE_PATH"))
+
+        # secrets에 스프레드시트 key가 있으면 Drive 검색 없이 key로 바로 연다
+        # 로그인 계정 시트는 비밀번호가 있어서 로컬 미러에 저장하지 않는다
+        return create_store(
+            backend,
+            self.SPREADSHEET_NAME,
+            spreadsheet_key=st.secrets.get("GOOGLE_SPREADSHEET_KEY"),
+            mirror_dir=st.secrets.get("SHEET_MIRROR_DIR", self.MIRROR_DIR),
+            mirror_sheets=self.MAP_SHEETS,
+        )
+
+    # --------------------------------------------------------------------
+    # 시작 시간 측정 / 지도 데이터 백그라운드 로드
+    # --------------------------------------------------------------------
+    def _record_startup_metric(self, name: str) -> None:
+        """앱 생성 시작부터 지금까지 걸린 시간을 한 번만 기록한다"""
+        if name in self.startup_metrics:
+            return
+        self.startup_metrics[name] = round(time.perf_counter() - self.started_at, 3)
+        logging.info(f"시작 시간 측정 - {name} : {self.startup_metrics[name]}초")
+
+    def _load_mirror_snapshots(self) -> Dict[str, FleetSnapshot]:
+        """
+        로컬 미러에 저장된 지도 데이터를 holder에 게시한다 (스레드 풀에서 실행, 시트 요청 없음)
+        증분 시트는 미러 이후 행만 읽도록 준비해 둔다.
+        """
+        snapshots = {}
+        for sheet_name, entry in self._map_sheet_ranges(self.MAP_SHEETS).items():
+            frame = self.store.load_from_mirror(*entry, incremental=sheet_name in self.INCREMENTAL_SHEETS)
+            if frame is not None:
+                snapshots[sheet_name] = FleetSnapshot.from_frame(frame)
+        if snapshots:
+            # 그 사이 폴러가 게시한 시트는 덮어쓰지 않는다
+            self.holder.update(lambda state: state.with_snapshots(
+                {sheet_name: snapshot for sheet_name, snapshot in snapshots.items() if sheet_name not in state.snapshots}
+            ))
+            self._record_startup_metric("mirror_ready")
+        return snapshots
+
+    def _load_startup_snapshots(self) -> Dict[str, FleetSnapshot]:
+        """
+        시작할 때 지도 데이터 시트를 한 번의 요청으로 읽어서 holder에 게시한다 (스레드 풀에서 실행).
+        폴러와 같은 조건부 읽기를 거쳐서, 다음 폴링은 여기서 읽은 내용과 비교한다
+        """
+        try:
+            mirror_snapshots = self._mirror_future.result()
+        except Exception as e:
+            logging.error(f"로컬 미러 읽기 실패 : {e}")
+            mirror_snapshots = {}
+        snapshots = self._poll_snapshots(mirror_snapshots, force=True)
+        # 미러 데이터는 바꾸고, 그 사이 폴러가 더 새 데이터를 게시했으면 덮어쓰지 않는다
+        self.holder.update(lambda state: state.with_snapshots({
+            sheet_name: snapshot
+            for sheet_name, snapshot in snapshots.items()
+            if state.snapshots.get(sheet_name) is mirror_snapshots.get(sheet_name)
+        }))
+        for sheet_name in snapshots:
+            self._record_startup_metric(f"{sheet_name}_ready")
+        return snapshots
+
+    def _poll_snapshots(self, previous: Mapping[str, FleetSnapshot], force: bool = False) -> Dict[str, FleetSnapshot]:
+        """
+        폴러에서 호출: 저장소의 조건부 읽기(load_many_conditional)로 변경 신호를 먼저 확인하고,
+        지도 데이터 시트의 내용이 실제로 바뀐 시트만 새 스냅샷으로 만든다 (바뀐 시트가 없으면 빈 dict).
+        감사 큐가 쓰는 로그인 기록 시트만 바뀐 경우에는 새 스냅샷을 만들지 않는다.
+        force(새로고침 버튼)면 항상 다시 읽고, 내용이 같은 시트는 이전 스냅샷을 그대로 다시 게시한다
+        (holder 버전만 올라가고 지도 payload / 장비별 인덱스는 다시 만들지 않음).
+        """
+        frames = self.store.load_many_conditional(
+            self._map_sheet_ranges(self.MAP_SHEETS),
+            incremental=self.INCREMENTAL_SHEETS,
+            max_age=0 if force else self.MAP_FORCE_POLL_SECONDS,
+            full_reload_after=self.INCREMENTAL_FULL_RELOAD_SECONDS,
+        )
+        snapshots = {
+            sheet_name: FleetSnapshot.from_frame(data_df, previous.get(sheet_name))
+            for sheet_name, (data_df, _) in frames.items()
+        }
+        if force:
+            for sheet_name in self.MAP_SHEETS:
+                if sheet_name not in snapshots and previous.get(sheet_name) is not None:
+                    snapshots[sheet_name] = previous[sheet_name]
+        return snapshots
+
+    def _get_snapshot(self, sheet_name: str) -> FleetSnapshot:
+        """
+        고정된 state에서 스냅샷을 꺼낸다.
+        시작 로드가 아직 안 끝났으면 이때 처음으로 기다리고, 실패했으면 빈 스냅샷을 돌려준다 (다음 폴링 때 채워짐)
+        """
+        snapshot = self._state().snapshots.get(sheet_name)
+        if snapshot is not None:
+            return snapshot
+        # 고정한 뒤에 미러가 게시됐을 수 있으니 최신 state도 본다
+        snapshot = self.holder.get().snapshots.get(sheet_name)
+        if snapshot is not None:
+            return snapshot
+        try:
+            mirror_snapshot = self._mirror_future.result().get(sheet_name)
+            if mirror_snapshot is not None:
+                return mirror_snapshot
+            return self._startup_future.result()[sheet_name]
+        except Exception as e:
+            logging.error(f"시작 시 지도 데이터 로드 실패 : {sheet_name} - {e}")
+            return FleetSnapshot(DataFrame(columns=list(TRACKER_SCHEMA)))
+
+    # --------------------------------------------------------------------
+    # 공용 데이터 읽기 (잠금 없음)
+    # --------------------------------------------------------------------
+    def _state(self) -> SharedState:
+        """현재 rerun에 고정된 state (고정 전이면 최신 state)"""
+        state = getattr(self._view, "state", None)
+        return state if state is not None else self.holder.get()
+
+    def _pin_state(self) -> None:
+        """rerun 시작 시 최신 state를 이 세션에 고정한다"""
+        state = self.holder.get()
+        self._view.state = state
+        st.session_state.data_version = state.version
+
+    @property
+    def USER_DB(self) -> Mapping[str, str]:
+        return self._state().user_db
+
+    @property
+    def recent_snapshot(self) -> FleetSnapshot:
+        """오토바이DB_현재 스냅샷 (네트워크 요청 없음)"""
+        return self._get_snapshot("오토바이DB_현재")
+
+    @property
+    def cumulative_snapshot(self) -> FleetSnapshot:
+        """오토바이DB_누적 스냅샷 (네트워크 요청 없음)"""
+        return self._get_snapshot("오토바이DB_누적")
 
     # --------------------------------------------------------------------
     # Session State 초기화
@@ -44,18 +258,34 @@ class SecureLoginApp:
         if "fail_count" not in st.session_state:
             st.session_state.fail_count = 0
 
+        if "lock_reported" not in st.session_state:
+            st.session_state.lock_reported = False
+
         # 사이드바 메뉴
         if "selected_menu" not in st.session_state:
             st.session_state.selected_menu = "오토바이 현재 위치"
 
-        # 지도 데이터
+        # 메인 페이지
+        if "latest_page__first_main" not in st.session_state:
+            st.session_state.latest_page__first_main = True
+            
+        if "cumulative_page__first_main" not in st.session_state:
+            st.session_state.cumulative_page__first_main = True
+        if "cumulative_page__select_device" not in st.session_state:
+            st.session_state.cumulative_page__select_device = None
+        if "cumulative_page__page" not in st.session_state:
+            st.session_state.cumulative_page__page = 0
+
+    def _init_map_session_state(self) -> None:
+        """
+        지도 관련 세션 상태 기본값 설정
+        (지도 데이터가 필요하므로 로그인 화면이 아니라 메인 페이지에서 처음 호출된다)
+        """
         if "selected_level" not in st.session_state:
             st.session_state.selected_level = 3            
                         
-        for row in self.recent_map_data:                        
-            if row["위도"] == "0" or row["경도"] == "0":
-                continue
-            
+        row = self.recent_snapshot.first_positioned_record()
+        if row is not None:
             if "selected_lat" not in st.session_state:
                 st.session_state.selected_lat = row["위도"]
             if "selected_lng" not in st.session_state:
@@ -66,26 +296,17 @@ class SecureLoginApp:
                 st.session_state.selected_car_number = row["차량번호"]          
             if "selected_car_time" not in st.session_state:
                 st.session_state.selected_car_time = row["시간"]
-            break
         if "selected_lat" not in st.session_state:
             st.session_state.selected_lat = 37.566535  
         if "selected_lng" not in st.session_state:
             st.session_state.selected_lng = 126.9779692
+        first = self.recent_snapshot.record(0) if not self.recent_snapshot.empty else {}
         if "selected_device_id" not in st.session_state:
-            st.session_state.selected_device_id = self.recent_map_data[0]["장비ID"]  
+            st.session_state.selected_device_id = first.get("장비ID", "")  
         if "selected_car_number" not in st.session_state:
-            st.session_state.selected_car_number = self.recent_map_data[0]["차량번호"]          
+            st.session_state.selected_car_number = first.get("차량번호", "")          
         if "selected_car_time" not in st.session_state:
-            st.session_state.selected_car_time = self.recent_map_data[0]["시간"]
-
-        # 메인 페이지
-        if "latest_page__first_main" not in st.session_state:
-            st.session_state.latest_page__first_main = True
-            
-        if "cumulative_page__first_main" not in st.session_state:
-            st.session_state.cumulative_page__first_main = True
-        if "cumulative_page__select_device" not in st.session_state:
-            st.session_state.cumulative_page__select_device = None
+            st.session_state.selected_car_time = first.get("시간", "")
 
     # -----------------------
     # 로그인 / 잠금 관련 로직
@@ -95,13 +316,19 @@ class SecureLoginApp:
         """비밀번호를 SHA256으로 해시"""
         return hashlib.sha256(pw.encode("utf-8")).hexdigest()
 
-    def _init_loginDB(self) -> dict:
-        """구글시트에서 로그인 계정 1줄 로드해서 USER_DB 생성"""
-        data = self.googlesheet.load_one_line(
-            sheet_name="[ 로그인 계정 ]",
-            start_col_letter="A",
-            end_col_letter="C",
-        )
+    def _init_loginDB(self, login_df: DataFrame = None) -> dict:
+        """
+        구글시트에서 로그인 계정 1줄 로드해서 USER_DB 생성
+        (load_many로 이미 읽어온 login_df가 있으면 그 첫 줄을 사용)
+        """
+        if login_df is None:
+            data = self.store.load_one_line(
+                sheet_name="[ 로그인 계정 ]",
+                start_col_letter="A",
+                end_col_letter="C",
+            )
+        else:
+            data = login_df.iloc[0].to_dict() if len(login_df) else {}
 
         login_dict = {}
         if data.get("상태") == "사용가능":
@@ -127,7 +354,11 @@ class SecureLoginApp:
             return True            
         
         if st.session_state.fail_count >= 20:
-            self.googlesheet.set_value_by_cell("[ 로그인 계정 ]", "C2", "사용차단")
+            # 잠금은 이 세션에만 건다 (실패 횟수가 세션별이므로).
+            # 시트 C2의 "사용차단"은 세션마다 1번 큐에 넣는다 - 관리자가 그 사이 "사용가능"으로 되돌렸을 수 있으므로 기억한 값과 같아도 쓴다
+            if not st.session_state.lock_reported:
+                self.audit.set_cell("[ 로그인 계정 ]", "C2", "사용차단", force=True)
+                st.session_state.lock_reported = True
             return True
         return False
         
@@ -138,7 +369,16 @@ class SecureLoginApp:
         else:
             mask_pw = self._mask_password(PW)
         data = [time, ID, mask_pw, state]
-        self.googlesheet.update_oneline("[ 로그인 내역 ]", data, "A")
+        self.audit.append_row("[ 로그인 내역 ]", data)
+
+    @staticmethod
+    def _format_time(value) -> str:
+        """표에 표시할 시간 문자열"""
+        if pd.isna(value):
+            return ""
+        if isinstance(value, pd.Timestamp):
+            return value.strftime(TIME_FORMAT)
+        return str(value)
 
     def _mask_password(self, pw: str) -> str:
         """비밀번호 앞 4자리만 남기고 나머지는 마스킹"""
@@ -201,656 +441,222 @@ class SecureLoginApp:
     # -----------------------
     # 카카오 지도 렌더링
     # -----------------------
-    def get_map_data(self, sheet_name: str) -> List[Dict[str, Any]]:
+    def get_device_history(self, device_id: str, page: int = 0) -> FleetSnapshot:
         """
-        지도 아래 표에 표시할 데이터 목록.
-        지금은 예시 데이터고, 나중에 GoogleSheet에서 읽어오면 됨.
+        장비 1대의 누적 기록 1페이지 (최신순).
+        저장소가 서버 쿼리를 지원하면(구글 시트 gviz) 그 장비 행만 페이지 단위로 골라 온다.
+        지원하지 않거나(엑셀 / 메모리) 쿼리가 실패하면 메모리에 있는 누적 스냅샷의 장비별 파티션에서 자른다.
         """
-        
-        data_df = self.googlesheet.load_as_dataframe(sheet_name, "A", "N", "A")
-        map_data = []
-        
-        for _, data in data_df.iterrows():
-            map_dict = {
-                "장비ID": data["장비ID"],
-                "클라이언트ID": data["클라이언트ID"],
-                "차량번호": data["차량번호"],
-                "시간": data["시간"],
-                "위도": data["위도"],
-                "경도": data["경도"],
-                "속도": data["속도"],
-                "상태": data["상태"],
-                "모션데이터accx": data["모션데이터\naccx"],
-                "모션데이터accy": data["모션데이터\naccy"],
-                "모션데이터accz": data["모션데이터\naccz"],
-                "모션데이터gyrox": data["모션데이터\ngyrox"],
-                "모션데이터gyroy": data["모션데이터\ngyroy"],
-                "모션데이터gyroz": data["모션데이터\ngyroz"],                
-            }
-            map_data.append(map_dict)
-            
-        return map_data
-    
-    def render_current_selected_motion_map(self) -> None:
-        level = int(st.session_state.selected_level)
-        lat = float(st.session_state.selected_lat)
-        lng = float(st.session_state.selected_lng)
-        device_id = str(st.session_state.selected_device_id)
-        car_number = str(st.session_state.selected_car_number)
-        
-        # 카카오 지도를 HTML로 렌더링해서 Streamlit에 표시
-        html_code = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8" />
-            <title>Kakao Map + Roadview</title>
-            
-            <!-- 🔥 여기 추가: HTTP 요청을 자동으로 HTTPS로 올려주는 CSP -->
-            <meta http-equiv="Content-Security-Policy" content="upgrade-insecure-requests">            
-        </head>
-        <body>
-            <!-- 🔼 위: 로드뷰 / 🔽 아래: 지도 -->
-            <div id="roadview" style="width:100%;height:280px;"></div>
-            <div id="map" style="width:100%;height:280px;margin-top:5px;"></div>
-
-            <script type="text/javascript"
-                src="https://dapi.kakao.com/v2/maps/sdk.js?appkey={KAKAO_JAVASCRIPT_KEY}">
-            </script>
-            <script>
-                // 공통 중심 좌표
-                var mapCenter = new kakao.maps.LatLng({lat}, {lng});
-
-                // =====================
-                // 지도 영역 설정
-                // =====================
-                var mapContainer = document.getElementById('map');
-                var mapOption = {{
-                    center: mapCenter,
-                    level: {level}
-                }};
-                var map = new kakao.maps.Map(mapContainer, mapOption);
-
-                // 지도 타입 컨트롤
-                var mapTypeControl = new kakao.maps.MapTypeControl();
-                map.addControl(mapTypeControl, kakao.maps.ControlPosition.TOPRIGHT);
-
-                // 줌 컨트롤
-                var zoomControl = new kakao.maps.ZoomControl();
-                map.addControl(zoomControl, kakao.maps.ControlPosition.RIGHT);
-
-                // 지도 마커
-                var mMarker = new kakao.maps.Marker({{
-                    position: mapCenter,
-                    map: map
-                }});
-
-                // 지도 인포윈도우 (장비ID / 차량번호 / 큰지도보기 링크)
-                var iwContent = '<div style="padding:1px;">{device_id}<br>{car_number}<br>' +
-                                '<a href="https://map.kakao.com/link/map/{device_id}__{car_number},{lat},{lng}" style="color:blue" target="_blank">큰 지도보기</a>' +
-                                '</div>';
-                var iwPosition = mapCenter;
-
-                var infowindow = new kakao.maps.InfoWindow({{
-                    position : iwPosition,
-                    content : iwContent,
-                    removable : true
-                }});
-                infowindow.open(map, mMarker);
-                
-                
+        page_size = self.DEVICE_HISTORY_PAGE_SIZE
+        if self.store.SERVER_QUERY:
+            try:
+                data_df = self.store.query_rows(
+                    "오토바이DB_누적", "A", "N",
+                    filters={"A": device_id},
+                    order_by="D",
+                    descending=True,
+                    limit=page_size,
+                    offset=page * page_size,
+                    schema=TRACKER_SCHEMA,
+                )
+                return FleetSnapshot(data_df, self.cumulative_snapshot.version)
+            except Exception as e:
+                logging.error(f"장비 기록 쿼리 실패 - 메모리 데이터 사용 : {device_id} - {e}")
+
+        device_snapshot = self.cumulative_snapshot.select_device(device_id)
+        return FleetSnapshot(device_snapshot.frame.iloc[page * page_size:(page + 1) * page_size], device_snapshot.version)
+
+    def _track_payload(self, device_snapshot: FleetSnapshot) -> bytes:
+        """장비 1대의 기록을 경로 단순화해서 남은 주요 지점만 지도 payload로 (시간 순서, encoded polyline)"""
+        track_df = simplify_track(device_snapshot.frame, self.TRACK_TOLERANCE_METERS, self.TRACK_SIMPLIFY_METHOD)
+        return build_map_payload(track_df, polyline=True)
 
-                // =====================
-                // 로드뷰 영역 설정
-                // =====================
-                var rvContainer = document.getElementById('roadview'); // 로드뷰를 표시할 div
-                var rv = new kakao.maps.Roadview(rvContainer);         // 로드뷰 객체
-                var rc = new kakao.maps.RoadviewClient();              // 로드뷰 클라이언트
-                var rvResetValue = {{}};                               // 초기화 값 저장용
-
-                // 중심 좌표 근처에서 가장 가까운 로드뷰 panoId 찾기
-                rc.getNearestPanoId(mapCenter, 50, function(panoId) {{
-                    if (panoId) {{
-                        rv.setPanoId(panoId, mapCenter);
-                        rvResetValue.panoId = panoId;
-                    }}
-                }});
-
-                // 로드뷰 초기화 시 이벤트
-                kakao.maps.event.addListener(rv, 'init', function() {{
-                    // 로드뷰 마커
-                    var rMarker = new kakao.maps.Marker({{
-                        position: mapCenter,
-                        map: rv
-                    }});
-
-                    // 로드뷰 인포윈도우 (장비ID / 차량번호)
-                    var rLabelContent = '{device_id}<br>{car_number}';
-                    var rLabel = new kakao.maps.InfoWindow({{
-                        position: mapCenter,
-                        content: rLabelContent
-                    }});
-                    rLabel.open(rv, rMarker);
-
-                    // 마커가 화면 중앙 근처에 오도록 viewpoint 조정
-                    var projection = rv.getProjection();
-                    var viewpoint = projection.viewpointFromCoords(
-                        rMarker.getPosition(),
-                        rMarker.getAltitude()
-                    );
-                    rv.setViewpoint(viewpoint);
-
-                    // 초기값 저장 (나중에 필요하면 reset용으로 사용 가능)
-                    rvResetValue.pan = viewpoint.pan;
-                    rvResetValue.tilt = viewpoint.tilt;
-                    rvResetValue.zoom = viewpoint.zoom;
-                }});
-            </script>
-        </body>
-        </html>
-        """
-
-        components.html(html_code, height=590)        
+    @staticmethod
+    def _map_sheet_ranges(sheet_names) -> Dict[str, tuple]:
+        return {sheet_name: (sheet_name, "A", "N", ["A"], TRACKER_SCHEMA) for sheet_name in sheet_names}
     
-    def render_current_all_motion_map(self) -> None:
-        level = int(st.session_state.selected_level)
-        lat = float(st.session_state.selected_lat)
-        lng = float(st.session_state.selected_lng)
-        device_id = str(st.session_state.selected_device_id)
-        car_number = str(st.session_state.selected_car_number)
-        
-        json_map_data = json.dumps(self.recent_map_data, ensure_ascii=False)
-
-        html_code = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8" />
-            <title>Kakao Map</title>
-            
-            <!-- 🔥 여기 추가: HTTP 요청을 자동으로 HTTPS로 올려주는 CSP -->
-            <meta http-equiv="Content-Security-Policy" content="upgrade-insecure-requests">
-        </head>
-        <body>
-            <div id="map" style="width:100%;height:400px;"></div>
-            <script type="text/javascript"
-                src="https://dapi.kakao.com/v2/maps/sdk.js?appkey={KAKAO_JAVASCRIPT_KEY}">
-            </script>            
-            <script>
-                var container = document.getElementById('map');
-                var options = {{
-                    center: new kakao.maps.LatLng({lat}, {lng}),
-                    level: {level+2}
-                }};
-                var map = new kakao.maps.Map(container, options);
-                
-                // 지도타입 컨트롤(일반, 스카이뷰)
-                var mapTypeControl = new kakao.maps.MapTypeControl();
-                map.addControl(mapTypeControl, kakao.maps.ControlPosition.TOPRIGHT);
-                
-                // 줌 컨트롤
-                var zoomControl = new kakao.maps.ZoomControl();
-                map.addControl(zoomControl, kakao.maps.ControlPosition.RIGHT);
-                
-                // 마커 표시
-                var markerPosition  = new kakao.maps.LatLng({lat}, {lng});                 
-                var marker = new kakao.maps.Marker({{
-                    position: markerPosition
-                }});                
-                marker.setMap(map);                
-
-                const map_data = {json_map_data}
-                
-                var positions = []
-                var position_data = null                
-                for (var i = 0; i < map_data.length; i++){{
-                    var iwContent = `<div style="padding:1px;">${{map_data[i]["장비ID"]}}<br>${{map_data[i]["차량번호"]}}<br><a href="https://map.kakao.com/link/map/${{map_data[i]["장비ID"]}}__${{map_data[i]["차량번호"]}},${{map_data[i]["위도"]}},${{map_data[i]["경도"]}}" style="color:blue" target="_blank">큰 지도보기</a></div>`,
-                    iwPosition = new kakao.maps.LatLng(map_data[i]["위도"], map_data[i]["경도"]); //인포윈도우 표시 위치입니다                    
-                    
-                    position_data = {{
-                        content : iwContent,
-                        latlng : iwPosition
-                    }}
-                    
-                    positions.push(position_data)
-                }}
-                
-                for (var i = 0; i < positions.length; i ++) {{
-                    // 마커를 생성합니다
-                    var marker = new kakao.maps.Marker({{
-                        map: map, // 마커를 표시할 지도
-                        position: positions[i].latlng // 마커의 위치
-                    }});
-
-                    // 마커에 표시할 인포윈도우를 생성합니다 
-                    var infowindow = new kakao.maps.InfoWindow({{
-                        content: positions[i].content, // 인포윈도우에 표시할 내용
-                        removable : true
-                    }});
-                    
-                    // 마커에 클릭이벤트를 등록합니다
-                    kakao.maps.event.addListener(marker, 'click', makeClickListener(map, marker, infowindow));
-
-                    // 마커에 mouseover 이벤트와 mouseout 이벤트를 등록합니다
-                    // 이벤트 리스너로는 클로저를 만들어 등록합니다 
-                    // for문에서 클로저를 만들어 주지 않으면 마지막 마커에만 이벤트가 등록됩니다
-                    //kakao.maps.event.addListener(marker, 'mouseover', makeOverListener(map, marker, infowindow));
-                    //kakao.maps.event.addListener(marker, 'mouseout', makeOutListener(infowindow));
-                }}
-                
-                // 인포윈도우를 표시하는 클로저를 만드는 함수입니다 
-                function makeClickListener(map, marker, infowindow) {{
-                    return function() {{
-                        infowindow.open(map, marker);
-                    }};
-                }}                
-
-                // 인포윈도우를 표시하는 클로저를 만드는 함수입니다 
-                function makeOverListener(map, marker, infowindow) {{
-                    return function() {{
-                        infowindow.open(map, marker);
-                    }};
-                }}
-
-                // 인포윈도우를 닫는 클로저를 만드는 함수입니다 
-                function makeOutListener(infowindow) {{
-                    return function() {{
-                        infowindow.close();
-                    }};
-                }}
-                
-            </script>
-        </body>
-        </html>
+    def _select_map_row(self, row: Mapping[str, Any], first_main_key: str) -> None:
+        """지도에서 클릭한 행을 선택 지점으로 (표의 "보기" 버튼이 하던 일)"""
+        st.session_state.selected_lat = float(row["위도"])
+        st.session_state.selected_lng = float(row["경도"])
+        st.session_state.selected_device_id = row["장비ID"]
+        st.session_state.selected_car_number = row["차량번호"]
+        st.session_state.selected_car_time = payload_time(row.get("시간"))
+        st.session_state[first_main_key] = False
+        st.rerun()
+
+    def _selected_map_row(self) -> Dict[str, Any]:
+        return {
+            "장비ID": st.session_state.selected_device_id,
+            "차량번호": st.session_state.selected_car_number,
+            "위도": st.session_state.selected_lat,
+            "경도": st.session_state.selected_lng,
+        }
+
+    def render_latest_map(self) -> None:
         """
-        components.html(html_code, height=400)
-
-    def render_cumulative_all_motion_map(self, select_device_df: DataFrame) -> None:                        
-        level = 3
-        lat = select_device_df.iloc[0]["위도"]
-        lng = select_device_df.iloc[0]["경도"]
-        json_map_data = select_device_df.to_json(orient="records", force_ascii=False)        
-
-        html_code = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8" />
-            <title>Kakao Map</title>
-            
-            <!-- 🔥 여기 추가: HTTP 요청을 자동으로 HTTPS로 올려주는 CSP -->
-            <meta http-equiv="Content-Security-Policy" content="upgrade-insecure-requests">
-        </head>
-        <body>
-            <div id="map" style="width:100%;height:400px;"></div>
-            <script type="text/javascript"
-                src="https://dapi.kakao.com/v2/maps/sdk.js?appkey={KAKAO_JAVASCRIPT_KEY}">
-            </script>            
-            <script>
-                var container = document.getElementById('map');
-                var options = {{
-                    center: new kakao.maps.LatLng({lat}, {lng}),
-                    level: {level+2}
-                }};
-                var map = new kakao.maps.Map(container, options);
-                
-                // 지도타입 컨트롤(일반, 스카이뷰)
-                var mapTypeControl = new kakao.maps.MapTypeControl();
-                map.addControl(mapTypeControl, kakao.maps.ControlPosition.TOPRIGHT);
-                
-                // 줌 컨트롤
-                var zoomControl = new kakao.maps.ZoomControl();
-                map.addControl(zoomControl, kakao.maps.ControlPosition.RIGHT);
-                
-                // 마커 표시
-                var markerPosition  = new kakao.maps.LatLng({lat}, {lng});                 
-                var marker = new kakao.maps.Marker({{
-                    position: markerPosition
-                }});                
-                marker.setMap(map);                
-
-                const map_data = {json_map_data}
-                
-                var positions = []
-                var position_data = null                
-                for (var i = 0; i < map_data.length; i++){{
-                    var iwContent = `<div style="padding:1px;">${{map_data[i]["장비ID"]}}<br>${{map_data[i]["차량번호"]}}<br><a href="https://map.kakao.com/link/map/${{map_data[i]["장비ID"]}}__${{map_data[i]["차량번호"]}},${{map_data[i]["위도"]}},${{map_data[i]["경도"]}}" style="color:blue" target="_blank">큰 지도보기</a></div>`,
-                    iwPosition = new kakao.maps.LatLng(map_data[i]["위도"], map_data[i]["경도"]); //인포윈도우 표시 위치입니다                    
-                    
-                    position_data = {{
-                        content : iwContent,
-                        latlng : iwPosition
-                    }}
-                    
-                    positions.push(position_data)
-                }}
-                
-                for (var i = 0; i < positions.length; i ++) {{
-                    // 마커를 생성합니다
-                    var marker = new kakao.maps.Marker({{
-                        map: map, // 마커를 표시할 지도
-                        position: positions[i].latlng // 마커의 위치
-                    }});
-
-                    // 마커에 표시할 인포윈도우를 생성합니다 
-                    var infowindow = new kakao.maps.InfoWindow({{
-                        content: positions[i].content, // 인포윈도우에 표시할 내용
-                        removable : true
-                    }});
-                    
-                    // 마커에 클릭이벤트를 등록합니다
-                    kakao.maps.event.addListener(marker, 'click', makeClickListener(map, marker, infowindow));
-
-                    // 마커에 mouseover 이벤트와 mouseout 이벤트를 등록합니다
-                    // 이벤트 리스너로는 클로저를 만들어 등록합니다 
-                    // for문에서 클로저를 만들어 주지 않으면 마지막 마커에만 이벤트가 등록됩니다
-                    //kakao.maps.event.addListener(marker, 'mouseover', makeOverListener(map, marker, infowindow));
-                    //kakao.maps.event.addListener(marker, 'mouseout', makeOutListener(infowindow));
-                }}
-                
-                // 인포윈도우를 표시하는 클로저를 만드는 함수입니다 
-                function makeClickListener(map, marker, infowindow) {{
-                    return function() {{
-                        infowindow.open(map, marker);
-                    }};
-                }}                
-
-                // 인포윈도우를 표시하는 클로저를 만드는 함수입니다 
-                function makeOverListener(map, marker, infowindow) {{
-                    return function() {{
-                        infowindow.open(map, marker);
-                    }};
-                }}
-
-                // 인포윈도우를 닫는 클로저를 만드는 함수입니다 
-                function makeOutListener(infowindow) {{
-                    return function() {{
-                        infowindow.close();
-                    }};
-                }}
-                
-            </script>
-        </body>
-        </html>
+        현재 위치 지도. 처음에는 전체 장비 마커만, 마커를 클릭하면 그 지점 + 로드뷰를 보여준다.
+        지도는 한 번만 만들고 선택 / 새 데이터만 컴포넌트에 보낸다.
         """
-        components.html(html_code, height=400)
-
-    def render_cumulative_selected_motion_map(self, select_device_df: DataFrame) -> None:
         level = int(st.session_state.selected_level)
-        lat = float(st.session_state.selected_lat)
-        lng = float(st.session_state.selected_lng)
-        device_id = str(st.session_state.selected_device_id)
-        car_number = str(st.session_state.selected_car_number)
-        
-        json_map_data = select_device_df.to_json(orient="records", force_ascii=False)  
-        
-        # 카카오 지도를 HTML로 렌더링해서 Streamlit에 표시
-        html_code = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8" />
-            <title>Kakao Map + Roadview</title>
-            
-            <!-- 🔥 여기 추가: HTTP 요청을 자동으로 HTTPS로 올려주는 CSP -->
-            <meta http-equiv="Content-Security-Policy" content="upgrade-insecure-requests">            
-        </head>
-        <body>
-            <!-- 🔼 위: 로드뷰 / 🔽 아래: 지도 -->
-            <div id="roadview" style="width:100%;height:280px;"></div>
-            <div id="map" style="width:100%;height:280px;margin-top:5px;"></div>
-
-            <script type="text/javascript"
-                src="https://dapi.kakao.com/v2/maps/sdk.js?appkey={KAKAO_JAVASCRIPT_KEY}">
-            </script>
-            <script>
-                var container = document.getElementById('map');
-                var options = {{
-                    center: new kakao.maps.LatLng({lat}, {lng}),
-                    level: {level+1}
-                }};
-                var map = new kakao.maps.Map(container, options);
-
-                // 지도 타입 컨트롤
-                var mapTypeControl = new kakao.maps.MapTypeControl();
-                map.addControl(mapTypeControl, kakao.maps.ControlPosition.TOPRIGHT);
-
-                // 줌 컨트롤
-                var zoomControl = new kakao.maps.ZoomControl();
-                map.addControl(zoomControl, kakao.maps.ControlPosition.RIGHT);
-
-                // (선택 데이터) 지도 마커
-                var mapCenter  = new kakao.maps.LatLng({lat}, {lng});                 
-                var marker = new kakao.maps.Marker({{
-                    position: mapCenter
-                }});                
-                marker.setMap(map);   
-                
-                // (선택 데이터) 지도 인포윈도우 (장비ID / 차량번호 / 큰지도보기 링크)
-                var iwContent = '<div style="padding:1px;">{device_id}<br>{car_number}<br>' +
-                                '<a href="https://map.kakao.com/link/map/{device_id}__{car_number},{lat},{lng}" style="color:blue" target="_blank">큰 지도보기</a>' +
-                                '</div>';
-                var iwPosition = mapCenter;
-
-                var infowindow = new kakao.maps.InfoWindow({{
-                    position : iwPosition,
-                    content : iwContent,
-                    removable : true
-                }});
-                infowindow.open(map, marker);
-
-                // (전체 데이터) 지도 마커 & 인포 윈도우
-                const map_data = {json_map_data}
-                
-                var positions = []
-                var position_data = null                
-                for (var i = 0; i < map_data.length; i++){{
-                    var iwContent = `<div style="padding:1px;">${{map_data[i]["장비ID"]}}<br>${{map_data[i]["차량번호"]}}<br><a href="https://map.kakao.com/link/map/${{map_data[i]["장비ID"]}}__${{map_data[i]["차량번호"]}},${{map_data[i]["위도"]}},${{map_data[i]["경도"]}}" style="color:blue" target="_blank">큰 지도보기</a></div>`,
-                    iwPosition = new kakao.maps.LatLng(map_data[i]["위도"], map_data[i]["경도"]); //인포윈도우 표시 위치입니다                    
-                    
-                    position_data = {{
-                        content : iwContent,
-                        latlng : iwPosition
-                    }}
-                    
-                    positions.push(position_data)
-                }}
-                
-                for (var i = 0; i < positions.length; i ++) {{
-                    // 마커를 생성합니다
-                    var marker = new kakao.maps.Marker({{
-                        map: map, // 마커를 표시할 지도
-                        position: positions[i].latlng // 마커의 위치
-                    }});
-
-                    // 마커에 표시할 인포윈도우를 생성합니다 
-                    var infowindow = new kakao.maps.InfoWindow({{
-                        content: positions[i].content, // 인포윈도우에 표시할 내용
-                        removable : true
-                    }});
-                    
-                    // 마커에 클릭이벤트를 등록합니다
-                    kakao.maps.event.addListener(marker, 'click', makeClickListener(map, marker, infowindow));
-
-                    // 마커에 mouseover 이벤트와 mouseout 이벤트를 등록합니다
-                    // 이벤트 리스너로는 클로저를 만들어 등록합니다 
-                    // for문에서 클로저를 만들어 주지 않으면 마지막 마커에만 이벤트가 등록됩니다
-                    //kakao.maps.event.addListener(marker, 'mouseover', makeOverListener(map, marker, infowindow));
-                    //kakao.maps.event.addListener(marker, 'mouseout', makeOutListener(infowindow));
-                }}
-                
-                // 인포윈도우를 표시하는 클로저를 만드는 함수입니다 
-                function makeClickListener(map, marker, infowindow) {{
-                    return function() {{
-                        infowindow.open(map, marker);
-                    }};
-                }}                         
-
-                // =====================
-                // 로드뷰 영역 설정
-                // =====================
-                var rvContainer = document.getElementById('roadview'); // 로드뷰를 표시할 div
-                var rv = new kakao.maps.Roadview(rvContainer);         // 로드뷰 객체
-                var rc = new kakao.maps.RoadviewClient();              // 로드뷰 클라이언트
-                var rvResetValue = {{}};                               // 초기화 값 저장용
-
-                // 중심 좌표 근처에서 가장 가까운 로드뷰 panoId 찾기
-                rc.getNearestPanoId(mapCenter, 50, function(panoId) {{
-                    if (panoId) {{
-                        rv.setPanoId(panoId, mapCenter);
-                        rvResetValue.panoId = panoId;
-                    }}
-                }});
-
-                // 로드뷰 초기화 시 이벤트
-                kakao.maps.event.addListener(rv, 'init', function() {{
-                    // 로드뷰 마커
-                    var rMarker = new kakao.maps.Marker({{
-                        position: mapCenter,
-                        map: rv
-                    }});
-
-                    // 로드뷰 인포윈도우 (장비ID / 차량번호)
-                    var rLabelContent = '{device_id}<br>{car_number}';
-                    var rLabel = new kakao.maps.InfoWindow({{
-                        position: mapCenter,
-                        content: rLabelContent
-                    }});
-                    rLabel.open(rv, rMarker);
-
-                    // 마커가 화면 중앙 근처에 오도록 viewpoint 조정
-                    var projection = rv.getProjection();
-                    var viewpoint = projection.viewpointFromCoords(
-                        rMarker.getPosition(),
-                        rMarker.getAltitude()
-                    );
-                    rv.setViewpoint(viewpoint);
-
-                    // 초기값 저장 (나중에 필요하면 reset용으로 사용 가능)
-                    rvResetValue.pan = viewpoint.pan;
-                    rvResetValue.tilt = viewpoint.tilt;
-                    rvResetValue.zoom = viewpoint.zoom;
-                }});
-            </script>
-        </body>
-        </html>
+        first_main = st.session_state.latest_page__first_main
+        snapshot = self.recent_snapshot
+        points_version = f"recent:{snapshot.version}"
+
+        clicked = kakao_map(
+            key="latest_map",
+            sdk_src=KAKAO_SDK_SRC,
+            points=lambda: self.map_payloads.get(points_version, lambda: build_map_payload(snapshot.frame)),
+            points_version=points_version,
+            view={
+                "lat": st.session_state.selected_lat,
+                "lng": st.session_state.selected_lng,
+                "level": level + 2 if first_main else level,
+            },
+            selected=None if first_main else self._selected_map_row(),
+            roadview=not first_main,
+        )
+        if clicked is not None:
+            self._select_map_row(clicked, "latest_page__first_main")
+
+    def render_cumulative_map(self, device_snapshot: FleetSnapshot) -> None:
+        """
+        누적 위치 지도. 장비 1대의 경로(단순화된 주요 지점)와 마커,
+        마커를 클릭하면 그 지점 + 로드뷰를 보여준다.
         """
+        first_main = st.session_state.cumulative_page__first_main
+        if first_main:
+            view = {"lat": device_snapshot.record(0)["위도"], "lng": device_snapshot.record(0)["경도"], "level": 3 + 2}
+        else:
+            view = {
+                "lat": st.session_state.selected_lat,
+                "lng": st.session_state.selected_lng,
+                "level": int(st.session_state.selected_level) + 1,
+            }
 
-        components.html(html_code, height=590)
+        device_id = st.session_state.cumulative_page__select_device
+        page = st.session_state.cumulative_page__page
+        points_version = f"{device_id}:{page}:{device_snapshot.version}"
+        clicked = kakao_map(
+            key="cumulative_map",
+            sdk_src=KAKAO_SDK_SRC,
+            points=lambda: self.map_payloads.get(points_version, lambda: self._track_payload(device_snapshot)),
+            points_version=points_version,
+            view=view,
+            selected=None if first_main else self._selected_map_row(),
+            track=True,
+            roadview=not first_main,
+        )
+        if clicked is not None:
+            self._select_map_row(clicked, "cumulative_page__first_main")
 
     def render_latest_page_table_with_buttons(self):
         # --- 헤더 행 ---
         with st.container(height=50, gap="small", vertical_alignment="center", border=True):  # border=True 주면 박스 테두리
-            header_cols = st.columns([2, 3, 3, 2, 2, 2], vertical_alignment="center")
+            header_cols = st.columns([2, 3, 3, 2, 2], vertical_alignment="center")
             header_cols[0].markdown("**장비ID**")
             header_cols[1].markdown("**차량번호**")
             header_cols[2].markdown("**시간**")
             header_cols[3].markdown("**위도**")
             header_cols[4].markdown("**경도**")
-            header_cols[5].markdown("**상세추적**")
 
         # --- 내용 행들 ---
         with st.container(height=300, gap="small", border=True):  # border=True 주면 박스 테두리\
-            for idx, row in enumerate(self.recent_map_data):
-                cols = st.columns([2, 3, 3, 2, 2, 2], gap="small", vertical_alignment="center")
+            for idx, row in enumerate(self.recent_snapshot.records()):
+                cols = st.columns([2, 3, 3, 2, 2], gap="small", vertical_alignment="center")
                 
                 if cols[0].button(row["장비ID"], key=f"btn_0_{idx}", type="tertiary"):
-                    self.recent_map_data = self.get_map_data("오토바이DB_현재")
                     st.session_state.selected_menu = "오토바이 누적 위치"
                     st.session_state.latest_page__first_main = False
                     st.session_state.cumulative_page__first_main = True
                     st.session_state.cumulative_page__select_device = row["장비ID"]
+                    st.session_state.cumulative_page__page = 0
                     st.rerun()
                 cols[1].write(row["차량번호"])
-                cols[2].write(row["시간"])
+                cols[2].write(self._format_time(row["시간"]))
                 cols[3].write(row["위도"])
                 cols[4].write(row["경도"])
 
-                # 👉 각 행마다 지도보기 버튼
-                if cols[5].button("보기", key=f"btn_1_{idx}"):
-                    self.recent_map_data = self.get_map_data("오토바이DB_현재")
-                    st.session_state.selected_lat = float(row["위도"])
-                    st.session_state.selected_lng = float(row["경도"])
-                    st.session_state.selected_device_id = row["장비ID"]
-                    st.session_state.selected_car_number = row["차량번호"]
-                    st.session_state.selected_car_time = row["시간"]
-                    st.session_state.latest_page__first_main = False
-                    st.rerun()
-
-    def render_cumulative_page_table_with_buttons(self, select_device_df: DataFrame):
+    def render_cumulative_page_table_with_buttons(self, device_snapshot: FleetSnapshot):
         # --- 헤더 행 ---
         with st.container(height=50, gap="small", vertical_alignment="center", border=True):  # border=True 주면 박스 테두리
-            header_cols = st.columns([2, 3, 3, 2, 2, 2], vertical_alignment="center")
+            header_cols = st.columns([2, 3, 3, 2, 2], vertical_alignment="center")
             header_cols[0].markdown("**장비ID**")
             header_cols[1].markdown("**차량번호**")
             header_cols[2].markdown("**시간**")
             header_cols[3].markdown("**위도**")
             header_cols[4].markdown("**경도**")
-            header_cols[5].markdown("**상세추적**")
 
         # --- 내용 행들 ---
         with st.container(height=300, gap="small", border=True):  # border=True 주면 박스 테두리\
-            for idx, row in select_device_df.iterrows():
-                cols = st.columns([2, 3, 3, 2, 2, 2], gap="small", vertical_alignment="center")
+            for idx, row in enumerate(device_snapshot.records()):
+                cols = st.columns([2, 3, 3, 2, 2], gap="small", vertical_alignment="center")
                 
                 cols[0].write(row["장비ID"])
                 cols[1].write(row["차량번호"])
-                cols[2].write(row["시간"])
+                cols[2].write(self._format_time(row["시간"]))
                 cols[3].write(row["위도"])
                 cols[4].write(row["경도"])
 
-                # 👉 각 행마다 지도보기 버튼
-                if cols[5].button("보기", key=f"btn_1_{idx}"):
-                    self.recent_map_data = self.get_map_data("오토바이DB_현재")
-                    st.session_state.selected_lat = float(row["위도"])
-                    st.session_state.selected_lng = float(row["경도"])
-                    st.session_state.selected_device_id = row["장비ID"]
-                    st.session_state.selected_car_number = row["차량번호"]
-                    st.session_state.selected_car_time = row["시간"]
-                    st.session_state.cumulative_page__first_main = False                    
-                    st.rerun()
-
     # -----------------------
     # Page 렌더링 함수들
     # -----------------------
     def render_latest_page(self) -> None:
         st.markdown("#### 📍 오토바이 현재 위치")
 
-        if st.session_state.latest_page__first_main:
-            self.render_current_all_motion_map()
-        else:
-            self.render_current_selected_motion_map()            
+        # 지도 마커를 클릭하면 그 지점 + 로드뷰로 바뀐다
+        self.render_latest_map()
         self.render_latest_page_table_with_buttons()
 
     def render_cumulative_page(self) -> None:
         st.markdown("#### 📊 오토바이 누적 위치")
         
-        cumulative_df = pd.DataFrame(self.cumulative_map_data) 
-        self.render_select_box(cumulative_df)                
+        cumulative_snapshot = self.cumulative_snapshot
+        self.render_select_box(cumulative_snapshot)                
         
         if st.session_state.cumulative_page__select_device:
-            select_device_df = cumulative_df[cumulative_df["장비ID"] == st.session_state.cumulative_page__select_device]
-            select_device_df = select_device_df.sort_values("시간", ascending=False)            
-            if st.session_state.cumulative_page__first_main:            
-                self.render_cumulative_all_motion_map(select_device_df)
-            else:
-                self.render_cumulative_selected_motion_map(select_device_df)
-            self.render_cumulative_page_table_with_buttons(select_device_df)
+            device_snapshot = self.get_device_history(
+                st.session_state.cumulative_page__select_device,
+                st.session_state.cumulative_page__page,
+            )
+            if device_snapshot.empty:
+                return
+            self.render_cumulative_map(device_snapshot)
+            self.render_cumulative_page_table_with_buttons(device_snapshot)
+            self.render_page_buttons(len(device_snapshot))
 
 
     # -----------------------
     # 메인 페이지 렌더링 함수
     # -----------------------
-    def render_select_box(self, data_df) -> None:
-        select_list = list(set(data_df["장비ID"]))
+    def render_select_box(self, snapshot: FleetSnapshot) -> None:
+        select_list = snapshot.device_ids()
         
-        index = select_list.index(st.session_state.cumulative_page__select_device) if st.session_state.cumulative_page__select_device else None
+        selected_device = st.session_state.cumulative_page__select_device
+        index = select_list.index(selected_device) if selected_device in select_list else None
         st.session_state.cumulative_page__select_device = st.selectbox(
             "장비 선택", 
             select_list,
             index=index,
             placeholder="장비를 선택해주세요...",
         )
+        # 장비가 바뀌면 첫 페이지부터
+        if st.session_state.cumulative_page__select_device != selected_device:
+            st.session_state.cumulative_page__page = 0
+
+    def render_page_buttons(self, row_count: int) -> None:
+        """누적 페이지 기록 표 아래 이전/다음 페이지 버튼"""
+        page = st.session_state.cumulative_page__page
+        cols = st.columns([1, 1, 6], vertical_alignment="center")
+        if cols[0].button("◀ 이전", key="page_prev", disabled=page == 0):
+            st.session_state.cumulative_page__page = page - 1
+            st.session_state.cumulative_page__first_main = True
+            st.rerun()
+        if cols[1].button("다음 ▶", key="page_next", disabled=row_count < self.DEVICE_HISTORY_PAGE_SIZE):
+            st.session_state.cumulative_page__page = page + 1
+            st.session_state.cumulative_page__first_main = True
+            st.rerun()
+        cols[2].write(f"{page + 1} 페이지")
 
     def render_sidebar(self) -> None:
         st.sidebar.title("메뉴 선택")
@@ -864,26 +670,26 @@ class SecureLoginApp:
         if st.session_state.selected_menu != selected:
             st.session_state.selected_menu = selected
             if st.session_state.selected_menu == "오토바이 현재 위치":
-                self.recent_map_data = self.get_map_data("오토바이DB_현재")
                 st.session_state.latest_page__first_main = True                            
             elif st.session_state.selected_menu == "오토바이 누적 위치":
-                self.cumulative_map_data = self.get_map_data("오토바이DB_누적")
                 st.session_state.cumulative_page__first_main = True
                 st.session_state.cumulative_page__select_device = None                
+                st.session_state.cumulative_page__page = 0
             st.rerun()
                     
         st.sidebar.space()
         if st.sidebar.button("새로고침", key="refresh", type="primary", icon="🔄", width="content"):
             st.session_state.cumulative_page__first_main = True
             st.session_state.latest_page__first_main = True            
-            if st.session_state.selected_menu == "오토바이 현재 위치":
-                self.recent_map_data = self.get_map_data("오토바이DB_현재")
-            elif st.session_state.selected_menu == "오토바이 누적 위치":
-                self.cumulative_map_data = self.get_map_data("오토바이DB_누적")
-            st.rerun()
+            # 폴러에 바로 다시 읽도록 요청하고 새 버전이 게시될 때까지 잠깐 기다린다
+            if not self.poller.request_refresh(wait=self.MAP_REFRESH_WAIT_SECONDS):
+                st.sidebar.warning("새 데이터를 아직 받지 못했습니다. 잠시 후 자동으로 갱신됩니다.")
+            else:
+                st.rerun()
 
     def render_main_page(self) -> None:
         """로그인 이후 메인 화면 렌더링"""
+        self._init_map_session_state()
         self.render_sidebar()
         
         if st.session_state.selected_menu == "오토바이 현재 위치":
@@ -896,6 +702,9 @@ class SecureLoginApp:
     # -----------------------    
     
     def run(self) -> None:
+        # 이번 rerun 동안 읽을 공용 데이터 버전 고정
+        self._pin_state()
+
         # 세션 상태 초기화 (session_state는 rerun 사이에 유지)
         self._init_session_state()
                 
@@ -904,6 +713,7 @@ class SecureLoginApp:
             self.render_main_page()
         else:
             self.render_login_page()
+        self._record_startup_metric("time_to_first_paint")
             
         # self.render_main_page()
 
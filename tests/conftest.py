@@ -0,0 +1,412 @@
+# 테스트 공용 fixture
+# 구글 시트는 gspread의 HTTP 클라이언트 자리에 메모리 시트(FakeSheetsAPI)를 넣어서,
+# GoogleSheet는 실제 gspread Spreadsheet / Worksheet 코드를 그대로 거쳐서 읽고 쓴다.
+import copy
+import re
+import threading
+from types import SimpleNamespace
+
+import gspread
+import pytest
+import requests
+
+
+def col_to_index(letters: str) -> int:
+    """A -> 0, B -> 1, ..., AA -> 26"""
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + ord(char) - ord("A") + 1
+    return number - 1
+
+
+def index_to_col(index: int) -> str:
+    letters = ""
+    index += 1
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(remainder + ord("A")) + letters
+    return letters
+
+
+def display_value(value) -> str:
+    """FORMATTED_VALUE로 읽을 때 보이는 문자열"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def entered_value(value):
+    """USER_ENTERED로 쓸 때 숫자처럼 보이는 문자열은 숫자로 저장된다"""
+    if isinstance(value, str) and re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if isinstance(value, str) and re.fullmatch(r"-?\d*\.\d+", value):
+        return float(value)
+    return value
+
+
+class FakeSheetsAPI(gspread.http_client.HTTPClient):
+    """
+    gspread.HTTPClient 대신 쓰는 메모리 스프레드시트 (Sheets API v4 요청/응답 모양만 흉내낸다).
+
+    - sheets: {시트 이름: {"properties": 시트 properties, "rows": 2차원 값 리스트}}
+    - calls: 받은 요청 (메서드 이름, 범위) 목록 - 요청 수 / 범위를 확인할 때 쓴다
+    - version: 쓰기가 있을 때마다 1씩 올라가는 Drive 파일 버전
+    - 그리드(rowCount) 밖에 쓰면 실제 API처럼 실패한다
+    """
+
+    def __init__(self, title: str = "테스트 시트"):
+        # 인증 / 세션 설정을 하는 HTTPClient.__init__은 부르지 않는다 (gspread의 타입 검사만 통과하면 됨)
+        self.spreadsheet_id = "test-spreadsheet-id"
+        self.title = title
+        self.sheets = {}
+        self.calls = []
+        self.version = 1
+        self.session = requests.Session()
+        self._lock = threading.RLock()
+
+    # -----------------------
+    # 테스트 준비 / 확인
+    # -----------------------
+    def add_sheet(self, title: str, rows=(), row_count: int = None, col_count: int = 26) -> None:
+        rows = [list(row) for row in rows]
+        self.sheets[title] = {
+            "properties": {
+                "sheetId": len(self.sheets) + 1,
+                "title": title,
+                "index": len(self.sheets),
+                "sheetType": "GRID",
+                "gridProperties": {"rowCount": row_count or max(1000, len(rows)), "columnCount": col_count},
+            },
+            "rows": rows,
+        }
+
+    def rows(self, title: str) -> list:
+        """시트 값 (행 끝 빈칸, 맨 아래 빈 행은 잘라서)"""
+        return self._trim(self.sheets[title]["rows"])
+
+    def row_count(self, title: str) -> int:
+        return self.sheets[title]["properties"]["gridProperties"]["rowCount"]
+
+    def count(self, method: str) -> int:
+        return sum(1 for name, _ in self.calls if name == method)
+
+    # -----------------------
+    # 내부 도우미
+    # -----------------------
+    def _sheet_by_id(self, sheet_id: int) -> dict:
+        for sheet in self.sheets.values():
+            if sheet["properties"]["sheetId"] == sheet_id:
+                return sheet
+        raise KeyError(sheet_id)
+
+    def _parse_range(self, label: str):
+        """'시트'!A1:B2 -> (시트, 시작 행, 시작 열, 끝 행, 끝 열) (0부터, 끝은 포함 안 함, 없으면 None)"""
+        if "!" in label:
+            title, cells = label.rsplit("!", 1)
+        elif label.strip("'") in self.sheets:
+            title, cells = label, ""
+        else:
+            title, cells = next(iter(self.sheets)), label
+        if title.startswith("'") and title.endswith("'"):
+            title = title[1:-1].replace("''", "'")
+        if not cells:
+            return title, 0, 0, None, None
+        parts = cells.split(":")
+        start = re.fullmatch(r"([A-Za-z]*)(\d*)", parts[0])
+        end = re.fullmatch(r"([A-Za-z]*)(\d*)", parts[-1])
+        row0 = int(start[2]) - 1 if start[2] else 0
+        col0 = col_to_index(start[1]) if start[1] else 0
+        row1 = int(end[2]) if end[2] else None
+        col1 = col_to_index(end[1]) + 1 if end[1] else None
+        return title, row0, col0, row1, col1
+
+    @staticmethod
+    def _trim(rows) -> list:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            while row and row[-1] in (None, ""):
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def _read(self, label: str, params=None) -> dict:
+        params = params or {}
+        title, row0, col0, row1, col1 = self._parse_range(label)
+        sheet = self.sheets[title]
+        unformatted = params.get("valueRenderOption") in ("UNFORMATTED_VALUE", "FORMULA")
+        values = []
+        for row in sheet["rows"][row0:row1]:
+            cells = row[col0:col1]
+            values.append([cell if unformatted and cell is not None else display_value(cell) for cell in cells])
+        values = self._trim(values)
+        if params.get("majorDimension") == "COLUMNS":
+            width = max((len(row) for row in values), default=0)
+            values = self._trim([
+                [row[col] if col < len(row) else "" for row in values] for col in range(width)
+            ])
+        response = {"range": label, "majorDimension": params.get("majorDimension") or "ROWS"}
+        if values:
+            response["values"] = values
+        return response
+
+    def _write(self, title: str, row0: int, col0: int, values, input_option=None) -> str:
+        sheet = self.sheets[title]
+        row_limit = sheet["properties"]["gridProperties"]["rowCount"]
+        if row0 + len(values) > row_limit:
+            raise ValueError(f"Range ('{title}'!A{row0 + len(values)}) exceeds grid limits. Max rows: {row_limit}")
+        rows = sheet["rows"]
+        width = 1
+        for offset, values_row in enumerate(values):
+            while len(rows) <= row0 + offset:
+                rows.append([])
+            row = rows[row0 + offset]
+            while len(row) < col0 + len(values_row):
+                row.append(None)
+            for col, value in enumerate(values_row):
+                row[col0 + col] = entered_value(value) if input_option == "USER_ENTERED" else value
+            width = max(width, len(values_row))
+        self.version += 1
+        return f"'{title}'!{index_to_col(col0)}{row0 + 1}:{index_to_col(col0 + width - 1)}{row0 + len(values)}"
+
+    def _insert_rows(self, sheet: dict, start: int, count: int) -> None:
+        rows = sheet["rows"]
+        while len(rows) < start:
+            rows.append([])
+        rows[start:start] = [[] for _ in range(count)]
+        sheet["properties"]["gridProperties"]["rowCount"] += count
+
+    # -----------------------
+    # gspread.HTTPClient 메서드
+    # -----------------------
+    def set_timeout(self, timeout) -> None:
+        self.timeout = timeout
+
+    def fetch_sheet_metadata(self, id, params=None) -> dict:
+        with self._lock:
+            self.calls.append(("fetch_sheet_metadata", None))
+            return {
+                "spreadsheetId": self.spreadsheet_id,
+                "properties": {"title": self.title},
+                "sheets": [{"properties": copy.deepcopy(sheet["properties"])} for sheet in self.sheets.values()],
+            }
+
+    def values_get(self, id, range, params=None) -> dict:
+        with self._lock:
+            self.calls.append(("values_get", range))
+            return self._read(range, params)
+
+    def values_batch_get(self, id, ranges, params=None) -> dict:
+        with self._lock:
+            self.calls.append(("values_batch_get", tuple(ranges)))
+            return {"spreadsheetId": self.spreadsheet_id, "valueRanges": [self._read(label, params) for label in ranges]}
+
+    def values_update(self, id, range, params=None, body=None) -> dict:
+        with self._lock:
+            self.calls.append(("values_update", range))
+            title, row0, col0, _, _ = self._parse_range(range)
+            updated = self._write(title, row0, col0, body["values"], (params or {}).get("valueInputOption"))
+            return {"spreadsheetId": self.spreadsheet_id, "updatedRange": updated}
+
+    def values_batch_update(self, id, body=None) -> dict:
+        with self._lock:
+            self.calls.append(("values_batch_update", tuple(data["range"] for data in body["data"])))
+            for data in body["data"]:
+                title, row0, col0, _, _ = self._parse_range(data["range"])
+                self._write(title, row0, col0, data["values"], body.get("valueInputOption"))
+            return {"spreadsheetId": self.spreadsheet_id, "totalUpdatedCells": sum(len(data["values"]) for data in body["data"])}
+
+    def values_append(self, id, range, params, body) -> dict:
+        """범위의 열에서 값이 있는 마지막 행 다음에 붙인다 (INSERT_ROWS면 그 자리에 새 행을 끼워 넣음)"""
+        with self._lock:
+            self.calls.append(("values_append", range))
+            title, row0, col0, _, col1 = self._parse_range(range)
+            sheet = self.sheets[title]
+            values = body["values"]
+            width = max(len(row) for row in values)
+            col1 = max(col1 or 0, col0 + width)
+            last_row = row0
+            for row_index, row in enumerate(sheet["rows"][row0:], row0):
+                if any(value not in (None, "") for value in row[col0:col1]):
+                    last_row = row_index + 1
+            grid = sheet["properties"]["gridProperties"]
+            if params.get("insertDataOption") == "INSERT_ROWS":
+                self._insert_rows(sheet, last_row, len(values))
+            elif last_row + len(values) > grid["rowCount"]:
+                grid["rowCount"] = last_row + len(values)
+            updated = self._write(title, last_row, col0, values, params.get("valueInputOption"))
+            return {
+                "spreadsheetId": self.spreadsheet_id,
+                "tableRange": range,
+                "updates": {"updatedRange": updated, "updatedRows": len(values)},
+            }
+
+    def values_clear(self, id, range) -> dict:
+        with self._lock:
+            self.calls.append(("values_clear", range))
+            title, row0, col0, row1, col1 = self._parse_range(range)
+            for row in self.sheets[title]["rows"][row0:row1]:
+                for col in range(col0, min(len(row), col1 or len(row))):
+                    row[col] = None
+            self.version += 1
+            return {"spreadsheetId": self.spreadsheet_id, "clearedRange": range}
+
+    def batch_update(self, id, body) -> dict:
+        with self._lock:
+            self.calls.append(("batch_update", tuple(next(iter(request)) for request in body["requests"])))
+            for request in body["requests"]:
+                kind, spec = next(iter(request.items()))
+                if kind == "updateSheetProperties":
+                    sheet = self._sheet_by_id(spec["properties"]["sheetId"])
+                    grid = sheet["properties"]["gridProperties"]
+                    grid.update(spec["properties"].get("gridProperties", {}))
+                    del sheet["rows"][grid["rowCount"]:]
+                elif kind == "appendDimension":
+                    sheet = self._sheet_by_id(spec["sheetId"])
+                    assert spec["dimension"] == "ROWS"
+                    sheet["properties"]["gridProperties"]["rowCount"] += spec["length"]
+                elif kind in ("deleteDimension", "insertDimension"):
+                    grid_range = spec["range"]
+                    assert grid_range["dimension"] == "ROWS"
+                    sheet = self._sheet_by_id(grid_range["sheetId"])
+                    start, end = grid_range["startIndex"], grid_range["endIndex"]
+                    if kind == "deleteDimension":
+                        del sheet["rows"][start:end]
+                        sheet["properties"]["gridProperties"]["rowCount"] -= end - start
+                    else:
+                        self._insert_rows(sheet, start, end - start)
+                else:
+                    raise NotImplementedError(kind)
+            self.version += 1
+            return {"spreadsheetId": self.spreadsheet_id, "replies": [{} for _ in body["requests"]]}
+
+    def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+        """Drive 파일 메타데이터 요청만 흉내낸다 (version은 쓰기마다 올라감)"""
+        with self._lock:
+            self.calls.append(("request", endpoint))
+            assert "drive/v3/files" in endpoint, endpoint
+            metadata = {"version": str(self.version), "modifiedTime": f"2024-01-01T00:00:{self.version % 60:02d}Z"}
+            return SimpleNamespace(json=lambda: metadata, status_code=200)
+
+
+class FakeClient:
+    """gspread.authorize()가 돌려주는 Client 대신 (open / open_by_key 만)"""
+
+    def __init__(self, api: FakeSheetsAPI):
+        self.http_client = api
+
+    def set_timeout(self, timeout) -> None:
+        self.http_client.set_timeout(timeout)
+
+    def open(self, title: str) -> gspread.Spreadsheet:
+        self.http_client.calls.append(("open", title))
+        if title != self.http_client.title:
+            raise gspread.exceptions.SpreadsheetNotFound(title)
+        return gspread.Spreadsheet(self.http_client, {"id": self.http_client.spreadsheet_id})
+
+    def open_by_key(self, key: str) -> gspread.Spreadsheet:
+        self.http_client.calls.append(("open_by_key", key))
+        if key != self.http_client.spreadsheet_id:
+            raise gspread.exceptions.SpreadsheetNotFound(key)
+        return gspread.Spreadsheet(self.http_client, {"id": key})
+
+
+@pytest.fixture
+def sheets_api() -> FakeSheetsAPI:
+    return FakeSheetsAPI()
+
+
+@pytest.fixture
+def make_google_sheet(monkeypatch, sheets_api):
+    """가짜 인증 / 가짜 API로 GoogleSheet를 만드는 함수 (인자는 GoogleSheet 생성자 옵션)"""
+    from util.data_load import google_sheet
+
+    monkeypatch.setattr(google_sheet.st, "secrets", {"google_service_account": {}})
+    monkeypatch.setattr(google_sheet.service_account.Credentials, "from_service_account_info", lambda info, scopes=None: object())
+    monkeypatch.setattr(google_sheet.gspread, "authorize", lambda credentials: FakeClient(sheets_api))
+
+    def make(**options):
+        return google_sheet.GoogleSheet(sheets_api.title, **options)
+    return make
+
+
+@pytest.fixture
+def google_sheet(make_google_sheet):
+    return make_google_sheet()
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_state():
+    """SHEET_CACHE / SPREADSHEET_KEYS는 프로세스 전체에서 공유하므로 테스트마다 비운다"""
+    from util.data_load.google_sheet import SHEET_CACHE, SPREADSHEET_KEYS
+
+    SHEET_CACHE.invalidate()
+    SPREADSHEET_KEYS.clear()
+    yield
+    SHEET_CACHE.invalidate()
+    SPREADSHEET_KEYS.clear()
+
+
+TRACKER_HEADER = ["장비ID", "차량번호", "시간", "위도", "경도", "속도", "상태"]
+
+
+def tracker_rows(*rows):
+    """(장비ID, 시간(초), 위도, 경도) 목록 -> 오토바이DB 시트 행 (헤더 포함)"""
+    sheet_rows = [list(TRACKER_HEADER)]
+    for device_id, second, lat, lng in rows:
+        car_number = {"dev1": "11가1111", "dev2": "22나2222"}.get(device_id, "99다9999")
+        sheet_rows.append([device_id, car_number, f"2024-01-01 00:00:{second:02d}", lat, lng, 10.0, "운행"])
+    return sheet_rows
+
+
+def make_tracker_frame(*rows):
+    """tracker_rows()를 TRACKER_SCHEMA로 변환한 DataFrame"""
+    import pandas as pd
+    from util.data_load.schema import TRACKER_SCHEMA, apply_schema
+
+    sheet_rows = tracker_rows(*rows)
+    return apply_schema(pd.DataFrame(sheet_rows[1:], columns=sheet_rows[0]), TRACKER_SCHEMA)
+
+
+@pytest.fixture
+def tracker_frame():
+    """장비 2대(dev1 3건, dev2 2건)가 섞여 있는 오토바이DB_누적 DataFrame"""
+    return make_tracker_frame(
+        ("dev1", 1, 37.1, 127.1),
+        ("dev2", 2, 37.2, 127.2),
+        ("dev1", 3, 37.3, 127.3),
+        ("dev2", 4, 0, 0),
+        ("dev1", 5, 37.5, 127.5),
+    )
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_retry_policy(monkeypatch):
+    """공유 RETRY_POLICY의 호출 속도 제한 / 회로 차단 상태가 테스트끼리 이어지지 않도록 테스트마다 새로 둔다"""
+    from util.data_load.google_sheet import RETRY_POLICY, TokenBucket
+
+    monkeypatch.setattr(RETRY_POLICY, "bucket", TokenBucket(rate_per_minute=60000))
+    monkeypatch.setattr(RETRY_POLICY, "breaker_state", RETRY_POLICY.CLOSED)
+    monkeypatch.setattr(RETRY_POLICY, "_consecutive_failures", 0)
+
+
+@pytest.fixture
+def make_workbook(tmp_path):
+    """{시트 이름: 행 목록}으로 .xlsx 파일을 만들고 경로를 돌려주는 함수"""
+    from openpyxl import Workbook
+
+    def make(sheets: dict, name: str = "기록.xlsx") -> str:
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for title, rows in sheets.items():
+            worksheet = workbook.create_sheet(title)
+            for row in rows:
+                worksheet.append(list(row))
+        path = tmp_path / name
+        workbook.save(path)
+        return str(path)
+    return make
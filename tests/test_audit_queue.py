@@ -0,0 +1,82 @@
+# AuditQueue - 로그인 내역 / 잠금 상태 쓰기를 모아서 백그라운드에서 시트에 쓴다
+import pytest
+
+from util.data_load.audit_queue import AuditQueue
+
+
+HISTORY_HEADER = ["시간", "아이디", "결과"]
+
+
+@pytest.fixture
+def history_sheet(sheets_api, make_google_sheet):
+    """로그인 내역 시트와 잠금 셀(C2)이 있는 GoogleSheet"""
+    sheets_api.add_sheet("로그인 내역", [HISTORY_HEADER])
+    sheets_api.add_sheet("[ 로그인 계정 ]", [["아이디", "비밀번호", "사용가능"], ["user", "hash", ""]])
+    return make_google_sheet()
+
+
+@pytest.fixture
+def audit_queue(history_sheet):
+    queue = AuditQueue(history_sheet, flush_interval=60)
+    yield queue
+    queue.stop()
+
+
+def test_rows_are_written_in_one_append_per_sheet(audit_queue, sheets_api):
+    for index in range(3):
+        audit_queue.append_row("로그인 내역", ["2024-01-01 00:00:00", f"user{index}", "성공"])
+    assert sheets_api.count("values_append") == 0
+    assert audit_queue.pending == 3
+
+    assert audit_queue.flush() == 3
+    assert sheets_api.count("values_append") == 1
+    assert [row[1] for row in sheets_api.rows("로그인 내역")[1:]] == ["user0", "user1", "user2"]
+    assert audit_queue.pending == 0
+
+
+def test_set_cell_writes_only_changes(audit_queue, sheets_api):
+    audit_queue.remember_cell("[ 로그인 계정 ]", "C2", "사용가능")
+
+    assert not audit_queue.set_cell("[ 로그인 계정 ]", "c2", "사용가능")
+    assert audit_queue.set_cell("[ 로그인 계정 ]", "C2", "사용차단")
+    assert not audit_queue.set_cell("[ 로그인 계정 ]", "C2", "사용차단")
+
+    assert audit_queue.flush() == 1
+    assert sheets_api.rows("[ 로그인 계정 ]")[1][2] == "사용차단"
+
+
+
+def test_set_cell_force_writes_same_value(audit_queue, sheets_api):
+    audit_queue.remember_cell("[ 로그인 계정 ]", "C2", "사용차단")
+
+    # 시트에서 다른 곳이 값을 되돌렸을 수 있으므로 force면 같은 값도 다시 쓴다
+    assert audit_queue.set_cell("[ 로그인 계정 ]", "C2", "사용차단", force=True)
+    assert audit_queue.flush() == 1
+    assert sheets_api.rows("[ 로그인 계정 ]")[1][2] == "사용차단"
+
+def test_failed_flush_is_retried_in_order(audit_queue, history_sheet, sheets_api, monkeypatch):
+    write_rows = history_sheet.write_rows
+    errors = [RuntimeError("쓰기 실패")]
+
+    def flaky_write_rows(*args, **kwargs):
+        if errors:
+            raise errors.pop()
+        return write_rows(*args, **kwargs)
+    monkeypatch.setattr(history_sheet, "write_rows", flaky_write_rows)
+
+    audit_queue.append_row("로그인 내역", ["2024-01-01 00:00:00", "first", "실패"])
+    assert audit_queue.flush() == 0
+    assert audit_queue.failures == 1
+
+    audit_queue.append_row("로그인 내역", ["2024-01-01 00:00:01", "second", "성공"])
+    assert audit_queue.flush() == 2
+    assert [row[1] for row in sheets_api.rows("로그인 내역")[1:]] == ["first", "second"]
+
+
+def test_stop_flushes_pending_rows(history_sheet, sheets_api):
+    queue = AuditQueue(history_sheet, flush_interval=60)
+    queue.start()
+    queue.append_row("로그인 내역", ["2024-01-01 00:00:00", "user", "성공"])
+    queue.stop()
+
+    assert sheets_api.rows("로그인 내역")[1][1] == "user"
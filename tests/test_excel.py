@@ -0,0 +1,215 @@
+# ExcelSheet - 읽기 전용(스트리밍) 모드, 여러 행 쓰기, CSV 사이드카
+import os
+import threading
+
+import pytest
+
+import util.data_load.excel as excel
+from util.data_load.excel import ExcelSheet, get_last_data_rows, get_max_row_in_col_range, get_min_of_last_data_rows
+from util.data_load.schema import TRACKER_SCHEMA
+from tests.conftest import tracker_rows
+
+
+@pytest.fixture
+def tracker_path(make_workbook):
+    """장비 7건 + 맨 아래 빈 행 + key가 빈 행 뒤의 메모 행이 있는 기록 파일"""
+    rows = tracker_rows(*[("dev1" if index % 2 else "dev2", index, 37 + index / 10, 127.0) for index in range(1, 8)])
+    return make_workbook({"누적": rows + [[None] * 7, [None, "메모"]]})
+
+
+def test_read_only_load_matches_normal_load(tracker_path):
+    expected = ExcelSheet(tracker_path).load_as_dataframe("누적", "A", "G", ["A"], schema=TRACKER_SCHEMA)
+    store = ExcelSheet(tracker_path, read_only=True)
+    try:
+        frame = store.load_as_dataframe("누적", "A", "G", ["A"], schema=TRACKER_SCHEMA)
+    finally:
+        store.close()
+
+    assert frame.equals(expected)
+    assert len(frame) == 7
+
+
+def test_iter_dataframe_chunks(tracker_path):
+    store = ExcelSheet(tracker_path, read_only=True)
+    try:
+        chunks = list(store.iter_dataframe_chunks("누적", "A", "G", ["A"], chunk_size=3))
+    finally:
+        store.close()
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[0]["위도"].tolist() == ["37.1", "37.2", "37.3"]
+    assert chunks[-1]["시간"].tolist() == ["2024-01-01 00:00:07"]
+
+
+
+@pytest.mark.parametrize("read_only", [False, True])
+def test_header_only_sheet_loads_empty_frame(make_workbook, read_only):
+    store = ExcelSheet(make_workbook({"누적": tracker_rows()}), read_only=read_only)
+    try:
+        frame = store.load_as_dataframe("누적", "A", "G", ["A"], schema=TRACKER_SCHEMA)
+        fetched = None if read_only else store.load_as_fetched_data("누적", "A", "G", ["A"])
+    finally:
+        store.close()
+
+    assert frame.empty
+    assert frame.columns.tolist() == tracker_rows()[0]
+    if not read_only:
+        assert fetched == [tracker_rows()[0]]
+
+def test_read_only_rejects_writes(tracker_path):
+    store = ExcelSheet(tracker_path, read_only=True)
+    try:
+        with pytest.raises(ValueError):
+            store.update("누적", [["dev3"]], "A")
+        with pytest.raises(ValueError):
+            store.set_value_by_cell("누적", "A2", "dev3")
+    finally:
+        store.close()
+
+
+def test_last_data_rows_in_one_pass(make_workbook):
+    sheet = ExcelSheet(make_workbook({"S": [["a", "b", "c"], ["a", None, "c"], [None, None, "c"]]})).load_sheet("S")
+
+    assert get_last_data_rows(sheet, ["a", "B", "C"]) == {"A": 2, "B": 1, "C": 3}
+    assert get_min_of_last_data_rows(sheet, ["A", "C"]) == 2
+    assert get_max_row_in_col_range(sheet, "A", "B") == 2
+
+
+# -----------------------
+# 여러 행 쓰기 / key 인덱스 / CSV 사이드카 (user-021)
+# -----------------------
+@pytest.fixture
+def spreadsheet_path(make_workbook):
+    return make_workbook({"S": [["이름", "값"]]})
+
+
+def read_names(store):
+    return store.load_as_dataframe("S", "A", "B", use_cache=False)["이름"].tolist()
+
+
+def test_appends_use_cached_cursor(spreadsheet_path, monkeypatch):
+    store = ExcelSheet(spreadsheet_path, autosave=False)
+    scans = []
+    monkeypatch.setattr(excel, "get_last_data_rows", lambda *args: scans.append(1) or get_last_data_rows(*args))
+
+    store.update("S", [["a", 1], ["b", 2]], "A")
+    store.update_oneline("S", ["c", 3], "A")
+
+    assert read_names(store) == ["a", "b", "c"]
+    assert len(scans) == 1
+
+
+
+def test_append_cursors_are_kept_per_start_column(make_workbook):
+    path = make_workbook({"S": [["a", "b", "c"], [1, 2], [3, 4]]})
+    store = ExcelSheet(path, autosave=False)
+
+    store.update("S", [[5, 6]], "A")
+    store.update("S", [["x", "y"]], "C")
+    store.update("S", [[7, 8]], "A")
+    store.update("S", [["z"]], "C")
+
+    # C열 표는 A열 append 위치와 상관없이 자기 마지막 행 아래에 붙는다
+    assert [store.get_value_by_cell("S", f"C{row}") for row in (2, 3)] == ["x", "z"]
+    assert [store.get_value_by_cell("S", f"A{row}") for row in (4, 5)] == ["5", "7"]
+
+    # 다른 표가 쓰는 열까지 덮는 append 뒤에는 그 표도 쓴 행 아래부터 붙인다
+    store.update("S", [[9, 10, "w"]], "A")
+    store.update("S", [["v"]], "C")
+    assert [store.get_value_by_cell("S", f"C{row}") for row in (6, 7)] == ["w", "v"]
+
+
+def test_concurrent_writes_are_serialized(spreadsheet_path):
+    store = ExcelSheet(spreadsheet_path, autosave=False)
+
+    def append(worker):
+        for index in range(20):
+            store.update_oneline("S", [f"{worker}-{index}", index], "A")
+            store.vlookup_update("S", f"{worker}-0", "A", "B", [[index]])
+            read_names(store)
+
+    threads = [threading.Thread(target=append, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    names = read_names(store)
+    assert len(names) == len(set(names)) == 80
+
+def test_autosave_false_saves_once(spreadsheet_path):
+    store = ExcelSheet(spreadsheet_path, autosave=False)
+    store.update("S", [["a", 1]], "A")
+    assert ExcelSheet(spreadsheet_path).get_value_by_cell("S", "A2") is None   # 파일에는 아직 없음
+
+    store.save()
+    assert read_names(ExcelSheet(spreadsheet_path)) == ["a"]
+
+
+def test_vlookup_update_many_with_key_index(spreadsheet_path):
+    store = ExcelSheet(spreadsheet_path, autosave=False)
+    store.update("S", [["a", 1], ["b", 2]], "A")
+
+    assert store.vlookup_update_many("S", "A", {"b": [20], "c": [30]}, "B") == {"b": 3, "c": 4}
+    store.vlookup_update("S", "a", "A", "B", [[10]])
+    store.update_oneline("S", ["d", 40], "A")
+
+    frame = store.load_as_dataframe("S", "A", "B")
+    assert frame["이름"].tolist() == ["a", "b", "c", "d"]
+    assert frame["값"].tolist() == ["10", "20", "30", "40"]
+
+
+def test_sidecar_appends_skip_workbook(spreadsheet_path):
+    store = ExcelSheet(spreadsheet_path, sidecar_sheets=["S"])
+    modified = os.stat(spreadsheet_path).st_mtime_ns
+
+    store.update("S", [["a", 1], ["b", 2]], "A")
+    assert os.stat(spreadsheet_path).st_mtime_ns == modified
+    assert os.path.exists(store.get_sidecar_path("S"))
+    assert read_names(store) == ["a", "b"]
+    assert read_names(ExcelSheet(spreadsheet_path, sidecar_sheets=["S"])) == ["a", "b"]
+
+    assert store.flush_sidecar() == 2
+    assert not os.path.exists(store.get_sidecar_path("S"))
+    assert read_names(ExcelSheet(spreadsheet_path)) == ["a", "b"]
+
+
+def test_rows_appended_after_move_are_kept(spreadsheet_path):
+    store = ExcelSheet(spreadsheet_path, autosave=False, sidecar_sheets=["S"])
+    sidecar_path = store.get_sidecar_path("S")
+
+    store.update("S", [["a", 1], ["b", 2]], "A")
+    assert read_names(store) == ["a", "b"]
+
+    # 셀을 고치면 사이드카 행이 먼저 시트로 옮겨진다
+    store.set_value_by_cell("S", "B2", "10")
+    store.update("S", [["c", 3]], "A")
+    assert read_names(store) == ["a", "b", "c"]
+
+    # 저장하면 옮긴 행만 CSV에서 빠지고, 옮긴 뒤에 붙인 행은 CSV에 남는다
+    store.save()
+    assert os.path.exists(sidecar_path)
+    assert read_names(store) == ["a", "b", "c"]
+
+    reopened = ExcelSheet(spreadsheet_path, sidecar_sheets=["S"])
+    assert read_names(reopened) == ["a", "b", "c"]
+    assert reopened.get_value_by_cell("S", "B2") == "10"
+
+    assert reopened.flush_sidecar() == 1
+    assert not os.path.exists(sidecar_path)
+    assert read_names(ExcelSheet(spreadsheet_path)) == ["a", "b", "c"]
+
+
+def test_moving_twice_before_save(spreadsheet_path):
+    store = ExcelSheet(spreadsheet_path, autosave=False, sidecar_sheets=["S"])
+
+    store.update("S", [["a", 1]], "A")
+    store.set_value_by_cell("S", "B2", "10")
+    store.update("S", [["b", 2]], "A")
+    # 옮긴 뒤에 붙인 행도 다음 번에 옮겨지고, 이미 옮긴 행은 다시 옮기지 않는다
+    store.set_value_by_cell("S", "B3", "20")
+    assert read_names(store) == ["a", "b"]
+
+    store.save()
+    assert not os.path.exists(store.get_sidecar_path("S"))
+    assert read_names(ExcelSheet(spreadsheet_path)) == ["a", "b"]
@@ -0,0 +1,94 @@
+# FleetSnapshot - 컬럼 형태로 들고 있는 오토바이DB 스냅샷
+import json
+
+import pandas as pd
+import pytest
+
+from util.data_load.fleet_snapshot import FleetSnapshot, RecordView
+from tests.conftest import make_tracker_frame
+
+
+def test_records_are_views_over_columns(tracker_frame):
+    snapshot = FleetSnapshot.from_frame(tracker_frame)
+
+    record = snapshot.record(1)
+    assert isinstance(record, RecordView)
+    assert (record["장비ID"], record["위도"]) == ("dev2", 37.2)
+    assert snapshot.record(-1)["위도"] == 37.5
+    assert [row["시간"].second for row in snapshot.records(1, 3)] == [2, 3]
+    assert dict(record).keys() == set(tracker_frame.columns)
+
+    with pytest.raises(IndexError):
+        snapshot.record(len(tracker_frame))
+
+
+def test_first_positioned_record_skips_empty_positions():
+    snapshot = FleetSnapshot.from_frame(make_tracker_frame(
+        ("dev2", 1, 0, 0),
+        ("dev1", 2, "", ""),
+        ("dev1", 3, 37.3, 127.3),
+    ))
+
+    assert snapshot.first_positioned_record().position == 2
+    assert FleetSnapshot.from_frame(make_tracker_frame(("dev1", 1, 0, 0))).first_positioned_record() is None
+
+
+def test_select_device_sorts_by_time_descending(tracker_frame):
+    snapshot = FleetSnapshot.from_frame(tracker_frame)
+    device = snapshot.select_device("dev1")
+
+    assert snapshot.device_ids() == ["dev1", "dev2"]
+    assert [row["시간"].second for row in device.records()] == [5, 3, 1]
+    assert device.version == snapshot.version
+
+
+def test_to_json_serializes_selected_columns(tracker_frame):
+    records = json.loads(FleetSnapshot.from_frame(tracker_frame).to_json(["장비ID", "위도"]))
+
+    assert records[0] == {"장비ID": "dev1", "위도": 37.1}
+    assert len(records) == 5
+
+
+def test_from_frame_bumps_version(tracker_frame):
+    first = FleetSnapshot.from_frame(tracker_frame)
+    second = FleetSnapshot.from_frame(tracker_frame, first)
+
+    assert (first.version, second.version) == (1, 2)
+    assert FleetSnapshot.from_frame(pd.DataFrame(columns=tracker_frame.columns)).empty
+
+
+# -----------------------
+# 장비별 인덱스 (user-008)
+# -----------------------
+def test_device_partitions_are_built_once(tracker_frame, monkeypatch):
+    snapshot = FleetSnapshot.from_frame(tracker_frame)
+    builds = []
+    build = snapshot._build_partitions
+    monkeypatch.setattr(snapshot, "_build_partitions", lambda: builds.append(1) or build())
+
+    device = snapshot.select_device("dev2")
+    assert snapshot.select_device("dev2") is device
+    assert snapshot.device_ids() == ["dev1", "dev2"]
+    assert len(builds) == 1
+    assert [row["시간"].second for row in device.records()] == [4, 2]
+
+
+def test_select_device_keeps_row_order_for_same_time():
+    snapshot = FleetSnapshot.from_frame(make_tracker_frame(
+        ("dev1", 1, 37.1, 127.1),
+        ("dev1", 1, 37.2, 127.2),
+        ("", 2, 37.3, 127.3),
+    ))
+
+    assert [row["위도"] for row in snapshot.select_device("dev1").records()] == [37.1, 37.2]
+    assert snapshot.select_device("dev9").empty
+
+
+def test_device_partitions_are_positions_into_frame(tracker_frame):
+    snapshot = FleetSnapshot.from_frame(tracker_frame)
+    snapshot.device_ids()
+
+    # 정렬된 복사본 없이 원래 frame의 행 번호만 들고 있다
+    positions = snapshot._partitions["dev1"]
+    assert positions.tolist() == snapshot.frame.index[snapshot.frame["장비ID"] == "dev1"][::-1].tolist()
+    assert snapshot.select_device("dev1").frame.equals(snapshot.frame.take(positions).reset_index(drop=True))
@@ -0,0 +1,924 @@
+# GoogleSheet - 가짜 Sheets API(conftest.FakeSheetsAPI) 위에서 읽기/쓰기 동작을 확인한다
+import csv
+import io
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import gspread
+import pandas as pd
+import pytest
+from requests.exceptions import ConnectionError
+
+from util.data_load.schema import TRACKER_SCHEMA
+from tests.conftest import col_to_index, display_value
+from util.data_load.google_sheet import RETRY_POLICY, SHEET_CACHE, CircuitOpenError, GoogleSheet, MaxRetryError, RetryPolicy, SheetCache, TokenBucket
+
+
+HEADER = ["장비ID", "차량번호", "시간", "위도"]
+ROWS = [
+    HEADER,
+    ["dev1", "11가1111", "2024-01-01 00:00:01", 37.1],
+    ["dev2", "22나2222", "2024-01-01 00:00:02", 37.2],
+    ["dev1", "11가1111", "2024-01-01 00:00:03", 37.3],
+]
+
+
+@pytest.fixture
+def tracker_sheet(sheets_api, make_google_sheet):
+    """위치 기록 시트 1개(ROWS)가 있는 GoogleSheet"""
+    sheets_api.add_sheet("기록", ROWS)
+    return make_google_sheet()
+
+
+# -----------------------
+# SheetCache (user-001)
+# -----------------------
+def test_sheet_cache_read_through_and_ttl():
+    cache = SheetCache(ttl=0.05)
+    key = SheetCache.make_key("문서", "기록", "a1:d", ["a"])
+    assert key == ("문서", "기록", "A1:D", ("A",), "")
+
+    loads = []
+    loader = lambda: loads.append(1) or len(loads)
+    assert cache.get_or_load(key, loader) == 1
+    assert cache.get_or_load(key, loader) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    time.sleep(0.06)
+    assert cache.get_or_load(key, loader) == 2
+
+
+def test_sheet_cache_coalesces_concurrent_misses():
+    cache = SheetCache(ttl=30)
+    key = SheetCache.make_key("문서", "기록", "A1:D")
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(key, slow_loader))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 5
+    assert len(loads) == 1
+
+
+def test_sheet_cache_invalidate():
+    cache = SheetCache(ttl=30)
+    cache.put(SheetCache.make_key("문서", "기록", "A1:D"), 1)
+    cache.put(SheetCache.make_key("문서", "로그", "A1:D"), 2)
+    cache.put(SheetCache.make_key("다른 문서", "기록", "A1:D"), 3)
+
+    assert cache.invalidate("문서", "기록") == 1
+    assert cache.invalidate("문서") == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_load_as_dataframe_reads_through_cache(tracker_sheet, sheets_api):
+    first = tracker_sheet.load_as_dataframe("기록", "A", "D")
+    reads = sheets_api.count("values_get")
+    second = tracker_sheet.load_as_dataframe("기록", "A", "D")
+
+    assert sheets_api.count("values_get") == reads
+    assert first.equals(second)
+    assert first["장비ID"].tolist() == ["dev1", "dev2", "dev1"]
+
+    # 돌려준 DataFrame을 고쳐도 캐시 원본은 그대로
+    second.loc[0, "장비ID"] = "changed"
+    assert tracker_sheet.load_as_dataframe("기록", "A", "D").loc[0, "장비ID"] == "dev1"
+
+
+def test_write_invalidates_cached_sheet(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe("기록", "A", "D")
+    tracker_sheet.set_value_by_cell("기록", "A2", "dev9")
+
+    assert tracker_sheet.load_as_dataframe("기록", "A", "D")["장비ID"].tolist() == ["dev9", "dev2", "dev1"]
+
+
+def test_use_cache_false_refreshes_cache(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe("기록", "A", "D")
+    sheets_api.sheets["기록"]["rows"][1][0] = "dev7"  # 다른 곳에서 바뀜
+
+    assert tracker_sheet.load_as_dataframe("기록", "A", "D").loc[0, "장비ID"] == "dev1"
+    assert tracker_sheet.load_as_dataframe("기록", "A", "D", use_cache=False).loc[0, "장비ID"] == "dev7"
+    assert tracker_sheet.load_as_dataframe("기록", "A", "D").loc[0, "장비ID"] == "dev7"
+
+
+# -----------------------
+# 증분 로드 (user-002)
+# -----------------------
+def append_sheet_rows(sheets_api, title, rows):
+    """다른 곳(장비)에서 시트 맨 아래에 행을 붙인 것처럼"""
+    sheets_api.sheets[title]["rows"].extend([list(row) for row in rows])
+    sheets_api.version += 1
+
+
+def test_incremental_load_reads_only_new_rows(tracker_sheet, sheets_api):
+    first = tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    assert len(first) == 3
+
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    full_reads = sheets_api.count("values_get")
+    second = tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+
+    # 헤더 / 마지막 행 / 그 아래만 batch_get 1번으로 읽는다
+    assert sheets_api.count("values_get") == full_reads
+    assert sheets_api.calls[-1] == ("values_batch_get", ("'기록'!A1:D1", "'기록'!A4:D4", "'기록'!A5:D"))
+    assert second["시간"].tolist()[-2:] == ["2024-01-01 00:00:03", "2024-01-01 00:00:04"]
+    assert len(second) == 4
+
+
+def test_incremental_load_stops_at_empty_key(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    append_sheet_rows(sheets_api, "기록", [
+        ["dev2", "22나2222", "2024-01-01 00:00:04", 37.4],
+        ["", "메모", "", ""],
+        ["dev1", "11가1111", "2024-01-01 00:00:05", 37.5],
+    ])
+
+    assert len(tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])) == 4
+
+
+def test_incremental_load_reloads_when_rows_above_change(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+
+    # 마지막으로 읽은 행이 바뀌면(삭제 / 수정) 전체를 다시 읽는다
+    del sheets_api.sheets["기록"]["rows"][3]
+    full_reads = sheets_api.count("values_get")
+    frame = tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+
+    assert sheets_api.count("values_get") == full_reads + 1
+    assert frame["장비ID"].tolist() == ["dev1", "dev2"]
+
+
+def test_incremental_load_full_reload_after(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    full_reads = sheets_api.count("values_get")
+
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"], full_reload_after=0)
+    assert sheets_api.count("values_get") == full_reads + 1
+
+    tracker_sheet.reset_incremental("기록")
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    assert sheets_api.count("values_get") == full_reads + 2
+
+
+
+def test_incremental_load_fetches_outside_tail_lock(tracker_sheet, sheets_api, monkeypatch):
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    batch_get = sheets_api.values_batch_get
+    lock_free = []
+
+    def values_batch_get(*args, **kwargs):
+        # 요청 중에는 잠금이 비어 있고, 그 사이 reset_incremental이 끼어든다
+        lock_free.append(tracker_sheet._tail_lock.acquire(blocking=False))
+        tracker_sheet._tail_lock.release()
+        tracker_sheet.reset_incremental("기록")
+        return batch_get(*args, **kwargs)
+
+    monkeypatch.setattr(sheets_api, "values_batch_get", values_batch_get)
+    assert len(tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])) == 4
+    assert lock_free == [True]
+
+    # 지워진 상태 위에 가져온 결과를 게시하지 않으므로 다음 호출은 전체를 다시 읽는다
+    full_reads = sheets_api.count("values_get")
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    assert sheets_api.count("values_get") == full_reads + 1
+
+
+# -----------------------
+# 여러 범위 한 번에 읽기 (user-003)
+# -----------------------
+LOGIN_ROWS = [["아이디", "비밀번호"], ["user", "pw"]]
+
+
+def test_load_many_reads_all_ranges_in_one_request(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+    google_sheet = make_google_sheet()
+
+    frames = google_sheet.load_many({
+        "tracker": ("기록", "A", "D", ["A"]),
+        "login": ("로그인", "A", "B", []),
+    })
+    assert sheets_api.count("values_batch_get") == 1
+    assert frames["tracker"].equals(google_sheet.load_as_dataframe("기록", "A", "D", ["A"]))
+    assert frames["login"]["아이디"].tolist() == ["user"]
+
+    # 읽은 결과는 SHEET_CACHE에 들어가서 load_as_dataframe / 다음 load_many가 다시 읽지 않는다
+    google_sheet.load_many({"login": ("로그인", "A", "B", [])})
+    assert sheets_api.count("values_batch_get") == 1
+    assert sheets_api.count("values_get") == 0
+
+
+def test_load_many_incremental_ranges(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+    google_sheet = make_google_sheet()
+    ranges = {"tracker": ("기록", "A", "D", ["A"]), "login": ("로그인", "A", "B", [])}
+
+    google_sheet.load_many(ranges, incremental=("tracker",))
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    frames = google_sheet.load_many(ranges, incremental=("tracker",), use_cache=False)
+
+    # 증분 범위는 헤더 / 마지막 행 / 그 아래, 나머지는 전체 범위를 같은 요청에 담는다
+    assert sheets_api.calls[-1] == ("values_batch_get", ("'기록'!A1:D1", "'기록'!A4:D4", "'기록'!A5:D", "'로그인'!A1:B"))
+    assert len(frames["tracker"]) == 4
+    assert google_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"]).equals(frames["tracker"])
+
+
+def test_load_many_requests_outside_tail_lock(sheets_api, make_google_sheet, monkeypatch):
+    sheets_api.add_sheet("기록", ROWS)
+    google_sheet = make_google_sheet()
+    ranges = {"tracker": ("기록", "A", "D", ["A"])}
+    google_sheet.load_many(ranges, incremental=("tracker",))
+    batch_get = sheets_api.values_batch_get
+    lock_free = []
+
+    def values_batch_get(*args, **kwargs):
+        lock_free.append(google_sheet._tail_lock.acquire(blocking=False))
+        google_sheet._tail_lock.release()
+        return batch_get(*args, **kwargs)
+
+    monkeypatch.setattr(sheets_api, "values_batch_get", values_batch_get)
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    frames = google_sheet.load_many(ranges, incremental=("tracker",), use_cache=False)
+
+    assert lock_free == [True]
+    assert len(frames["tracker"]) == 4
+
+
+# -----------------------
+# 워크시트 메타데이터 캐시 / key로 열기 (user-004)
+# -----------------------
+def test_worksheets_are_cached_from_one_metadata_read(tracker_sheet, sheets_api):
+    assert sheets_api.count("fetch_sheet_metadata") == 2   # Spreadsheet 생성 + refresh_metadata
+
+    tracker_sheet.load_as_dataframe("기록", "A", "D", use_cache=False)
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+    tracker_sheet.set_value_by_cell("기록", "B2", "11가0000")
+
+    assert sheets_api.count("fetch_sheet_metadata") == 2
+    assert tracker_sheet.get_sheet_properties("기록")["sheetId"] == 1
+
+
+def test_new_worksheet_is_found_after_metadata_refresh(tracker_sheet, sheets_api):
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+
+    assert tracker_sheet.load_as_dataframe("로그인", "A", "B")["아이디"].tolist() == ["user"]
+    assert sheets_api.count("fetch_sheet_metadata") == 3
+
+    with pytest.raises(gspread.exceptions.WorksheetNotFound):
+        tracker_sheet.load_sheet("없는 시트")
+
+
+def test_spreadsheet_is_reopened_by_key(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    make_google_sheet()
+    make_google_sheet()
+
+    # 처음에만 이름으로 찾고, 다음부터는 기억한 key로 연다
+    assert [call for call in sheets_api.calls if call[0].startswith("open")] == [
+        ("open", sheets_api.title),
+        ("open_by_key", sheets_api.spreadsheet_id),
+    ]
+
+
+# -----------------------
+# 재시도 정책 (user-005)
+# -----------------------
+def api_error(status_code, message="error"):
+    """status_code 응답을 받은 것처럼 만든 gspread APIError"""
+    response = SimpleNamespace(
+        status_code=status_code,
+        text=message,
+        json=lambda: {"error": {"code": status_code, "message": message, "status": ""}},
+    )
+    return gspread.exceptions.APIError(response)
+
+
+@pytest.fixture
+def retry_policy():
+    """기다리지 않고 바로 재시도하는 RetryPolicy"""
+    return RetryPolicy(max_retries=3, base_delay=0, max_delay=0, quota_delay=0.01, breaker_threshold=10, breaker_cooldown=60, bucket=TokenBucket(rate_per_minute=60000))
+
+
+def flaky(errors, result="ok"):
+    """errors를 차례로 던진 뒤 result를 돌려주는 함수와 호출 기록"""
+    calls = []
+
+    def method():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return method, calls
+
+
+def test_retry_policy_retries_transient_errors(retry_policy):
+    method, calls = flaky([ConnectionError("끊김"), api_error(503)])
+
+    assert retry_policy(method)() == "ok"
+    assert len(calls) == 3
+    assert retry_policy.stats()["retries"] == 2
+
+
+def test_retry_policy_fails_fast_on_client_errors(retry_policy):
+    method, calls = flaky([api_error(400, "잘못된 요청")])
+
+    with pytest.raises(gspread.exceptions.APIError):
+        retry_policy(method)()
+    assert len(calls) == 1
+
+
+def test_retry_policy_gives_up_after_max_retries(retry_policy):
+    method, calls = flaky([ConnectionError("끊김")] * 10)
+
+    with pytest.raises(MaxRetryError):
+        retry_policy(method)()
+    assert len(calls) == retry_policy.max_retries + 1
+
+
+def test_retry_policy_nested_calls_do_not_multiply_attempts(retry_policy):
+    inner, inner_calls = flaky([ConnectionError("끊김")] * 10)
+    inner = retry_policy(inner)
+    outer = retry_policy(lambda: inner())
+
+    with pytest.raises(MaxRetryError):
+        outer()
+    assert len(inner_calls) == retry_policy.max_retries + 1
+
+
+def test_retry_policy_quota_error_penalizes_bucket(retry_policy):
+    method, calls = flaky([api_error(429, "Quota exceeded")])
+
+    started = time.monotonic()
+    assert retry_policy(method)() == "ok"
+    assert time.monotonic() - started >= retry_policy.quota_delay
+    assert retry_policy.stats()["quota_errors"] == 1
+
+
+def test_retry_policy_circuit_breaker_opens(retry_policy):
+    retry_policy.breaker_threshold = 2
+    method, calls = flaky([ConnectionError("끊김")] * 10)
+
+    with pytest.raises(MaxRetryError):
+        retry_policy(method)()
+    assert retry_policy.stats()["breaker_state"] == RetryPolicy.OPEN
+
+    # 열려 있는 동안은 호출하지 않고 바로 실패
+    attempts = len(calls)
+    with pytest.raises(CircuitOpenError):
+        retry_policy(method)()
+    assert len(calls) == attempts
+
+
+
+def test_retry_policy_half_open_allows_one_probe(retry_policy):
+    retry_policy.breaker_state = RetryPolicy.OPEN
+    retry_policy.breaker_cooldown = 0
+    started, release = threading.Event(), threading.Event()
+
+    def probe():
+        started.set()
+        release.wait(5)
+        return "ok"
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(retry_policy(probe)()))
+    thread.start()
+    assert started.wait(5)
+
+    # 시험 호출이 끝나기 전의 다른 호출은 바로 실패한다
+    with pytest.raises(CircuitOpenError):
+        retry_policy(lambda: "other")()
+
+    release.set()
+    thread.join(5)
+    assert results == ["ok"]
+    assert retry_policy.stats()["breaker_state"] == RetryPolicy.CLOSED
+    assert retry_policy(lambda: "other")() == "other"
+
+
+def test_retry_policy_client_error_ends_probe(retry_policy):
+    retry_policy.breaker_state = RetryPolicy.OPEN
+    retry_policy.breaker_cooldown = 0
+    method, _ = flaky([api_error(400)])
+
+    with pytest.raises(gspread.exceptions.APIError):
+        retry_policy(method)()
+    # 재시도하지 않는 에러로 끝난 시험 호출은 다음 호출의 시험을 막지 않는다
+    assert retry_policy(method)() == "ok"
+
+def test_google_sheet_applies_socket_timeout(tracker_sheet, sheets_api):
+    assert sheets_api.timeout == RETRY_POLICY.timeout
+
+
+# -----------------------
+# 스키마 타입 변환 (user-006)
+# -----------------------
+def test_load_as_dataframe_with_schema_reads_unformatted(tracker_sheet, sheets_api):
+    plain = tracker_sheet.load_as_dataframe("기록", "A", "D")
+    typed = tracker_sheet.load_as_dataframe("기록", "A", "D", schema=TRACKER_SCHEMA)
+
+    assert plain["위도"].tolist() == ["37.1", "37.2", "37.3"]
+    assert typed["위도"].tolist() == [37.1, 37.2, 37.3]
+    assert str(typed["시간"].dt.tz) == "Asia/Seoul"
+    assert isinstance(typed["장비ID"].dtype, pd.CategoricalDtype)
+
+    # 캐시는 스키마 사용 여부로 나눠서 저장한다
+    assert tracker_sheet.load_as_dataframe("기록", "A", "D")["위도"].tolist() == ["37.1", "37.2", "37.3"]
+
+
+def test_incremental_load_with_schema_keeps_types(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"], schema=TRACKER_SCHEMA)
+    append_sheet_rows(sheets_api, "기록", [["dev3", "33다3333", "2024-01-01 00:00:04", 37.4]])
+    frame = tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"], schema=TRACKER_SCHEMA)
+
+    assert frame["장비ID"].tolist() == ["dev1", "dev2", "dev1", "dev3"]
+    assert isinstance(frame["장비ID"].dtype, pd.CategoricalDtype)
+    assert frame["위도"].dtype == "float64"
+    assert frame["시간"].iloc[-1] == pd.Timestamp("2024-01-01 00:00:04", tz="Asia/Seoul")
+
+
+def test_load_many_with_schema(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+    google_sheet = make_google_sheet()
+
+    frames = google_sheet.load_many({
+        "tracker": ("기록", "A", "D", ["A"], TRACKER_SCHEMA),
+        "login": ("로그인", "A", "B", []),
+    })
+    # 스키마가 있는 범위와 없는 범위는 따로 요청한다
+    assert sheets_api.count("values_batch_get") == 2
+    assert frames["tracker"]["위도"].tolist() == [37.1, 37.2, 37.3]
+    assert frames["login"]["아이디"].tolist() == ["user"]
+
+
+# -----------------------
+# 행 추가 values.append (user-013)
+# -----------------------
+def test_update_appends_below_last_row(tracker_sheet, sheets_api):
+    tracker_sheet.update("기록", [["dev3", "33다3333", "2024-01-01 00:00:04", "37.4"]], "A")
+
+    assert sheets_api.rows("기록")[4] == ["dev3", "33다3333", "2024-01-01 00:00:04", 37.4]
+    assert sheets_api.count("values_append") == 1
+    assert sheets_api.count("values_get") == 0    # 열 전체를 읽어서 빈 행을 찾지 않는다
+    assert tracker_sheet.get_append_cursor("기록") == 6
+
+
+def test_append_starts_from_cursor(tracker_sheet, sheets_api):
+    tracker_sheet.update_oneline("기록", ["dev3", "33다3333", "2024-01-01 00:00:04", 37.4], "A")
+    tracker_sheet.write_rows("기록", [["dev1", "11가1111", "2024-01-01 00:00:05", 37.5]])
+
+    assert [call[1] for call in sheets_api.calls if call[0] == "values_append"] == ["'기록'!A1", "'기록'!A6"]
+    assert [row[0] for row in sheets_api.rows("기록")] == ["장비ID", "dev1", "dev2", "dev1", "dev3", "dev1"]
+
+
+def test_append_grows_grid_and_returns_rows(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS, row_count=4)
+    google_sheet = make_google_sheet()
+
+    assert google_sheet.append_values("기록", [["dev3"], ["dev4"]]) == (5, 6)
+    assert sheets_api.row_count("기록") == 6
+    assert google_sheet.load_sheet("기록").row_count == 6
+
+
+def test_delete_row_drops_append_cursor(tracker_sheet, sheets_api):
+    tracker_sheet.update_oneline("기록", ["dev3"], "A")
+    tracker_sheet.delete_row("기록", 2)
+
+    assert tracker_sheet.get_append_cursor("기록") is None
+    tracker_sheet.update_oneline("기록", ["dev4"], "A")
+    assert [row[0] for row in sheets_api.rows("기록")] == ["장비ID", "dev2", "dev1", "dev3", "dev4"]
+
+
+def test_concurrent_appends_are_coalesced(tracker_sheet, sheets_api, monkeypatch):
+    values_append = sheets_api.values_append
+    first_request = threading.Event()
+
+    def slow_values_append(*args, **kwargs):
+        if not first_request.is_set():
+            first_request.set()
+            time.sleep(0.2)     # 첫 요청이 나가 있는 동안 다른 append가 쌓인다
+        return values_append(*args, **kwargs)
+    monkeypatch.setattr(sheets_api, "values_append", slow_values_append)
+
+    results = {}
+
+    def append(device_id):
+        results[device_id] = tracker_sheet.append_values("기록", [[device_id]])
+
+    first = threading.Thread(target=append, args=("dev3",))
+    first.start()
+    first_request.wait()
+    others = [threading.Thread(target=append, args=(device_id,)) for device_id in ("dev4", "dev5")]
+    for thread in others:
+        thread.start()
+    for thread in [first] + others:
+        thread.join()
+
+    assert sheets_api.count("values_append") == 2
+    assert results["dev3"] == (5, 5)
+    assert sorted([results["dev4"], results["dev5"]]) == [(6, 6), (7, 7)]
+    assert sorted(row[0] for row in sheets_api.rows("기록")[4:]) == ["dev3", "dev4", "dev5"]
+
+
+
+def test_append_cursors_are_kept_per_start_column(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", [["a", "b", "c"], [1, 2, ""], [3, 4, ""]])
+    google_sheet = make_google_sheet()
+
+    google_sheet.update("기록", [[5, 6]], "A")
+    google_sheet.update("기록", [["x"]], "C")
+
+    # C열 표는 A열 append와 따로 위치를 기억하고, 행을 끼워 넣지 않으므로 A열 표도 밀리지 않는다
+    assert google_sheet.get_append_cursor("기록", "A") == 5
+    assert google_sheet.get_append_cursor("기록", "C") == 3
+    assert [call[1] for call in sheets_api.calls if call[0] == "values_append"] == ["'기록'!A1", "'기록'!C1"]
+    assert sheets_api.rows("기록")[1:] == [[1, 2, "x"], [3, 4], [5, 6]]
+
+
+def test_update_retries_transient_append_error(tracker_sheet, sheets_api, monkeypatch):
+    values_append = sheets_api.values_append
+    failures = [ConnectionError("끊김")]
+
+    def flaky_values_append(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return values_append(*args, **kwargs)
+    monkeypatch.setattr(sheets_api, "values_append", flaky_values_append)
+    monkeypatch.setattr(RETRY_POLICY, "base_delay", 0)
+
+    tracker_sheet.update("기록", [["dev3"]], "A")
+
+    assert [row[0] for row in sheets_api.rows("기록")] == ["장비ID", "dev1", "dev2", "dev1", "dev3"]
+
+# -----------------------
+# vlookup 일괄 업데이트 (user-014)
+# -----------------------
+def test_vlookup_update_many_writes_in_one_request(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호", "상태"], ["dev1", "", ""], ["dev2", "", ""]], row_count=3)
+    google_sheet = make_google_sheet()
+
+    rows = google_sheet.vlookup_update_many("장비", "A", {
+        "dev2": ["22나2222", "운행"],
+        "dev3": ["33다3333", "정지"],
+    }, "B")
+
+    assert rows == {"dev2": 3, "dev3": 4}
+    assert sheets_api.count("values_batch_update") == 1
+    assert sheets_api.rows("장비")[2:] == [["dev2", "22나2222", "운행"], ["dev3", "33다3333", "정지"]]
+    assert sheets_api.row_count("장비") == 4    # 새 key 행이 들어갈 만큼 늘어남
+
+
+def test_vlookup_update_reuses_key_index(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호"], ["dev1", ""], ["dev2", ""]])
+    google_sheet = make_google_sheet()
+
+    google_sheet.vlookup_update("장비", "dev1", "A", "B", [["11가1111"]])
+    google_sheet.vlookup_update("장비", "dev2", "A", "B", [["22나2222"]])
+    assert sheets_api.count("values_get") == 1  # key 열은 1번만 읽는다
+
+    # 인덱스에 없는 key는 다른 곳에서 추가됐을 수 있으므로 key 열을 다시 읽는다
+    append_sheet_rows(sheets_api, "장비", [["dev3", ""]])
+    assert google_sheet.vlookup_update_many("장비", "A", {"dev3": ["33다3333"]}, "B") == {"dev3": 4}
+    assert sheets_api.count("values_get") == 2
+    assert [row[1] for row in sheets_api.rows("장비")[1:]] == ["11가1111", "22나2222", "33다3333"]
+
+
+def test_row_changes_drop_key_index(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호"], ["dev1", ""], ["dev2", ""]])
+    google_sheet = make_google_sheet()
+
+    google_sheet.vlookup_update("장비", "dev2", "A", "B", [["22나2222"]])
+    google_sheet.delete_row("장비", 2)
+    google_sheet.vlookup_update("장비", "dev2", "A", "B", [["22나0000"]])
+
+    assert sheets_api.rows("장비")[1:] == [["dev2", "22나0000"]]
+
+
+
+
+def test_vlookup_update_many_writes_outside_index_lock(sheets_api, make_google_sheet, monkeypatch):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호"], ["dev1", ""]])
+    google_sheet = make_google_sheet()
+    batch_update = sheets_api.values_batch_update
+    started, release = threading.Event(), threading.Event()
+
+    def slow_batch_update(*args, **kwargs):
+        if not started.is_set():
+            started.set()
+            release.wait(5)
+        return batch_update(*args, **kwargs)
+    monkeypatch.setattr(sheets_api, "values_batch_update", slow_batch_update)
+
+    results = {}
+    first = threading.Thread(target=lambda: results.update(google_sheet.vlookup_update_many("장비", "A", {"dev2": ["22나2222"]}, "B")))
+    first.start()
+    assert started.wait(5)
+    # 첫 요청이 나가 있는 동안에도 다른 호출이 인덱스를 쓰고, 새 key는 다른 행을 받는다
+    results.update(google_sheet.vlookup_update_many("장비", "A", {"dev3": ["33다3333"]}, "B"))
+    release.set()
+    first.join(5)
+
+    assert results == {"dev2": 3, "dev3": 4}
+    assert [row[0] for row in sheets_api.rows("장비")] == ["장비ID", "dev1", "dev2", "dev3"]
+
+
+def test_key_index_dropped_while_reading_is_not_published(sheets_api, make_google_sheet, monkeypatch):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호"], ["dev1", ""], ["dev2", ""]])
+    google_sheet = make_google_sheet()
+    values_get = sheets_api.values_get
+    reads = []
+
+    def values_get_then_delete(*args, **kwargs):
+        result = values_get(*args, **kwargs)
+        if not reads:
+            # key 열을 읽은 직후 다른 스레드가 행을 지운 것처럼
+            del sheets_api.sheets["장비"]["rows"][1]
+            google_sheet._forget_row_layout("장비")
+        reads.append(1)
+        return result
+    monkeypatch.setattr(sheets_api, "values_get", values_get_then_delete)
+
+    assert google_sheet.vlookup_update_many("장비", "A", {"dev2": ["22나2222"]}, "B") == {"dev2": 2}
+    assert len(reads) == 2
+    assert sheets_api.rows("장비")[1:] == [["dev2", "22나2222"]]
+
+def test_write_range_rows_drops_key_index(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호"], ["dev1", ""]])
+    google_sheet = make_google_sheet()
+
+    google_sheet.vlookup_update("장비", "dev1", "A", "B", [["11가1111"]])
+    google_sheet.write_range_rows("장비", [["dev2", "22나2222"]], "A1")
+    google_sheet.vlookup_update_many("장비", "A", {"dev3": ["33다3333"]}, "B")
+
+    # 방금 추가한 행을 덮어쓰지 않고 그 아래에 새 key를 쓴다
+    assert [row[0] for row in sheets_api.rows("장비")] == ["장비ID", "dev1", "dev2", "dev3"]
+
+
+def test_key_index_expires(sheets_api, make_google_sheet, monkeypatch):
+    sheets_api.add_sheet("장비", [["장비ID", "차량번호"], ["dev1", ""], ["dev2", ""]])
+    google_sheet = make_google_sheet()
+    google_sheet.vlookup_update("장비", "dev2", "A", "B", [["22나2222"]])
+
+    # 다른 곳에서 행 순서가 바뀌어도 KEY_INDEX_TTL이 지나면 key 열을 다시 읽어서 맞는 행에 쓴다
+    sheets_api.sheets["장비"]["rows"][1:] = [["dev2", "22나2222"], ["dev1", ""]]
+    monkeypatch.setattr(GoogleSheet, "KEY_INDEX_TTL", 0)
+    time.sleep(0.01)
+    google_sheet.vlookup_update("장비", "dev2", "A", "B", [["22나0000"]])
+
+    assert sheets_api.rows("장비")[1] == ["dev2", "22나0000"]
+
+# -----------------------
+# 여러 행 삭제 / 보존 기간 정리 (user-015)
+# -----------------------
+def test_delete_row_ranges_in_one_request(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", [["번호"]] + [[str(number)] for number in range(1, 9)], row_count=9)
+    google_sheet = make_google_sheet()
+
+    assert google_sheet.delete_row_ranges("기록", [(6, 7), (2, 2), (3, 3), (9, 9)]) == 5
+    assert sheets_api.calls[-1] == ("batch_update", ("deleteDimension",) * 3)
+    assert [row[0] for row in sheets_api.rows("기록")] == ["번호", "3", "4", "7"]
+    assert google_sheet.load_sheet("기록").row_count == 4
+
+    with pytest.raises(ValueError):
+        google_sheet.delete_row_ranges("기록", [(2, 10)])
+    assert not google_sheet.delete_row("기록", 10)
+
+
+def test_apply_retention_older_than(tracker_sheet, sheets_api):
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "", 37.4]])
+
+    deleted = tracker_sheet.apply_retention("기록", "A", "D", older_than="2024-01-01 00:00:03")
+    assert deleted == 2
+    # 시간이 비어 있는 행은 남긴다
+    assert [row[2] for row in sheets_api.rows("기록")[1:]] == ["2024-01-01 00:00:03", ""]
+
+
+def test_apply_retention_keep_latest_per_device(tracker_sheet, sheets_api):
+    append_sheet_rows(sheets_api, "기록", [["dev1", "11가1111", "2024-01-01 00:00:04", 37.4]])
+    tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])
+
+    assert tracker_sheet.apply_retention("기록", "A", "D", keep_latest=2, schema=TRACKER_SCHEMA) == 1
+    assert [row[2][-2:] for row in sheets_api.rows("기록")[1:]] == ["02", "03", "04"]
+    # 증분 로드 상태도 버려서 다시 읽는다
+    assert len(tracker_sheet.load_as_dataframe_incremental("기록", "A", "D", ["A"])) == 3
+
+
+# -----------------------
+# 로컬 미러 (user-016)
+# -----------------------
+def test_mirror_warm_start_reads_only_new_rows(tmp_path, sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+    options = {"mirror_dir": str(tmp_path), "mirror_sheets": ["기록"]}
+    first = make_google_sheet(**options)
+    first.load_as_dataframe_incremental("기록", "A", "D", ["A"], schema=TRACKER_SCHEMA)
+    first.load_as_dataframe("로그인", "A", "B")
+
+    # 재시작: 미러에서 바로 읽고, 다음 증분 로드는 미러 이후에 생긴 행만 읽는다
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    second = make_google_sheet(**options)
+    mirrored = second.load_from_mirror("기록", "A", "D", ["A"], schema=TRACKER_SCHEMA, incremental=True)
+    assert mirrored["위도"].tolist() == [37.1, 37.2, 37.3]
+
+    full_reads = sheets_api.count("values_get")
+    frame = second.load_as_dataframe_incremental("기록", "A", "D", ["A"], schema=TRACKER_SCHEMA)
+    assert sheets_api.count("values_get") == full_reads
+    assert frame["위도"].tolist() == [37.1, 37.2, 37.3, 37.4]
+
+    # mirror_sheets에 없는 시트(로그인)는 저장하지 않는다
+    assert second.load_from_mirror("로그인", "A", "B") is None
+
+
+def test_mirror_full_range(tmp_path, sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    options = {"mirror_dir": str(tmp_path), "mirror_sheets": ["기록"]}
+    make_google_sheet(**options).load_as_dataframe("기록", "A", "D", schema=TRACKER_SCHEMA)
+
+    frame = make_google_sheet(**options).load_from_mirror("기록", "A", "D", schema=TRACKER_SCHEMA)
+    assert frame["장비ID"].tolist() == ["dev1", "dev2", "dev1"]
+    assert make_google_sheet().load_from_mirror("기록", "A", "D") is None
+
+
+# -----------------------
+# 변경 감지 / 조건부 읽기 (user-017)
+# -----------------------
+def test_conditional_load_skips_unchanged_sheet(tracker_sheet, sheets_api):
+    frame, version, reloaded = tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", schema=TRACKER_SCHEMA)
+    assert (len(frame), version, reloaded) == (3, 1, True)
+
+    reads = sheets_api.count("values_get")
+    frame, version, reloaded = tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", schema=TRACKER_SCHEMA)
+    assert (len(frame), version, reloaded) == (3, 1, False)
+    assert sheets_api.count("values_get") == reads
+    assert sheets_api.count("request") == 2
+
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    frame, version, reloaded = tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", schema=TRACKER_SCHEMA)
+    assert (len(frame), version, reloaded) == (4, 2, True)
+    assert tracker_sheet.get_data_version("기록", "A", "D", schema=TRACKER_SCHEMA) == 2
+
+
+def test_conditional_load_with_sentinel_range(tracker_sheet, sheets_api):
+    tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", sentinel_range="C1:C2")
+    sheets_api.sheets["기록"]["rows"][3][3] = 99    # 감시 범위 밖 수정
+
+    assert not tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", sentinel_range="C1:C2")[2]
+    assert tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", sentinel_range="C1:C2", max_age=0)[2]
+    assert sheets_api.count("request") == 0
+
+    sheets_api.sheets["기록"]["rows"][1][2] = "2024-01-01 00:00:09"
+    frame, version, reloaded = tracker_sheet.load_as_dataframe_conditional("기록", "A", "D", sentinel_range="C1:C2")
+    assert (version, reloaded) == (3, True)
+
+
+
+def test_conditional_load_many_ignores_writes_to_other_sheets(sheets_api, make_google_sheet):
+    sheets_api.add_sheet("기록", ROWS)
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+    google_sheet = make_google_sheet()
+    ranges = {"tracker": ("기록", "A", "D", ["A"], TRACKER_SCHEMA)}
+
+    frames = google_sheet.load_many_conditional(ranges, incremental=("tracker",))
+    assert frames["tracker"][1] == 1
+    assert google_sheet.load_many_conditional(ranges, incremental=("tracker",)) == {}
+    assert sheets_api.count("values_batch_get") == 1
+
+    # 앱이 직접 쓰는 시트(로그인 기록)만 바뀌면 Drive version은 올라가도 데이터 버전은 그대로
+    google_sheet.write_rows("로그인", [["user2", "성공"]])
+    assert google_sheet.load_many_conditional(ranges, incremental=("tracker",)) == {}
+    assert sheets_api.count("values_batch_get") == 2
+    assert google_sheet.get_data_version("기록", "A", "D", ["A"], TRACKER_SCHEMA) == 1
+
+    append_sheet_rows(sheets_api, "기록", [["dev2", "22나2222", "2024-01-01 00:00:04", 37.4]])
+    frame, version = google_sheet.load_many_conditional(ranges, incremental=("tracker",))["tracker"]
+    assert (len(frame), version) == (4, 2)
+
+
+# -----------------------
+# 서버 필터 읽기 gviz 쿼리 (user-018)
+# -----------------------
+GVIZ_QUERY_PATTERN = re.compile(
+    r"select (?P<columns>[A-Z,]+)"
+    r"(?: where (?P<where>.+?))?"
+    r"(?: order by (?P<order>[A-Z]+)(?P<desc> desc)?)?"
+    r"(?: limit (?P<limit>\d+))?"
+    r"(?: offset (?P<offset>\d+))?$"
+)
+GVIZ_CONDITION_PATTERN = re.compile(r"([A-Z]+) = (?:'([^']*)'|\"([^\"]*)\")")
+
+
+def run_gviz_query(rows, query):
+    """build_gviz_query()가 만드는 문장만 해석하는 작은 gviz 흉내 (헤더 포함 행 목록 -> 결과 행 목록)"""
+    match = GVIZ_QUERY_PATTERN.match(query)
+    assert match, query
+    header, rows = rows[0], [[display_value(value) for value in row] for row in rows[1:]]
+
+    if match["where"]:
+        for letter, single_quoted, double_quoted in GVIZ_CONDITION_PATTERN.findall(match["where"]):
+            value = single_quoted or double_quoted
+            rows = [row for row in rows if row[col_to_index(letter)] == value]
+    if match["order"]:
+        rows.sort(key=lambda row: row[col_to_index(match["order"])], reverse=bool(match["desc"]))
+    rows = rows[int(match["offset"] or 0):]
+    if match["limit"]:
+        rows = rows[:int(match["limit"])]
+
+    indexes = [col_to_index(letter) for letter in match["columns"].split(",")]
+    return [[header[i] for i in indexes]] + [[row[i] for i in indexes] for row in rows]
+
+
+@pytest.fixture
+def gviz_server(sheets_api):
+    """sheets_api의 시트에 gviz 쿼리를 실행해서 CSV로 돌려주는 로컬 HTTP 서버 (받은 요청은 seen에 기록)"""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            seen.append((url.path, params))
+
+            sheet = sheets_api._sheet_by_id(int(params["gid"]))
+            out = io.StringIO()
+            csv.writer(out, lineterminator="\n").writerows(run_gviz_query(sheets_api._trim(sheet["rows"]), params["tq"]))
+            body = out.getvalue().encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield SimpleNamespace(url=f"http://127.0.0.1:{server.server_address[1]}/{{spreadsheet_id}}/gviz", seen=seen)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gviz_sheet(sheets_api, make_google_sheet, gviz_server):
+    """gviz 쿼리를 로컬 서버로 보내는 GoogleSheet (기록 시트에 dev1 4건, dev2 2건)"""
+    sheets_api.add_sheet("로그인", LOGIN_ROWS)
+    sheets_api.add_sheet("기록", ROWS + [
+        ["dev1", "11가1111", "2024-01-01 00:00:04", 37.4],
+        ["dev2", "22나2222", "2024-01-01 00:00:05", 37.5],
+        ["dev1", "11가1111", "2024-01-01 00:00:06", 37.6],
+    ])
+    return make_google_sheet(gviz_base_url=gviz_server.url)
+
+
+def test_build_gviz_query():
+    query = GoogleSheet.build_gviz_query("A", "C", {"a": "dev1"}, order_by="c", descending=True, limit=10, offset=20)
+    assert query == "select A,B,C where A = 'dev1' order by C desc limit 10 offset 20"
+    assert GoogleSheet.build_gviz_query("A", "B", {"B": "it's", "A": 3}) == 'select A,B where B = "it\'s" and A = 3'
+
+    with pytest.raises(ValueError):
+        GoogleSheet.build_gviz_query("A", "B", {"B": "it's \"quoted\""})
+
+
+def test_query_rows_sends_query_to_sheet(gviz_sheet, gviz_server, sheets_api):
+    frame = gviz_sheet.query_rows("기록", "A", "D", filters={"A": "dev2"})
+
+    path, params = gviz_server.seen[-1]
+    assert path == f"/{sheets_api.spreadsheet_id}/gviz"
+    assert (params["tqx"], params["gid"]) == ("out:csv", "2")
+    assert params["tq"] == "select A,B,C,D where A = 'dev2'"
+    assert list(frame.columns) == HEADER
+    assert frame["위도"].tolist() == ["37.2", "37.5"]
+
+    # 같은 쿼리는 SHEET_CACHE에서 읽는다
+    gviz_sheet.query_rows("기록", "A", "D", filters={"A": "dev2"})
+    assert len(gviz_server.seen) == 1
+
+
+def test_query_rows_pages_with_offset_and_limit(gviz_sheet):
+    pages = [
+        gviz_sheet.query_rows("기록", "A", "D", filters={"A": "dev1"}, order_by="C", descending=True, limit=3, offset=page * 3, schema=TRACKER_SCHEMA)
+        for page in range(3)
+    ]
+
+    assert [time.second for time in pages[0]["시간"]] == [6, 4, 3]
+    assert pages[0]["위도"].tolist() == [37.6, 37.4, 37.3]
+    assert [time.second for time in pages[1]["시간"]] == [1]
+    assert pages[2].empty
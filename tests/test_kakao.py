@@ -0,0 +1,72 @@
+# 카카오 지도 컴포넌트
+import pytest
+import streamlit as st
+
+from util.map import kakao
+from util.map.kakao import KAKAO_SDK_URL, kakao_map
+
+VIEW = {"lat": 37.5, "lng": 127.0, "level": 3}
+
+
+@pytest.fixture
+def component(monkeypatch):
+    """컴포넌트 대신 args를 기록하고 정해 둔 값을 돌려준다"""
+    calls = []
+    state = {"value": None}
+
+    def fake_component(**kwargs):
+        calls.append(kwargs)
+        return state["value"]
+
+    monkeypatch.setattr(kakao, "_kakao_map_component", fake_component)
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    return calls, state
+
+
+def test_sdk_url_loads_clusterer_later():
+    url = KAKAO_SDK_URL.format(appkey="key")
+
+    assert "appkey=key" in url and "libraries=clusterer" in url and url.endswith("autoload=false")
+
+
+def test_points_are_sent_only_when_version_changes(component):
+    calls, _ = component
+    built = []
+
+    def points():
+        built.append(1)
+        return b"{}"
+
+    kakao_map("map", "sdk", points, "v1", VIEW)
+    kakao_map("map", "sdk", points, "v1", VIEW)
+    kakao_map("map", "sdk", points, "v2", VIEW)
+
+    assert [call["points"] for call in calls] == [b"{}", None, b"{}"]
+    assert len(built) == 2
+
+
+def test_click_event_is_returned_once(component):
+    _, state = component
+    row = {"장비ID": "dev1", "위도": 37.5, "경도": 127.0}
+    state["value"] = {"event": "click", "mount": "m1", "seq": 1, "row": row}
+
+    assert kakao_map("map", "sdk", lambda: b"{}", "v1", VIEW) == row
+    assert kakao_map("map", "sdk", lambda: b"{}", "v1", VIEW) is None
+
+    state["value"] = {"event": "click", "mount": "m1", "seq": 2, "row": row}
+    assert kakao_map("map", "sdk", lambda: b"{}", "v1", VIEW) == row
+
+
+def test_need_points_resends_on_rerun(component, monkeypatch):
+    calls, state = component
+    reruns = []
+    monkeypatch.setattr(st, "rerun", lambda: reruns.append(1))
+
+    kakao_map("map", "sdk", lambda: b"{}", "v1", VIEW)
+    state["value"] = {"event": "need_points", "mount": "m2", "seq": 1}
+    kakao_map("map", "sdk", lambda: b"{}", "v1", VIEW)
+    kakao_map("map", "sdk", lambda: b"{}", "v1", VIEW)
+
+    assert reruns == [1]
+    assert [call["points"] for call in calls] == [b"{}", None, b"{}"]
@@ -0,0 +1,130 @@
+# util.map.payload - 지도 payload 만들기/풀기, encoded polyline, MapPayloadCache 확인
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.data_load.schema import SEOUL_TZ
+from util.map.payload import (
+    MapPayloadCache,
+    build_map_payload,
+    encode_polyline,
+    payload_time,
+)
+
+
+def decode_polyline(text: str, precision: int):
+    """프론트엔드(decodePolyline)와 같은 방식으로 encoded polyline을 좌표 목록으로 푼다"""
+    coords, values, value, shift = [], [], 0, 0
+    for char in text:
+        chunk = ord(char) - 63
+        value |= (chunk & 0x1F) << shift
+        shift += 5
+        if chunk < 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value, shift = 0, 0
+    lat = lng = 0
+    for d_lat, d_lng in zip(values[0::2], values[1::2]):
+        lat += d_lat
+        lng += d_lng
+        coords.append((lat / 10 ** precision, lng / 10 ** precision))
+    return coords
+
+
+def decode_column(column, n):
+    """payload 컬럼 하나를 행 목록으로 ({"dict", "codes"}는 풀어서)"""
+    if isinstance(column, dict):
+        return [column["dict"][code] for code in column["codes"]]
+    assert len(column) == n
+    return column
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "장비ID": pd.Series(["dev1", "dev2", "dev1", "dev1"], dtype="category"),
+        "차량번호": ["11가1111", "22나2222", "11가1111", "11가1111"],
+        "위도": [37.1234567, 37.2, np.nan, 37.4],
+        "경도": [127.1234564, 127.2, 127.3, -127.4],
+        "시간": pd.to_datetime(
+            ["2024-01-01 09:00:00", "2024-01-01 09:00:01", "2024-01-01 09:00:02", None]
+        ).tz_localize(SEOUL_TZ),
+        "속도": [10.5, np.nan, 3.0, 0.0],
+        "모션데이터\naccx": [0.1, 0.2, 0.3, 0.4],
+    })
+
+
+def test_polyline_reference_vector():
+    # Google 문서의 예시 (precision 5)
+    lat = [38.5, 40.7, 43.252]
+    lng = [-120.2, -120.95, -126.453]
+    assert encode_polyline(lat, lng, 5) == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+    assert encode_polyline([], [], 5) == ""
+
+
+def test_polyline_round_trip():
+    rng = np.random.default_rng(0)
+    lat = 37.5 + rng.normal(0, 0.5, 300)
+    lng = 127.0 + rng.normal(0, 0.5, 300)
+    lat[0], lng[0] = -89.999999, -179.999999  # 큰 값도 5비트 조각 7개 안에 들어가야 함
+    decoded = np.array(decode_polyline(encode_polyline(lat, lng, 6), 6))
+    np.testing.assert_allclose(decoded[:, 0], np.round(lat, 6), atol=1e-9)
+    np.testing.assert_allclose(decoded[:, 1], np.round(lng, 6), atol=1e-9)
+
+
+def test_build_map_payload_columns(frame):
+    payload = json.loads(build_map_payload(frame, columns=("장비ID", "차량번호", "위도", "경도", "시간", "속도")).decode("utf-8"))
+    n = payload["n"]
+    columns = payload["columns"]
+
+    # 좌표가 없는 행은 빠진다
+    assert n == 3
+    assert "polyline" not in payload
+    assert decode_column(columns["장비ID"], n) == ["dev1", "dev2", "dev1"]
+    assert columns["장비ID"]["dict"] == ["dev1", "dev2"]
+    assert decode_column(columns["차량번호"], n) == ["11가1111", "22나2222", "11가1111"]
+    assert columns["위도"] == [37.123457, 37.2, 37.4]
+    assert columns["경도"] == [127.123456, 127.2, -127.4]
+    assert columns["속도"] == [10.5, None, 0.0]
+
+    # 시간은 epoch 초, 없으면 None -> payload_time()으로 서울 시간으로 되돌린다
+    assert columns["시간"][2] is None
+    assert payload_time(columns["시간"][0]) == frame["시간"][0]
+    assert payload_time(columns["시간"][1]) == frame["시간"][1]
+    assert payload_time(None) is None
+
+
+def test_build_map_payload_default_columns(frame):
+    payload = json.loads(build_map_payload(frame))
+    assert set(payload["columns"]) == {"장비ID", "차량번호", "위도", "경도", "시간"}
+
+
+def test_build_map_payload_polyline(frame):
+    payload = json.loads(build_map_payload(frame, polyline=True))
+    assert "위도" not in payload["columns"] and "경도" not in payload["columns"]
+    assert payload["precision"] == 6
+    assert decode_polyline(payload["polyline"], payload["precision"]) == [
+        (37.123457, 127.123456), (37.2, 127.2), (37.4, -127.4),
+    ]
+
+
+def test_map_payload_cache_lru():
+    cache = MapPayloadCache(max_entries=2)
+    builds = []
+
+    def builder(version):
+        def build():
+            builds.append(version)
+            return version.encode("utf-8")
+        return build
+
+    assert cache.get("v1", builder("v1")) == b"v1"
+    assert cache.get("v2", builder("v2")) == b"v2"
+    assert cache.get("v1", builder("v1")) == b"v1"  # 캐시에서 (v1이 가장 최근 사용)
+    assert cache.get("v3", builder("v3")) == b"v3"  # 가장 오래 안 쓴 v2를 버린다
+    assert cache.get("v1", builder("v1")) == b"v1"
+    assert cache.get("v2", builder("v2")) == b"v2"
+
+    assert builds == ["v1", "v2", "v3", "v2"]
+    assert (cache.hits, cache.misses) == (2, 4)
@@ -0,0 +1,47 @@
+# 시트 컬럼 스키마 - 문자열로 읽어온 컬럼을 타입에 맞게 변환
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.data_load.schema import CATEGORY, DATETIME, FLOAT32, FLOAT64, TRACKER_SCHEMA, apply_schema, concat_typed
+
+
+def tracker_frame(rows):
+    return pd.DataFrame(rows, columns=["장비ID", "시간", "위도", "속도", "메모"])
+
+
+def test_apply_schema_converts_columns():
+    frame = apply_schema(tracker_frame([
+        ["dev1", "2024-01-01 00:00:01", "37.123456789", "12.5", "a"],
+        ["dev2", "", "", "빠름", "b"],
+    ]), TRACKER_SCHEMA)
+
+    assert isinstance(frame["장비ID"].dtype, pd.CategoricalDtype)
+    assert str(frame["시간"].dt.tz) == "Asia/Seoul"
+    assert frame["시간"].iloc[0] == pd.Timestamp("2024-01-01 00:00:01", tz="Asia/Seoul")
+    assert pd.isna(frame["시간"].iloc[1])
+    assert frame["위도"].dtype == np.float64 and frame["위도"].iloc[0] == 37.123456789
+    assert frame["속도"].dtype == np.float32 and np.isnan(frame["속도"].iloc[1])
+    assert frame["메모"].tolist() == ["a", "b"]   # 스키마에 없는 컬럼은 그대로
+
+
+def test_apply_schema_parses_other_time_formats():
+    frame = apply_schema(tracker_frame([["dev1", "2024/01/02 03:04:05", 1, 1, ""]]), {"시간": DATETIME})
+
+    assert frame["시간"].iloc[0] == pd.Timestamp("2024-01-02 03:04:05", tz="Asia/Seoul")
+
+
+def test_apply_schema_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        apply_schema(tracker_frame([["dev1", "", 1, 1, ""]]), {"위도": "decimal"})
+
+
+def test_concat_typed_keeps_categories():
+    schema = {"장비ID": CATEGORY, "위도": FLOAT64, "속도": FLOAT32}
+    first = apply_schema(tracker_frame([["dev1", "", "37.1", "1", ""]]), schema)
+    second = apply_schema(tracker_frame([["dev2", "", "37.2", "2", ""]]), schema)
+
+    frame = concat_typed([first, second])
+    assert isinstance(frame["장비ID"].dtype, pd.CategoricalDtype)
+    assert frame["장비ID"].tolist() == ["dev1", "dev2"]
+    assert frame.index.tolist() == [0, 1]
@@ -0,0 +1,55 @@
+# SheetMirror - 시트 데이터를 로컬 Parquet 파일로 저장해 두는 미러
+import os
+
+from util.data_load.sheet_mirror import SheetMirror
+
+
+MIRROR_KEY = ("full", "test-spreadsheet-id", "오토바이DB_누적", "A", "N", (), True)
+
+
+def test_save_and_load_keeps_types(tmp_path, tracker_frame):
+    mirror = SheetMirror(str(tmp_path))
+
+    assert mirror.save(MIRROR_KEY, tracker_frame, {"last_row": 6})
+    frame, meta = mirror.load(MIRROR_KEY)
+
+    assert frame.equals(tracker_frame)
+    assert frame["시간"].dtype == tracker_frame["시간"].dtype
+    assert frame["장비ID"].dtype == "category"
+    assert (meta["last_row"], meta["rows"]) == (6, 5)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_load_missing_or_mismatched_mirror(tmp_path, tracker_frame):
+    mirror = SheetMirror(str(tmp_path))
+    assert mirror.load(MIRROR_KEY) is None
+
+    mirror.save(MIRROR_KEY, tracker_frame)
+    mirror.save(("other",), tracker_frame.head(2))
+    # 데이터 파일만 다른 내용으로 바뀐 경우 (메타데이터의 행 수와 다름)
+    data_path, _ = mirror._paths(MIRROR_KEY)
+    os.replace(mirror._paths(("other",))[0], data_path)
+
+    assert mirror.load(MIRROR_KEY) is None
+
+
+def test_append_writes_segments_until_compaction(tmp_path, tracker_frame):
+    mirror = SheetMirror(str(tmp_path), max_segments=2)
+    mirror.save(MIRROR_KEY, tracker_frame.iloc[:3], {"last_row": 4})
+
+    assert mirror.append(MIRROR_KEY, tracker_frame.iloc[3:4], {"last_row": 5})
+    assert mirror.append(MIRROR_KEY, tracker_frame.iloc[4:], {"last_row": 6})
+    frame, meta = mirror.load(MIRROR_KEY)
+    assert frame.equals(tracker_frame)
+    assert (meta["last_row"], meta["rows"], len(meta["segments"])) == (6, 5, 2)
+
+    # 조각이 max_segments개가 되면 append를 거절하고, save()가 전체를 다시 써서 조각을 지운다
+    assert not mirror.append(MIRROR_KEY, tracker_frame.iloc[4:])
+    mirror.save(MIRROR_KEY, tracker_frame)
+    _, meta = mirror.load(MIRROR_KEY)
+    assert meta.get("segments", []) == []
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_append_without_saved_data(tmp_path, tracker_frame):
+    assert not SheetMirror(str(tmp_path)).append(MIRROR_KEY, tracker_frame)
@@ -0,0 +1,89 @@
+# SheetPoller - 백그라운드에서 지도 시트를 다시 읽어서 스냅샷 묶음을 교체
+import pytest
+
+from util.data_load.fleet_snapshot import FleetSnapshot
+from util.data_load.sheet_poller import SheetPoller
+from util.data_load.snapshot_holder import SharedState, SnapshotHolder
+from tests.conftest import make_tracker_frame
+
+
+@pytest.fixture
+def snapshot_loader():
+    """
+    호출될 때마다 위도가 하나씩 바뀐 스냅샷을 돌려주는 load_snapshots
+    (errors에 넣은 에러는 차례로 던지고, unchanged=True면 강제 읽기가 아닐 때 빈 dict)
+    """
+    def load(previous, force):
+        load.calls.append((previous, force))
+        if load.errors:
+            raise load.errors.pop(0)
+        if load.unchanged and not force:
+            return {}
+        frame = make_tracker_frame(("dev1", 1, 37.0 + len(load.calls), 127.0))
+        return {"오토바이DB_현재": FleetSnapshot.from_frame(frame, previous["오토바이DB_현재"])}
+
+    load.calls = []
+    load.errors = []
+    load.unchanged = False
+    return load
+
+
+@pytest.fixture
+def poller(snapshot_loader, tracker_frame):
+    holder = SnapshotHolder(SharedState(version=1, snapshots={
+        "오토바이DB_현재": FleetSnapshot.from_frame(tracker_frame),
+        "오토바이DB_누적": FleetSnapshot.from_frame(tracker_frame),
+    }))
+    poller = SheetPoller(snapshot_loader, holder, interval=60)
+    yield poller
+    poller.stop()
+
+
+def test_poll_once_publishes_new_version(poller, snapshot_loader):
+    before = poller.holder.get()
+
+    assert poller.poll_once()
+    latest = poller.holder.get()
+    assert latest.version == before.version + 1
+    assert latest.snapshots["오토바이DB_현재"].record(0)["위도"] == 38.0
+    # 이번에 읽지 않은 시트는 이전 스냅샷을 그대로 쓴다
+    assert latest.snapshots["오토바이DB_누적"] is before.snapshots["오토바이DB_누적"]
+    # 이전 묶음은 바뀌지 않는다
+    assert before.snapshots["오토바이DB_현재"].record(0)["위도"] == 37.1
+
+    with pytest.raises(TypeError):
+        latest.snapshots["오토바이DB_현재"] = None
+
+
+def test_failed_poll_keeps_previous_snapshots(poller, snapshot_loader):
+    snapshot_loader.errors.append(RuntimeError("시트 읽기 실패"))
+    before = poller.holder.get()
+
+    assert not poller.poll_once()
+    assert poller.holder.get() is before
+    assert (poller.polls, poller.failures) == (1, 1)
+
+
+def test_request_refresh_wakes_background_thread(poller, snapshot_loader):
+    poller.start()
+
+    assert poller.request_refresh(wait=5)
+    assert poller.holder.version == 2
+    assert len(snapshot_loader.calls) == 1
+
+
+def test_unchanged_poll_publishes_nothing(poller, snapshot_loader):
+    snapshot_loader.unchanged = True
+    before = poller.holder.get()
+
+    assert poller.poll_once()
+    assert poller.holder.get() is before
+    assert poller.unchanged == 1
+
+
+def test_request_refresh_forces_reload(poller, snapshot_loader):
+    snapshot_loader.unchanged = True
+    poller.start()
+
+    assert poller.request_refresh(wait=5)
+    assert snapshot_loader.calls[-1][1] is True
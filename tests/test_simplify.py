@@ -0,0 +1,99 @@
+# util.map.simplify - 처음/마지막 점이 남는지, 허용 오차를 지키는지 확인한다
+import numpy as np
+import pandas as pd
+import pytest
+
+from util.map.simplify import (
+    DOUGLAS_PEUCKER,
+    SIMPLIFIERS,
+    VISVALINGAM,
+    _segment_distances,
+    _triangle_areas,
+    project_to_meters,
+    simplify_track,
+)
+
+
+def random_track(count=500, seed=0):
+    """서울 근처에서 몇 m씩 움직이는 경로 (위도, 경도)"""
+    rng = np.random.default_rng(seed)
+    lat = 37.5 + np.cumsum(rng.normal(0, 0.00005, count))
+    lng = 127.0 + np.cumsum(rng.normal(0, 0.00005, count))
+    return lat, lng
+
+
+@pytest.mark.parametrize("method", sorted(SIMPLIFIERS))
+@pytest.mark.parametrize("count", [1, 2, 3, 50, 500])
+def test_endpoints_are_kept(method, count):
+    lat, lng = random_track(count)
+    keep = SIMPLIFIERS[method](lat, lng, 20.0)
+    assert keep.dtype == bool and len(keep) == count
+    assert keep[0] and keep[-1]
+
+
+@pytest.mark.parametrize("method", sorted(SIMPLIFIERS))
+def test_straight_line_collapses_to_endpoints(method):
+    lat = np.linspace(37.5, 37.6, 100)
+    lng = np.linspace(127.0, 127.1, 100)
+    keep = SIMPLIFIERS[method](lat, lng, 1.0)
+    assert np.flatnonzero(keep).tolist() == [0, 99]
+
+
+@pytest.mark.parametrize("method", sorted(SIMPLIFIERS))
+def test_spike_larger_than_tolerance_is_kept(method):
+    lat = np.full(21, 37.5)
+    lng = np.linspace(127.0, 127.01, 21)
+    lat[10] += 0.001  # 약 111m 튀어나온 점 (앞뒤 9, 11번 점이 꺾이는 점)
+    keep = SIMPLIFIERS[method](lat, lng, 10.0)
+    assert np.flatnonzero(keep).tolist() == [0, 9, 10, 11, 20]
+
+
+@pytest.mark.parametrize("tolerance_m", [1.0, 5.0, 20.0])
+def test_douglas_peucker_respects_tolerance(tolerance_m):
+    lat, lng = random_track()
+    keep = SIMPLIFIERS[DOUGLAS_PEUCKER](lat, lng, tolerance_m)
+    points = project_to_meters(lat, lng)
+
+    kept = np.flatnonzero(keep)
+    assert 2 < len(kept) < len(lat)
+    # 지운 점은 모두 양옆에 남은 두 점을 이은 선분에서 tolerance_m 안에 있어야 한다
+    for start, end in zip(kept[:-1], kept[1:]):
+        if end - start > 1:
+            assert _segment_distances(points, start, end).max() <= tolerance_m
+
+
+@pytest.mark.parametrize("tolerance_m", [1.0, 5.0, 20.0])
+def test_visvalingam_respects_tolerance(tolerance_m):
+    lat, lng = random_track()
+    keep = SIMPLIFIERS[VISVALINGAM](lat, lng, tolerance_m)
+    points = project_to_meters(lat, lng)
+
+    kept = np.flatnonzero(keep)
+    assert 2 < len(kept) < len(lat)
+    # 남은 점은 모두 남은 앞뒤 점과 만드는 삼각형 넓이가 tolerance_m^2 이상이어야 한다
+    areas = _triangle_areas(points, kept[:-2], kept[1:-1], kept[2:])
+    assert areas.min() >= tolerance_m ** 2
+
+
+def test_simplify_track_per_device():
+    lat, lng = random_track(200)
+    frame = pd.DataFrame({
+        "장비ID": np.where(np.arange(200) % 2 == 0, "dev1", "dev2"),
+        "위도": lat,
+        "경도": lng,
+        "시간": pd.date_range("2024-01-01", periods=200, freq="s", tz="Asia/Seoul")[::-1],
+    })
+    frame.loc[5, "위도"] = np.nan
+
+    simplified = simplify_track(frame, 5.0)
+    assert simplified["위도"].notna().all()
+    assert simplified["시간"].is_monotonic_increasing
+    for device_id, device_df in frame.dropna(subset=["위도"]).sort_values("시간").groupby("장비ID"):
+        device_rows = simplified[simplified["장비ID"] == device_id]
+        assert device_rows.index[0] == device_df.index[0]
+        assert device_rows.index[-1] == device_df.index[-1]
+
+    # 허용 오차가 0이면 좌표 없는 행만 빼고 그대로
+    assert len(simplify_track(frame, 0)) == 199
+    with pytest.raises(ValueError):
+        simplify_track(frame, 5.0, method="unknown")
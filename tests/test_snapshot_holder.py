@@ -0,0 +1,56 @@
+# SnapshotHolder - 모든 세션이 같이 보는 SharedState를 copy-on-write로 교체
+import threading
+
+import pytest
+
+from util.data_load.snapshot_holder import SharedState, SnapshotHolder
+
+
+def test_shared_state_is_read_only():
+    user_db = {"user": "hash"}
+    state = SharedState(user_db=user_db)
+    user_db["other"] = "hash"
+
+    assert dict(state.user_db) == {"user": "hash"}
+    with pytest.raises(TypeError):
+        state.user_db["other"] = "hash"
+    with pytest.raises(AttributeError):
+        state.version = 3
+
+
+def test_update_publishes_new_state():
+    holder = SnapshotHolder(SharedState(snapshots={"현재": 1}, user_db={"user": "hash"}))
+    before = holder.get()
+
+    after = holder.update(lambda state: state.with_snapshots({"누적": 2}))
+    assert holder.get() is after
+    assert after.version == before.version + 1
+    assert dict(after.snapshots) == {"현재": 1, "누적": 2}
+    assert dict(after.user_db) == {"user": "hash"}
+    # 이미 읽어간 state는 그대로
+    assert dict(before.snapshots) == {"현재": 1}
+
+
+def test_concurrent_updates_are_not_lost():
+    holder = SnapshotHolder()
+
+    def add_snapshots(offset):
+        for index in range(50):
+            holder.update(lambda state: state.with_snapshots({f"{offset}-{index}": index}))
+
+    threads = [threading.Thread(target=add_snapshots, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert holder.version == 200
+    assert len(holder.get().snapshots) == 200
+
+
+def test_wait_for_version():
+    holder = SnapshotHolder()
+
+    assert not holder.wait_for_version(0, timeout=0.01)
+    threading.Timer(0.05, lambda: holder.update(lambda state: state)).start()
+    assert holder.wait_for_version(0, timeout=5)
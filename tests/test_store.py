@@ -0,0 +1,173 @@
+# TabularStore - 백엔드(GoogleSheet / ExcelSheet / MemorySheet)가 같은 읽기 규칙을 따르는지 확인한다
+import pytest
+
+from util.data_load.excel import ExcelSheet
+from util.data_load.schema import CATEGORY, FLOAT64
+from util.data_load.store import MemorySheet, TabularStore, create_store
+
+
+HEADER = ["장비ID", "차량번호", "위도", "경도"]
+
+
+@pytest.fixture
+def store():
+    return MemorySheet("test_store", {
+        "최신": [
+            HEADER,
+            ["dev1", "11가1111", 37.1, 127.1],
+            ["dev2", "22나2222", 37.2, 127.2],
+        ],
+        "누적": [
+            HEADER,
+            ["dev1", "11가1111", 37.1, 127.1],
+            ["dev2", "22나2222", 37.2, 127.2],
+            ["dev1", "11가1111", 37.3, 127.3],
+        ],
+    })
+
+
+def test_create_store_memory():
+    store = create_store("memory", "test_store")
+    assert isinstance(store, MemorySheet)
+    assert store.spreadsheet_name == "test_store"
+
+
+def test_vlookup_update_many_round_trip(store):
+    rows = store.vlookup_update_many("최신", "A", {
+        "dev2": ["dev2", "22나2222", 37.5, 127.5],
+        "dev3": ["dev3", "33다3333", 37.9, 127.9],
+    })
+    # 있는 key는 그 행을 고치고, 없는 key는 맨 아래에 붙인다
+    assert rows == {"dev2": 3, "dev3": 4}
+
+    frames = store.load_many({
+        "latest": ("최신", "A", "D", ["A"]),
+        "cumulative": ("누적", "A", "D", ["A"]),
+    })
+    latest = frames["latest"]
+    assert list(latest.columns) == HEADER
+    assert latest["장비ID"].tolist() == ["dev1", "dev2", "dev3"]
+    assert latest["위도"].tolist() == ["37.1", "37.5", "37.9"]
+    assert len(frames["cumulative"]) == 3
+
+
+def test_query_rows_after_update(store):
+    store.vlookup_update_many("누적", "A", {"dev3": ["dev3", "33다3333", 37.9, 127.9]})
+
+    df = store.query_rows("누적", "A", "D", filters={"A": "dev1"}, order_by="C", descending=True)
+    assert df["위도"].tolist() == ["37.3", "37.1"]
+
+    page = store.query_rows("누적", "A", "D", order_by="C", limit=2, offset=2)
+    assert page["장비ID"].tolist() == ["dev1", "dev3"]
+
+    assert store.query_rows("누적", "A", "D", filters={"A": "dev3"})["차량번호"].tolist() == ["33다3333"]
+
+
+def test_load_many_with_schema(store):
+    schema = {"장비ID": CATEGORY, "차량번호": CATEGORY, "위도": FLOAT64, "경도": FLOAT64}
+    store.vlookup_update_many("최신", "A", {"dev1": [37.25, 127.25]}, start_col_letter="C")
+
+    latest = store.load_many({"latest": ("최신", "A", "D", ["A"], schema)})["latest"]
+    assert str(latest["장비ID"].dtype) == "category"
+    assert latest["위도"].tolist() == [37.25, 37.2]
+    assert latest["경도"].tolist() == [127.25, 127.2]
+
+
+def test_memory_update_appends_below_last_row(store):
+    store.update("최신", [["dev3", "33다3333", 37.3, 127.3]], "A")
+    store.update_oneline("최신", ["dev4", "44라4444", 37.4, 127.4], "A")
+
+    assert store.load_as_dataframe("최신", "A", "D")["장비ID"].tolist() == ["dev1", "dev2", "dev3", "dev4"]
+    assert store.get_value_by_cell("최신", "C5") == "37.4"
+
+
+
+def test_memory_update_uses_start_column():
+    store = MemorySheet("test_store", {"S": [["a", "b", "c"], [1, 2], [3, 4]]})
+
+    store.update("S", [[5, 6]], "A")
+    store.update("S", [["x"]], "C")
+
+    assert store.get_value_by_cell("S", "A4") == "5"
+    assert store.get_value_by_cell("S", "C2") == "x"
+
+
+def test_memory_change_signal_and_incremental(store):
+    signal = store.get_change_signal()
+    first = store.load_as_dataframe_incremental("누적", "A", "D", ["A"])
+    store.update("누적", [["dev2", "22나2222", 37.4, 127.4]], "A")
+
+    assert store.get_change_signal() != signal
+    assert len(store.load_as_dataframe_incremental("누적", "A", "D", ["A"])) == len(first) + 1
+
+
+def test_memory_conditional_load_many(store):
+    ranges = {"누적": ("누적", "A", "D", ["A"])}
+    assert store.load_many_conditional(ranges)["누적"][1] == 1
+    assert store.load_many_conditional(ranges) == {}
+
+    # 다른 시트만 바뀌면 다시 읽어도 바뀐 것으로 보지 않는다
+    store.update("최신", [["dev3", "33다3333", 37.9, 127.9]], "A")
+    assert store.load_many_conditional(ranges) == {}
+    assert store.get_data_version("누적", "A", "D", ["A"]) == 1
+
+    store.update("누적", [["dev2", "22나2222", 37.4, 127.4]], "A")
+    frame, version = store.load_many_conditional(ranges)["누적"]
+    assert (len(frame), version) == (4, 2)
+
+
+SHEETS = {
+    "최신": [
+        ["장비ID", "차량번호", "위도", "메모"],
+        ["dev1", "11가1111", 37.1, None],
+        ["dev2", "22나2222", 37.0, "#N/A"],
+        [None, "빈 key", 37.9, None],
+        ["dev3", "33다3333", 37.3, None],
+    ],
+}
+
+
+@pytest.fixture
+def stores(sheets_api, make_google_sheet, make_workbook):
+    """같은 내용으로 채운 세 가지 백엔드"""
+    for title, rows in SHEETS.items():
+        sheets_api.add_sheet(title, rows)
+    path = make_workbook(SHEETS)
+    return {
+        "google": make_google_sheet(),
+        "excel": create_store("excel", "기록", spreadsheet_path=path),
+        "memory": create_store("memory", "기록", spreadsheet_path=path),
+    }
+
+
+@pytest.mark.parametrize("key_cols", [[], ["A"]])
+def test_backends_read_the_same_frame(stores, key_cols):
+    frames = {name: store.load_as_dataframe("최신", "A", "D", key_cols) for name, store in stores.items()}
+
+    assert frames["excel"].equals(frames["google"])
+    assert frames["memory"].equals(frames["google"])
+    assert frames["google"]["위도"].tolist()[:2] == ["37.1", "37"]
+
+
+def test_backends_read_the_same_typed_frame(stores):
+    schema = {"장비ID": CATEGORY, "위도": FLOAT64}
+    frames = {name: store.load_as_dataframe("최신", "A", "D", ["A"], schema=schema) for name, store in stores.items()}
+
+    assert frames["excel"].equals(frames["google"])
+    assert frames["memory"].equals(frames["google"])
+
+
+
+def test_backends_implement_store_protocol(stores):
+    # 서버에서 쿼리를 처리하는 것은 구글 시트뿐 (나머지는 메모리 데이터를 쓰는 편이 낫다)
+    assert {name: isinstance(store, TabularStore) for name, store in stores.items()} == {"google": True, "excel": True, "memory": True}
+    assert {name: store.SERVER_QUERY for name, store in stores.items()} == {"google": True, "excel": False, "memory": False}
+
+def test_excel_store_writes_to_file(stores):
+    store = stores["excel"]
+    store.set_value_by_cell("최신", "D2", "메모")
+    store.update("최신", [["dev4", "44라4444", 37.4]], "A")
+
+    reopened = ExcelSheet(store.spreadsheet_path)
+    assert reopened.get_value_by_cell("최신", "D2") == "메모"
+    assert reopened.load_as_dataframe("최신", "A", "C")["장비ID"].tolist()[-1] == "dev4"
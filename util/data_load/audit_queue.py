@@ -0,0 +1,163 @@
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class AuditQueue:
+    """
+    로그인 내역 / 계정 잠금 같은 기록용 쓰기를 모아서 백그라운드에서 시트에 쓰는 큐 (write-behind).
+
+    - append_row()로 넣은 행은 시트별로 모아서 flush_interval마다 append_rows 1번으로 쓴다.
+    - set_cell()은 같은 셀에 같은 값을 다시 넣으면 무시한다 (상태가 바뀔 때 1번만 기록).
+      쓰기 전에 같은 셀 값이 여러 번 바뀌면 마지막 값만 쓴다.
+    - 쓰기에 실패하면 로그를 남기고 다음 주기에 다시 시도한다.
+    - 프로그램 종료 시(atexit) 남은 내용을 한 번 더 쓴다.
+    """
+
+    def __init__(self, store, flush_interval: float = 5.0, max_batch_rows: int = 500, name: str = "audit-queue"):
+        """
+        :param store: 기록할 저장소 (TabularStore - GoogleSheet / ExcelSheet / MemorySheet)
+        :param flush_interval: 모아서 쓰는 간격(초)
+        :param max_batch_rows: 한 번의 append_rows로 쓸 최대 행 수
+        """
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch_rows = max_batch_rows
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._rows: Dict[str, List[list]] = OrderedDict()
+        self._cells: Dict[Tuple[str, str], str] = OrderedDict()
+        self._cell_values: Dict[Tuple[str, str], str] = {}
+
+        self._wakeup = threading.Event()
+        self._stop_requested = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.rows_written = 0
+        self.cells_written = 0
+        self.flushes = 0
+        self.failures = 0
+
+    # -----------------------
+    # 기록 추가 (시트 요청 없음)
+    # -----------------------
+    def append_row(self, sheet_name: str, row: List[Any]) -> None:
+        """sheet_name 시트 맨 아래에 붙일 행을 큐에 넣는다"""
+        with self._lock:
+            self._rows.setdefault(sheet_name, []).append(list(row))
+            pending = len(self._rows[sheet_name])
+        if pending >= self.max_batch_rows:
+            self._wakeup.set()
+
+    def set_cell(self, sheet_name: str, cell_pos: str, value: str, force: bool = False) -> bool:
+        """
+        셀 값을 큐에 넣는다.
+
+        :param force: 기억한 값과 같아도 큐에 넣는다 (다른 곳에서 시트 값을 바꿨을 수 있을 때)
+        :return: 값이 바뀌어서(또는 force로) 큐에 넣었으면 True, 이미 같은 값이면 False
+        """
+        key = (sheet_name, cell_pos.strip().upper())
+        value = str(value)
+        with self._lock:
+            if not force and self._cell_values.get(key) == value:
+                return False
+            self._cell_values[key] = value
+            self._cells[key] = value
+        self._wakeup.set()
+        return True
+
+    def remember_cell(self, sheet_name: str, cell_pos: str, value: str) -> None:
+        """시트에서 이미 읽은 셀 값을 알려준다 (같은 값을 다시 쓰지 않도록)"""
+        with self._lock:
+            self._cell_values[(sheet_name, cell_pos.strip().upper())] = str(value)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(rows) for rows in self._rows.values()) + len(self._cells)
+
+    # -----------------------
+    # 시트에 쓰기
+    # -----------------------
+    def flush(self) -> int:
+        """
+        큐에 쌓인 행/셀을 시트에 쓴다.
+
+        :return: 이번에 쓴 행 + 셀 개수
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, OrderedDict()
+                cells, self._cells = self._cells, OrderedDict()
+            if not rows and not cells:
+                return 0
+
+            written = 0
+            failed_rows: Dict[str, List[list]] = OrderedDict()
+            for sheet_name, sheet_rows in rows.items():
+                for start in range(0, len(sheet_rows), self.max_batch_rows):
+                    batch = sheet_rows[start:start + self.max_batch_rows]
+                    try:
+                        self.store.write_rows(sheet_name, batch, value_input_option="USER_ENTERED")
+                    except Exception as e:
+                        self.failures += 1
+                        logging.error(f"기록 쓰기 실패 - 다음 주기에 다시 시도 : {sheet_name} {len(sheet_rows) - start}행 - {e}")
+                        failed_rows[sheet_name] = sheet_rows[start:]
+                        break
+                    written += len(batch)
+                    self.rows_written += len(batch)
+
+            failed_cells: Dict[Tuple[str, str], str] = OrderedDict()
+            for (sheet_name, cell_pos), value in cells.items():
+                try:
+                    self.store.set_value_by_cell(sheet_name, cell_pos, value)
+                except Exception as e:
+                    self.failures += 1
+                    logging.error(f"셀 쓰기 실패 - 다음 주기에 다시 시도 : {sheet_name} {cell_pos} - {e}")
+                    failed_cells[(sheet_name, cell_pos)] = value
+                    continue
+                written += 1
+                self.cells_written += 1
+
+            # 실패한 내용은 그 사이 새로 들어온 내용보다 앞에 다시 넣는다 (순서 유지)
+            if failed_rows or failed_cells:
+                with self._lock:
+                    for sheet_name, sheet_rows in self._rows.items():
+                        failed_rows.setdefault(sheet_name, []).extend(sheet_rows)
+                    self._rows = failed_rows
+                    failed_cells.update(self._cells)
+                    self._cells = failed_cells
+
+            self.flushes += 1
+            return written
+
+    # -----------------------
+    # 스레드 제어
+    # -----------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_requested.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """백그라운드 스레드를 멈추고 남은 내용을 쓴다"""
+        self._stop_requested.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop_requested.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stop_requested.is_set():
+                break
+            self.flush()
@@ -1,19 +1,42 @@
 import os
 import time
 import os
+import csv
+import io
+import itertools
+import threading
+import re
 import string
 import pandas as pd
 from pathlib import Path
+from typing import Dict, Iterator, List
 
 from datetime import datetime
 from openpyxl import Workbook, load_workbook, worksheet
 
 import util.error_log.errors as errors
 import util.os.path as path_util
+from util.data_load.schema import apply_schema, concat_typed
+from util.data_load.store import ConditionalLoads
+from util.data_load.store import TabularStoreBase
+from util.data_load.store import format_cell_value
+from util.data_load.store import parse_fetched_rows
+from util.data_load.store import parse_one_line
+from util.data_load.store import rows_to_dataframe
+from util.data_load.store import split_cell_pos
+from util.data_load.store import trim_values
 
 
 ### 테스트가 필요함 ###
 
+# iter_dataframe_chunks()에서 시트 행과 사이드카 CSV 행 사이에 끼워 넣는 표시
+_SIDECAR_START = object()
+
+def header_only_frame(header: list, schema=None) -> pd.DataFrame:
+    """헤더만 있는 시트의 빈 DataFrame (컬럼만 있음, schema가 있으면 타입도 맞춘다)"""
+    df_sheet = pd.DataFrame(columns=header)
+    return apply_schema(df_sheet, schema) if schema else df_sheet
+
 def is_col_letter(s: str) -> bool:
     """
     주어진 문자열이 A, B, C 같은 알파벳만(한 문자 이상)으로 이루어져 있는지 간단히 체크하는 함수
@@ -54,6 +77,27 @@ def col_number_to_letter(col_num: int) -> str:
         raise ValueError("컬럼 문자열을 변환 할 수 없습니다.")    
     return letters
 
+def get_last_data_rows(sheet: worksheet.worksheet.Worksheet, col_letters) -> Dict[str, int]:
+    """
+    각 컬럼에서 데이터가 있는 마지막 행 번호 (없으면 0).
+    셀을 아래에서부터 하나씩 찾지 않고 iter_rows(values_only=True)로 위에서부터 한 번만 훑는다.
+    (read_only로 연 시트에서도 동작)
+    """
+    col_letters = [letter.upper() for letter in col_letters]
+    last_rows = {letter: 0 for letter in col_letters}
+    if not col_letters:
+        return last_rows
+
+    col_numbers = {letter: col_letter_to_number(letter) for letter in col_letters}
+    min_col = min(col_numbers.values())
+    max_col = max(col_numbers.values())
+    offsets = [(letter, number - min_col) for letter, number in col_numbers.items()]
+    for row_idx, row in enumerate(sheet.iter_rows(min_col=min_col, max_col=max_col, values_only=True), start=1):
+        for letter, offset in offsets:
+            if offset < len(row) and row[offset] not in (None, ""):
+                last_rows[letter] = row_idx
+    return last_rows
+
 def get_min_of_last_data_rows(sheet: worksheet.worksheet.Worksheet, key_col_letters) -> int:
     """
     여러 키 컬럼 중 '가장 아래까지 데이터가 있는 행 번호'를 각각 구한 뒤,
@@ -67,17 +111,7 @@ def get_min_of_last_data_rows(sheet: worksheet.worksheet.Worksheet, key_col_lett
     if not key_col_letters:
         return 0
 
-    last_data_rows = []
-    max_possible = sheet.max_row
-
-    for col_letter in key_col_letters:
-        row_found = 0
-        for row_idx in range(max_possible, 0, -1):
-            cell_value = sheet[f"{col_letter}{row_idx}"].value
-            if cell_value not in (None, ""):
-                row_found = row_idx
-                break
-        last_data_rows.append(row_found)
+    last_data_rows = list(get_last_data_rows(sheet, key_col_letters).values())
 
     # 모두 비어있으면 0, 아니면 가장 작은 행 번호
     if all(r == 0 for r in last_data_rows):
@@ -92,39 +126,67 @@ def get_max_row_in_col_range(sheet: worksheet.worksheet.Worksheet, start_letter:
     즉, 열 범위 내 어느 컬럼에라도 마지막으로 데이터가 존재하는 행을 찾고,
     그 중 가장 큰 행 번호를 반환.
     """
-    max_found = 0
-    sheet_max = sheet.max_row
-    for col_code in range(ord(start_letter), ord(end_letter) + 1):
-        col_letter = chr(col_code)
-        for row_idx in range(sheet_max, 0, -1):
-            cell_value = sheet[f"{col_letter}{row_idx}"].value
-            if cell_value not in (None, ""):
-                if row_idx > max_found:
-                    max_found = row_idx
-                break
-    return max_found
+    col_letters = [
+        col_number_to_letter(number)
+        for number in range(col_letter_to_number(start_letter), col_letter_to_number(end_letter) + 1)
+    ]
+    return max(get_last_data_rows(sheet, col_letters).values(), default=0)
 
-class ExcelSheet:
+class ExcelSheet(TabularStoreBase):
     """엑셀(.xlsx) 및 CSV 파일의 읽기/쓰기 기능을 제공하는 유틸리티 클래스.
     
     Pandas와 openpyxl을 활용하여 파일을 DataFrame으로 불러오거나 저장하며,
     예외 처리와 대용량 데이터에 대한 최적화 옵션을 포함한다.
+    GoogleSheet와 같은 TabularStore 인터페이스/읽기 규칙(util.data_load.store)을 따른다.
     """
     
-    def __init__(self, spreadsheet_path: str):
+    def __init__(self, spreadsheet_path: str, read_only: bool = False, autosave: bool = True, sidecar_sheets=()):
         """
         엑셀 스프레드시트 선택 초기화
 
         :param spreadsheet_name: 액세스할 스프레드시트 이름
+        :param read_only: True면 셀 객체를 만들지 않고 파일에서 바로 읽는 읽기 전용(스트리밍) 모드로 연다.
+                          수십만 행짜리 기록 파일을 읽을 때 사용 (쓰기 함수는 사용할 수 없음, 다 쓰면 close())
+        :param autosave: False면 쓰기 함수가 파일을 저장하지 않는다 (여러 번 쓰고 save()를 한 번 부를 때)
+        :param sidecar_sheets: 맨 아래에 붙이기만 하는 시트 이름 목록. 이 시트에 붙이는 행은 엑셀 파일 대신
+                               옆의 CSV 사이드카에 쓰고, 읽을 때는 시트 아래에 이어서 읽는다 (flush_sidecar()로 합침)
         """        
         file_path = Path(spreadsheet_path)
-        if not path_util.is_valid_path(spreadsheet_path):
+        if not read_only and not path_util.is_valid_path(spreadsheet_path):
             file_path.parent.mkdir(parents=True, exist_ok=True)
             file_path.touch()
             print(f"파일이 없어 빈 파일을 생성합니다 : {file_path}")        
         
         self.spreadsheet_path = spreadsheet_path
-        self.workbook = load_workbook(self.spreadsheet_path, keep_vba=False)
+        self.spreadsheet_name = file_path.stem
+        self.read_only = read_only
+        if read_only:
+            # 수식 대신 마지막으로 저장된 값을 읽는다 (읽기 전용 모드에서는 수식을 계산할 수 없음)
+            self.workbook = load_workbook(self.spreadsheet_path, read_only=True, data_only=True)
+        else:
+            self.workbook = load_workbook(self.spreadsheet_path, keep_vba=False)
+
+        self.autosave = autosave
+        self.sidecar_sheets = set(sidecar_sheets)
+        self._dirty = False
+        # 사이드카 CSV 경로 -> 시트로 옮긴 앞부분 바이트 수 (옮긴 뒤에 붙인 행은 그 뒤에 이어서 쌓임)
+        self._moved_sidecars: Dict[str, int] = {}
+        # (시트, 시작 열)별 다음 빈 행 번호 / (시트, key 열)별 key -> 행 번호 인덱스
+        self._append_cursors: Dict[tuple, int] = {}
+        self._key_indexes: Dict[tuple, dict] = {}
+        # 여러 스레드(세션, 백그라운드 큐)가 같은 workbook을 읽고 쓰므로 읽기 / 쓰기 / 저장은 이 잠금 안에서 한다
+        # (쓰기 함수가 안에서 다른 쓰기 / 저장을 부르므로 RLock)
+        self._lock = threading.RLock()
+        # load_as_dataframe_conditional() / load_many_conditional() 의 범위별 변경 신호 / 데이터 버전
+        self._conditional_loads = ConditionalLoads(self)
+
+    def close(self) -> None:
+        """읽기 전용 모드에서 열어둔 파일을 닫는다"""
+        self.workbook.close()
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ValueError(f"읽기 전용(read_only)으로 연 엑셀 파일에는 쓸 수 없습니다: {self.spreadsheet_path}")
     
     
     def load_sheet(self, sheet_name: str) -> worksheet.worksheet.Worksheet:
@@ -133,24 +195,42 @@ class ExcelSheet:
         """
         return self.workbook[sheet_name]
 
+    def _get_values(self, sheet_name, start_col_letter, end_col_letter, first_row=1, last_row=None, unformatted=False):
+        """A1 범위 값을 구글 시트 API 응답 모양으로 돌려준다 (util.data_load.store.trim_values)"""
+        with self._lock:
+            sheet = self.load_sheet(sheet_name)
+            if sheet is None:
+                raise ValueError("sheet 로드 과정에서 None 데이터가 들어왔습니다")
+            rows = sheet.iter_rows(
+                min_row=first_row,
+                max_row=last_row,
+                min_col=col_letter_to_number(start_col_letter),
+                max_col=col_letter_to_number(end_col_letter),
+                values_only=True,
+            )
+            values = trim_values(rows, unformatted)
+            if last_row is None and sheet_name in self.sidecar_sheets:
+                # 사이드카 행은 시트의 마지막 데이터 행 바로 아래에 붙어 있는 것으로 본다
+                values += trim_values(self._iter_sidecar_rows(sheet_name, start_col_letter, end_col_letter))
+            return values
+
     def load_as_fetched_data(
         self,
         sheet_name: str,
         start_col_letter: str,
         end_col_letter: str,
-        key_col_letters=None
+        key_col_letters=None,
+        unformatted=False
     ):
         """
-        - 키 컬럼이 있으면: 모든 키 컬럼이 공통으로 값이 있는 마지막 행(= 각 키 컬럼의 last row 중 최소값)까지만 로드.
-        - 키 컬럼이 없으면: start_col_letter~end_col_letter 범위 안에 있는 모든 열의 마지막 데이터 행(= 모든 열의 last row 중 최대값)까지 로드.
+        GoogleSheet.load_as_fetched_data와 같은 규칙으로 읽는다.
+        - 키 컬럼이 있으면: 키 컬럼 중 하나라도 처음 비는 행 앞까지만 로드.
+        - unformatted가 False면 값을 화면에 보이는 문자열로, True면 엑셀 셀 값 그대로 돌려준다.
+        - 헤더만 있는 시트는 EmptyDataError 대신 헤더 1행만 돌려준다 (원래 엑셀 동작 그대로).
         """
         if key_col_letters is None:
             key_col_letters = []
 
-        sheet = self.load_sheet(sheet_name)
-        if sheet is None:
-            raise ValueError("sheet 로드 과정에서 None 데이터가 들어왔습니다")
-
         # 인자 검증
         if not is_col_letter(start_col_letter):
             raise ValueError(f"start_col_letter에 알파벳이 아닌 문자 데이터가 입력되었습니다: {start_col_letter}")
@@ -169,257 +249,337 @@ class ExcelSheet:
             if not (start_col_letter <= k_col <= end_col_letter):
                 raise ValueError(f"key_col_letter가 start_col~end_col 범위를 벗어났습니다: {k_col}")
 
-        if len(key_col_letters) == 0:
-            # 키 컬럼이 없으면: start~end 열 범위 내에서, 가장 아래쪽(= 최대) 행 번호를 찾는다.
-            max_row = get_max_row_in_col_range(sheet, start_col_letter, end_col_letter)
-            if max_row == 0:
-                print("Fail: 지정된 열 범위 내에 데이터가 전혀 없습니다.")
-                raise ValueError("EmptyDataError")
-        else:
-            # 키 컬럼이 있으면: 각 키 컬럼마다 last row를 찾고, 그 중 최소값까지만 로드.
-            min_last_row_in_keys = get_min_of_last_data_rows(sheet, key_col_letters)
-            if min_last_row_in_keys == 0:
-                print("Fail: 키 컬럼 중 하나라도 전부 비어있어, 불러올 행이 없습니다.")
-                raise ValueError("EmptyDataError")
-            max_row = min_last_row_in_keys
-
-        # 범위 문자열
-        cell_range = f"{start_col_letter}1:{end_col_letter}{max_row}"
-        raw_cells = sheet[cell_range]
-
-        sheet_data = []
-        for row in raw_cells:
-            row_data = []
-            for cell in row:
-                row_data.append(cell.value if cell.value is not None else "")
-            sheet_data.append(row_data)
-
-        # 열 길이 맞추기
-        col_len = ord(end_col_letter) - ord(start_col_letter) + 1
-        for row_index, row in enumerate(sheet_data):
-            while len(row) < col_len:
-                sheet_data[row_index].append('')
-
-        print("[ load_as_fetched_data ]")
-        if len(sheet_data) == 0:
-            print("Fail: 엑셀 시트에서 데이터가 비어 있습니다. 시트와 범위를 확인해주세요.")
-            raise ValueError("EmptyDataError")
-
-        if len(sheet_data) == 1:
-            for row in sheet_data:
-                for val in row:
-                    if val == "#N/A":
-                        print("Fail: #N/A 값이 존재합니다.")
-                        raise ValueError("EmptyDataError")
-            print("Success: (헤더만 존재)")
-        else:
-            print("Success: 엑셀 시트에서 데이터를 성공적으로 가져왔습니다.")
-
-        return sheet_data
+        sheet_data = self._get_values(sheet_name, start_col_letter, end_col_letter, unformatted=unformatted)
+        if len(sheet_data) == 1 and any(value not in (None, "") for value in sheet_data[0]):
+            col_len = col_letter_to_number(end_col_letter) - col_letter_to_number(start_col_letter) + 1
+            header = list(sheet_data[0]) + [""] * (col_len - len(sheet_data[0]))
+            if "#N/A" in header:
+                print("Fail 엑셀 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
+                raise errors.EmptyDataError
+            print(f"{sheet_name} - Success (헤더만 존재)")
+            return [header]
+        return parse_fetched_rows(sheet_name, sheet_data, start_col_letter, end_col_letter, key_col_letters)
 
     def load_as_dataframe(
         self,
         sheet_name: str,
         start_col_letter: str,
         end_col_letter: str,
-        key_cols=None
+        key_cols=None,
+        use_cache=True,
+        cache_ttl=None,
+        schema=None
     ):
+        """
+        :param use_cache / cache_ttl: GoogleSheet와 인자를 맞추기 위한 값 (파일을 바로 읽으므로 쓰지 않음)
+        :param schema: {컬럼 이름: 타입}, 주면 셀 값을 그대로 읽어서 타입을 변환한다
+        """
         if key_cols is None:
             key_cols = []
 
-        load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_cols)
-
-        col_length = len(load_data[0])
-        for index, row in enumerate(load_data):
-            while len(load_data[index]) < col_length:
-                load_data[index].append("")
+        if self.read_only:
+            # 중간 2차원 리스트를 만들지 않고 chunk 단위로 변환해서 붙인다
+            with self._lock:
+                return concat_typed(list(self.iter_dataframe_chunks(sheet_name, start_col_letter, end_col_letter, key_cols, schema=schema)))
 
+        load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_cols, unformatted=bool(schema))
         print(f"[ load_as_dataframe ] row count: {len(load_data)}")
         if len(load_data) == 1:
-            return pd.DataFrame(load_data[1:], columns=load_data[0])
-        else:
-            if len(load_data[0]) == len(load_data[1]):
-                df_sheet = pd.DataFrame(load_data[1:], columns=load_data[0])
-            else:
-                raise ValueError("Columns and data length do not match.")
-            return df_sheet
+            return header_only_frame(load_data[0], schema)
+        return rows_to_dataframe(load_data, schema)
+
+    def iter_dataframe_chunks(
+        self,
+        sheet_name: str,
+        start_col_letter: str,
+        end_col_letter: str,
+        key_cols=None,
+        chunk_size: int = 50000,
+        schema=None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        시트를 위에서부터 한 번만 훑으면서 chunk_size행씩 DataFrame으로 나눠서 돌려준다.
+        load_as_dataframe과 같은 규칙(키 컬럼이 처음 비는 행 앞까지, 맨 아래 빈 행 제외)으로 읽고,
+        한 번에 chunk_size행만 메모리에 들고 있는다. (read_only=True로 열면 셀 객체도 만들지 않음)
+
+        :param schema: {컬럼 이름: 타입}, 주면 chunk마다 타입을 변환한다 (합칠 때는 concat_typed)
+        (잠금을 잡지 않으므로 다른 스레드가 쓰는 중이면 load_as_dataframe()으로 읽는다)
+        """
+        if key_cols is None:
+            key_cols = []
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size는 0보다 커야 합니다: {chunk_size}")
+        if not is_col_letter(start_col_letter) or not is_col_letter(end_col_letter):
+            raise ValueError(f"열에 알파벳이 아닌 문자 데이터가 입력되었습니다: {start_col_letter}, {end_col_letter}")
+
+        sheet = self.load_sheet(sheet_name)
+        start_col_number = col_letter_to_number(start_col_letter)
+        end_col_number = col_letter_to_number(end_col_letter)
+        col_len = end_col_number - start_col_number + 1
+        key_indexes = [col_letter_to_number(key_col) - start_col_number for key_col in key_cols]
+        for key_index in key_indexes:
+            if not 0 <= key_index < col_len:
+                raise ValueError(f"key_col_letter가 start_col~end_col 범위를 벗어났습니다: {key_cols}")
+
+        convert = (lambda value: "" if value is None else value) if schema else format_cell_value
+        rows = sheet.iter_rows(min_row=1, min_col=start_col_number, max_col=end_col_number, values_only=True)
+        if sheet_name in self.sidecar_sheets:
+            rows = itertools.chain(rows, [_SIDECAR_START], self._iter_sidecar_rows(sheet_name, start_col_letter, end_col_letter))
+        header = [convert(value) for value in next(rows, ())]
+        header += [""] * (col_len - len(header))
+        if not any(value != "" for value in header):
+            print("Fail 엑셀 시트에서 데이터가 비어 있습니다. 시트와 범위를 확인해주세요.")
+            raise errors.EmptyDataError
+
+        chunk: List[list] = []
+        empty_rows = 0
+        row_count = 0
+        for raw_row in rows:
+            if raw_row is _SIDECAR_START:
+                # 시트 맨 아래의 빈 행은 버리고 사이드카 행을 바로 이어 붙인다
+                empty_rows = 0
+                continue
+            row = [convert(value) for value in raw_row]
+            row += [""] * (col_len - len(row))
+            if any(row[key_index] == "" for key_index in key_indexes):
+                break
+            # 빈 행은 뒤에 데이터가 있을 때만 넣는다 (맨 아래 빈 행은 구글 시트처럼 버림)
+            if not any(value != "" for value in row):
+                empty_rows += 1
+                continue
+            if row_count == 0 and "#N/A" in header + row:
+                print("Fail 엑셀 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
+                raise errors.EmptyDataError
+            for _ in range(empty_rows):
+                chunk.append([""] * col_len)
+            empty_rows = 0
+            chunk.append(row)
+            row_count += 1
+            if len(chunk) >= chunk_size:
+                yield rows_to_dataframe([header] + chunk, schema)
+                chunk = []
+
+        if row_count == 0:
+            # 헤더만 있으면 load_as_dataframe()처럼 빈 DataFrame 1개
+            print(f"{sheet_name} - Success (헤더만 존재)")
+            yield header_only_frame(header, schema)
+            return
+        if chunk:
+            yield rows_to_dataframe([header] + chunk, schema)
+        print(f"{sheet_name} - Success 엑셀 시트에서 {row_count}행을 읽었습니다.")
 
     def load_one_line(self, sheet_name: str, start_col_letter: str, end_col_letter: str):
         """
         구글 시트에서 사용하던 'load_one_line' 함수를 openpyxl 기반으로 변환한 예시.
         (헤더는 1행, 실제 데이터는 2행 가정)
         """
-        sheet = self.load_sheet(sheet_name)
-        if sheet is None:
-            raise ValueError("Sheet를 불러오지 못했습니다.")
-
         if not is_col_letter(start_col_letter):
             raise ValueError(f"start_col_letter에 알파벳이 아닌 문자 데이터가 입력되었습니다: {start_col_letter}")
         if not is_col_letter(end_col_letter):
             raise ValueError(f"end_col_letter에 알파벳이 아닌 문자 데이터가 입력되었습니다: {end_col_letter}")
 
-        start_col_letter = start_col_letter.upper()
-        end_col_letter = end_col_letter.upper()
-
         # A1 ~ B2 형태로 2행까지만 읽어옴 (헤더 + 실제 데이터 1줄)
-        cell_range = f"{start_col_letter}1:{end_col_letter}2"
-        raw_cells = sheet[cell_range]  # ((cellObj, cellObj, ...), (cellObj, cellObj, ...))
-
-        # 2차원 리스트 변환
-        sheet_data = []
-        for row in raw_cells:
-            row_data = []
-            for cell in row:
-                row_data.append(cell.value if cell.value is not None else "")
-            sheet_data.append(row_data)
-
-        # 최소 2행은 존재해야 실제 데이터가 있다고 봄 (헤더 + 실제값)
-        if len(sheet_data) < 2:
-            print("Fail: 엑셀 시트에서 데이터가 비어 있거나, 2행 데이터가 없습니다.")
-            raise ValueError("EmptyDataError")
-
-        print("Success: 엑셀 시트에서 데이터를 가져왔습니다.")
-
-        # 딕셔너리 생성
-        oneline_dict = {}
-        header_row = sheet_data[0]
-        value_row = sheet_data[1]
-
-        # 만약 value_row가 header_row보다 짧으면 빈 문자열로 채워줌
-        while len(value_row) < len(header_row):
-            value_row.append('')
-
-        for col_index, header in enumerate(header_row):
-            value = value_row[col_index]
-            oneline_dict[header] = value
-
-        return oneline_dict
-    
+        sheet_data = self._get_values(sheet_name, start_col_letter.upper(), end_col_letter.upper(), 1, 2) or [[]]
+        return parse_one_line(sheet_name, sheet_data)
+
+    def get_change_signal(self, sheet_name=None, sentinel_range=None) -> str:
+        """
+        데이터가 바뀌었는지 확인하기 위한 값.
+        - sentinel_range가 없으면: 파일(엑셀 + 사이드카 CSV) 수정 시각 + 크기
+        - sentinel_range가 있으면: sheet_name 시트의 작은 범위 값의 해시
+        """
+        if sentinel_range is None:
+            paths = [self.spreadsheet_path] + [self.get_sidecar_path(name) for name in sorted(self.sidecar_sheets)]
+            stats = [os.stat(path) for path in paths if os.path.exists(path)]
+            return "file:" + ":".join(f"{stat.st_mtime_ns}:{stat.st_size}" for stat in stats)
+        return self._range_signal(sheet_name, sentinel_range)
+
+    def get_value_by_cell(self, sheet_name: str, cell_pos: str):
+        """A1 표기법(예: 'B2', 'C8')으로 특정 셀의 값을 가져옵니다. (빈 셀은 None)"""
+        row_number, col_letter = split_cell_pos(cell_pos)
+        values = self._get_values(sheet_name, col_letter, col_letter, row_number, row_number)
+        return values[0][0] if values and values[0] else None
+
+    def set_value_by_cell(self, sheet_name: str, cell_pos: str, update_data: str) -> None:
+        """A1 표기법(예: 'B2', 'C8')으로 특정 셀의 값을 설정합니다."""
+        self._check_writable()
+        with self._lock:
+            self._move_sidecar(sheet_name)
+            row_number, col_letter = split_cell_pos(cell_pos)
+            sheet = self.load_sheet(sheet_name)
+            sheet.cell(row=row_number, column=col_letter_to_number(col_letter)).value = str(update_data)
+            # 행 번호 기준 캐시(append 위치, key 인덱스)는 다음에 한 번 다시 훑어서 만든다
+            self._forget_row_layout(sheet_name)
+            self._commit()
+
     def save(self, save_path=None):        
-        if save_path == None:
-            self.workbook.save(self.spreadsheet_path)
+        self._check_writable()
+        with self._lock:
+            if save_path == None:
+                self.workbook.save(self.spreadsheet_path)
+                self._dirty = False
+                # 엑셀 파일로 옮긴 사이드카 CSV는 저장이 끝난 뒤에 정리한다 (저장 전에 죽으면 CSV가 남아 있음)
+                for sidecar_path, moved_bytes in self._moved_sidecars.items():
+                    self._trim_sidecar(sidecar_path, moved_bytes)
+                self._moved_sidecars.clear()
+            else:
+                self.workbook.save(save_path)
+
+    def _commit(self) -> None:
+        """쓰기 후 저장 (autosave=False면 표시만 해 두고 save()를 부를 때 한 번에 저장)"""
+        if self.autosave:
+            self.save()
         else:
-            self.workbook.save(save_path)
-    
+            self._dirty = True
+
+    def _forget_append_cursors(self, sheet_name: str) -> None:
+        for cursor_key in [cursor_key for cursor_key in self._append_cursors if cursor_key[0] == sheet_name]:
+            self._append_cursors.pop(cursor_key, None)
+
+    def _forget_row_layout(self, sheet_name: str) -> None:
+        self._forget_append_cursors(sheet_name)
+        for index_key in [index_key for index_key in self._key_indexes if index_key[0] == sheet_name]:
+            self._key_indexes.pop(index_key, None)
+
     # ----------------------------------------------------------------------
     # 1) vlookup_update
     # ----------------------------------------------------------------------
+    def _build_key_index(self, sheet_name: str, key_col_letter: str) -> dict:
+        """key 열을 한 번 훑어서 {key: 행 번호} 인덱스를 만든다 (같은 key가 여러 행이면 첫 행)"""
+        key_col_number = col_letter_to_number(key_col_letter)
+        rows: Dict[str, int] = {}
+        last_row = 0
+        for row_idx, (value,) in enumerate(
+            self.load_sheet(sheet_name).iter_rows(min_col=key_col_number, max_col=key_col_number, values_only=True), start=1
+        ):
+            if value not in (None, ""):
+                rows.setdefault(format_cell_value(value), row_idx)
+                last_row = row_idx
+        index = {"rows": rows, "next_row": last_row + 1}
+        self._key_indexes[(sheet_name, key_col_letter)] = index
+        return index
+
+    def vlookup_update_many(self, sheet_name: str, key_col_letter: str, updates: Dict[str, list], start_col_letter: str = None) -> Dict[str, int]:
+        """
+        여러 key의 행을 vlookup 방식으로 한 번에 업데이트하고 한 번만 저장한다 (없는 key는 맨 아래에 추가).
+        key 열은 시트별 인덱스(key -> 행 번호)로 캐시해 둔다. (GoogleSheet.vlookup_update_many와 같은 규칙)
+
+        :param updates: {key: 해당 행에 쓸 값 리스트}
+        :param start_col_letter: 값을 쓰기 시작하는 열 (None이면 key 열부터)
+        :return: {key: 쓴 행 번호}
+        """
+        self._check_writable()
+        if not updates:
+            raise ValueError("Data list is empty. Update not performed.")
+        start_col_letter = (start_col_letter or key_col_letter).upper()
+        key_col_letter = key_col_letter.upper()
+        if not is_col_letter(start_col_letter) or not is_col_letter(key_col_letter):
+            raise ValueError(f"열에 알파벳이 아닌 문자 데이터가 입력되었습니다: {key_col_letter}, {start_col_letter}")
+
+        with self._lock:
+            self._move_sidecar(sheet_name)
+            sheet = self.load_sheet(sheet_name)
+            index = self._key_indexes.get((sheet_name, key_col_letter))
+            if index is None:
+                index = self._build_key_index(sheet_name, key_col_letter)
+
+            key_col_number = col_letter_to_number(key_col_letter)
+            start_col_number = col_letter_to_number(start_col_letter)
+            result = {}
+            for key, row_values in updates.items():
+                row_number = index["rows"].get(str(key))
+                if row_number is None:
+                    row_number = index["rows"][str(key)] = index["next_row"]
+                    index["next_row"] += 1
+                    sheet.cell(row=row_number, column=key_col_number).value = key
+                for offset, value in enumerate(row_values):
+                    sheet.cell(row=row_number, column=start_col_number + offset).value = value
+                result[str(key)] = row_number
+
+            # 새 행이 생겼을 수 있으므로 append 위치는 다시 구한다
+            self._forget_append_cursors(sheet_name)
+            self._commit()
+            return result
+
     def vlookup_update(self, sheet_name, key_value, key_col_letter, start_col_letter, data: list):
         """
         구글 시트에서 사용하던 vlookup_update 함수를
-        openpyxl 스타일로 변환한 예시.
+        openpyxl 스타일로 변환한 예시. (key 1개짜리 vlookup_update_many)
 
-        data: 리스트(2차배열 형태)
+        data: 한 행에 쓸 값 리스트 (GoogleSheet처럼 [[...]] 2차원으로 줘도 됨)
         key_value: 매칭할 키
         key_col_letter: 매칭 대상 컬럼 (ex: 'A')
         start_col_letter: 매칭된 행에 대해, 이 열부터 data를 쓴다 (ex: 'C')
         """
-
         if not data:
             raise ValueError("Data list is empty. Update not performed.")
         if not is_col_letter(start_col_letter):
             raise ValueError(f"start_col_letter가 알파벳이 아닙니다: {start_col_letter}")
-        if len(data) == 0:
-            raise ValueError(f"data 개수가 0입니다. 확인 부탁드립니다.")
-        if isinstance(data, list):
-            data = [[value] for value in data]
+        row_values = data[0] if isinstance(data[0], (list, tuple)) else data
+        self.vlookup_update_many(sheet_name, key_col_letter, {key_value: row_values}, start_col_letter)
 
-        sheet = self.load_sheet(sheet_name)
-        if sheet is None:
-            raise ValueError("시트를 찾지 못했습니다.")
-
-        # 1) key_col_letter 로드 → 해당 열을 pandas로 전체 로드
-        key_data = self.load_as_dataframe(sheet_name, key_col_letter, key_col_letter, key_col_letter)
-        # key_data: 한 컬럼만 있는 DF (ex: row0=header, row1~ = 값)
-        # key_value 와 매칭되는 row 인덱스를 찾는다
-
-        start_row_number = 0
-        for index, key in enumerate(key_data[key_data.columns[0]], start=1):
-            # enumerate(...) start=1 => DF의 첫 데이터가 1행이 됨
-            # but 주의: 실제 엑셀의 1행은 헤더인지 여부는 load_as_dataframe 구현에 따라 다름
-            if key == key_value:
-                start_row_number = index + 1  # +1은 header를 제외한 실제 데이터행
-                break
-        
-        if start_row_number == 0:
-            raise ValueError(f"키 {key_value}를 {key_col_letter}에서 찾지 못했습니다.")
-
-        # data 크기 파악
-        data_row_count = len(data)         # 행 수
-        data_column_count = len(data[0])   # 열 수
+    # ----------------------------------------------------------------------
+    # 2) update (여러 행을 아래쪽에 추가)
+    # ----------------------------------------------------------------------
+    def _append_rows(self, sheet_name: str, output_rows, start_col_letter: str) -> int:
+        """
+        start_col_letter 열의 마지막 값 아래에 행 묶음을 한 번에 쓴다 (저장은 하지 않음).
+        다음 빈 행 번호는 (시트, 시작 열)별로 기억해 두고, 처음 한 번만 열을 훑어서 찾는다.
 
-        # 2) 쓰기 시작할 열/행 계산
+        :return: 처음 쓴 행 번호
+        """
+        sheet = self.load_sheet(sheet_name)
+        start_col_letter = start_col_letter.upper()
         start_col_number = col_letter_to_number(start_col_letter)
-        end_col_number = start_col_number + data_column_count - 1
-        end_col_letter = col_number_to_letter(end_col_number)
-
-        # ex) A10~C10 (만약 data_row_count=1이면 10행 한 줄만)
-        end_row_number = start_row_number + data_row_count - 1
 
-        # 3) 실제 엑셀에 쓰기
-        # openpyxl에는 sheet.range(...)가 없으므로, 반복문으로 cell.value 할당
-        for i in range(data_row_count):
-            for j in range(data_column_count):
-                cell_row = start_row_number + j
-                cell_col = start_col_number + i
-                sheet.cell(row=cell_row, column=cell_col).value = data[i][j]
-
-        # 4) 저장
-        self.workbook.save(self.spreadsheet_path)
+        cursor_key = (sheet_name, start_col_letter)
+        next_row = self._append_cursors.get(cursor_key)
+        if next_row is None:
+            next_row = get_last_data_rows(sheet, [start_col_letter])[start_col_letter] + 1
+        first_row = next_row
+
+        for row_data in output_rows:
+            row_data = list(row_data)
+            if start_col_number == 1 and next_row == sheet.max_row + 1:
+                # 맨 아래에 A열부터 붙이는 경우는 셀을 하나씩 찾지 않고 행 단위로 붙인다
+                sheet.append(row_data)
+            else:
+                for offset, value in enumerate(row_data):
+                    sheet.cell(row=next_row, column=start_col_number + offset).value = value
+            for (index_sheet, key_col_letter), index in self._key_indexes.items():
+                key_offset = col_letter_to_number(key_col_letter) - start_col_number
+                if index_sheet == sheet_name and 0 <= key_offset < len(row_data) and row_data[key_offset] not in (None, ""):
+                    index["rows"].setdefault(format_cell_value(row_data[key_offset]), next_row)
+                    index["next_row"] = max(index["next_row"], next_row + 1)
+            next_row += 1
+
+        # 이번에 쓴 열에서 시작하는 다른 표의 다음 빈 행도 쓴 행 아래로 맞춘다
+        width = max((len(row_data) for row_data in output_rows), default=0)
+        for other_key, other_row in list(self._append_cursors.items()):
+            if other_key[0] == sheet_name and 0 <= col_letter_to_number(other_key[1]) - start_col_number < width:
+                self._append_cursors[other_key] = max(other_row, next_row)
+        self._append_cursors[cursor_key] = next_row
+        return first_row
 
-    # ----------------------------------------------------------------------
-    # 2) update (여러 행을 아래쪽에 추가)
-    # ----------------------------------------------------------------------
     def update(self, sheet_name, output_rows, start_col_letter):
         """
         - 구글 시트 코드에서는 start_col_letter 열의 끝(빈칸)부터 이어서 쓰는 로직.
-        - openpyxl에서는 '마지막으로 값이 들어있는 행'을 찾은 뒤 그 다음 행부터 기록.
+        - openpyxl에서는 '마지막으로 값이 들어있는 행'을 찾은 뒤 그 다음 행부터 한 번에 기록.
+        - sidecar_sheets에 있는 시트에 A열부터 붙이면 엑셀 파일 대신 CSV 사이드카 파일 끝에만 쓴다.
         """
-
+        self._check_writable()
         if not output_rows:
             raise ValueError(f"{sheet_name}에 출력할 데이터가 없습니다.")
         if not is_col_letter(start_col_letter):
             raise ValueError(f"start_col_letter가 알파벳이 아닙니다: {start_col_letter}")
 
-        sheet = self.load_sheet(sheet_name)
-        if sheet is None:
-            raise ValueError("시트를 찾지 못했습니다.")
+        with self._lock:
+            if sheet_name in self.sidecar_sheets and start_col_letter.upper() == "A":
+                self._append_sidecar(sheet_name, output_rows)
+                return
 
-        start_col_number = col_letter_to_number(start_col_letter)
-        data_row_count = len(output_rows)
-        data_column_count = len(output_rows[0])
-
-        # 1) 'start_col_letter' 열에서 마지막으로 값이 들어있는 행 찾기
-        #    구글 시트의 col_values().length와 비슷한 로직
-        last_nonempty_row = 0
-        for row_idx in range(1, sheet.max_row + 1):
-            val = sheet.cell(row=row_idx, column=start_col_number).value
-            if val is not None and val != "":
-                last_nonempty_row = row_idx
-        
-        # 마지막 값이 들어있는 행 아래로 쓰면 되므로
-        start_row_number = last_nonempty_row + 1
-
-        end_row_number = start_row_number + data_row_count - 1
-        end_col_number = start_col_number + data_column_count - 1
-
-        # 2) 필요한 경우, sheet.insert_rows()로 행을 확장 (구글 시트의 add_rows와 유사)
-        #    만약 end_row_number > sheet.max_row, 모자란 만큼 insert
-        if end_row_number > sheet.max_row:
-            extra_rows = end_row_number - sheet.max_row
-            # openpyxl은 특정 위치에 행을 삽입: sheet.insert_rows(idx, amount)
-            # 여기서는 sheet.max_row+1 위치(마지막)부터 extra_rows만큼 삽입
-            sheet.insert_rows(sheet.max_row + 1, amount=extra_rows)
-
-        # 3) 실제 쓰기
-        for i, row_data in enumerate(output_rows):
-            for j, value in enumerate(row_data):
-                cell_row = start_row_number + i
-                cell_col = start_col_number + j
-                sheet.cell(row=cell_row, column=cell_col).value = value
-
-        # 4) 저장
-        self.workbook.save(self.spreadsheet_path)
+            self._append_rows(sheet_name, output_rows, start_col_letter)
+            self._commit()
 
     # ----------------------------------------------------------------------
     # 3) update_oneline (1줄만 추가)
@@ -429,40 +589,86 @@ class ExcelSheet:
         oneline_data: 1차원 리스트(한 행)
         - 구글 시트 원본은 'start_col_letter 열'의 마지막 빈칸 찾아서 그 행에 씀
         """
-
         if not oneline_data:
             raise ValueError("oneline_data is empty. Update not performed.")
-        if not is_col_letter(start_col_letter):
-            raise ValueError(f"start_col_letter가 알파벳이 아닙니다: {start_col_letter}")
+        self.update(sheet_name, [oneline_data], start_col_letter)
 
-        sheet = self.load_sheet(sheet_name)
-        if sheet is None:
-            raise ValueError("시트를 찾지 못했습니다.")
+    # ----------------------------------------------------------------------
+    # 4) CSV 사이드카 (하루치 위치 기록처럼 계속 붙이는 시트용)
+    # ----------------------------------------------------------------------
+    def get_sidecar_path(self, sheet_name: str) -> str:
+        """시트별 사이드카 CSV 경로 (엑셀 파일 옆, 예: 기록.xlsx -> 기록.오토바이DB_누적.csv)"""
+        safe_name = re.sub(r'[\\/:*?"<>|\s]+', "_", sheet_name).strip("_")
+        return str(Path(self.spreadsheet_path).with_suffix("")) + f".{safe_name}.csv"
+
+    def _append_sidecar(self, sheet_name: str, output_rows) -> None:
+        """엑셀 파일을 다시 쓰지 않고 사이드카 CSV 끝에 행을 붙인다 (붙인 행 수만큼만 비용이 듦)"""
+        with open(self.get_sidecar_path(sheet_name), "a", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerows([format_cell_value(value) for value in row] for row in output_rows)
+
+    def _iter_sidecar_rows(self, sheet_name: str, start_col_letter: str, end_col_letter: str) -> Iterator[list]:
+        """사이드카 CSV에서 아직 시트로 옮기지 않은 행만 읽는다"""
+        sidecar_path = self.get_sidecar_path(sheet_name)
+        if not os.path.exists(sidecar_path):
+            return
+        start_index = col_letter_to_number(start_col_letter) - 1
+        end_index = col_letter_to_number(end_col_letter)
+        with open(sidecar_path, "rb") as f:
+            f.seek(self._moved_sidecars.get(sidecar_path, 0))
+            for row in csv.reader(io.TextIOWrapper(f, encoding="utf-8", newline="")):
+                yield row[start_index:end_index]
+
+    def _move_sidecar(self, sheet_name: str) -> int:
+        """
+        사이드카 CSV에서 아직 옮기지 않은 행을 시트 맨 아래로 옮긴다.
+        CSV는 다음 save()가 끝난 뒤에 옮긴 부분만 잘라낸다 (옮긴 뒤에 붙인 행은 CSV에 남음)
+        """
+        sidecar_path = self.get_sidecar_path(sheet_name)
+        if not os.path.exists(sidecar_path):
+            return 0
+        moved_bytes = self._moved_sidecars.get(sidecar_path, 0)
+        with open(sidecar_path, "rb") as f:
+            f.seek(moved_bytes)
+            data = f.read()
+        if not data:
+            return 0
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))
+        if rows:
+            self._append_rows(sheet_name, rows, "A")
+        self._moved_sidecars[sidecar_path] = moved_bytes + len(data)
+        self._dirty = True
+        return len(rows)
+
+    @staticmethod
+    def _trim_sidecar(sidecar_path: str, moved_bytes: int) -> None:
+        """시트로 옮겨서 저장한 앞부분(moved_bytes)을 사이드카 CSV에서 뺀다 (옮긴 행만 있으면 파일을 지움)"""
+        if not os.path.exists(sidecar_path):
+            return
+        with open(sidecar_path, "rb") as f:
+            f.seek(moved_bytes)
+            remaining = f.read()
+        if not remaining:
+            os.remove(sidecar_path)
+            return
+        temp_path = sidecar_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(remaining)
+        os.replace(temp_path, sidecar_path)
+
+    def flush_sidecar(self, sheet_name: str = None) -> int:
+        """
+        사이드카 CSV에 쌓인 행을 엑셀 시트 맨 아래로 한 번에 옮기고 저장한다.
+        (하루에 한 번 등 원하는 때에 호출, 엑셀 파일은 한 번만 다시 씀)
 
-        start_col_number = col_letter_to_number(start_col_letter)
-        data_row_count = 1  # 한 줄
-        data_column_count = len(oneline_data)
-
-        # 1) 마지막으로 값이 들어있는 행 찾기
-        last_nonempty_row = 0
-        for row_idx in range(1, sheet.max_row + 1):
-            val = sheet.cell(row=row_idx, column=start_col_number).value
-            if val is not None and val != "":
-                last_nonempty_row = row_idx
-        
-        start_row_number = last_nonempty_row + 1
-        end_row_number = start_row_number
-        end_col_number = start_col_number + data_column_count - 1
-
-        # 2) 필요한 경우 insert_rows
-        if end_row_number > sheet.max_row:
-            extra_rows = end_row_number - sheet.max_row
-            sheet.insert_rows(sheet.max_row + 1, amount=extra_rows)
-
-        # 3) 실제 쓰기
-        for j, value in enumerate(oneline_data):
-            cell_col = start_col_number + j
-            sheet.cell(row=start_row_number, column=cell_col).value = value
-
-        # 4) 저장
-        self.workbook.save(self.spreadsheet_path)
+        :param sheet_name: None이면 sidecar_sheets의 모든 시트
+        :return: 옮긴 행 수
+        """
+        self._check_writable()
+        sheet_names = [sheet_name] if sheet_name is not None else list(self.sidecar_sheets)
+        with self._lock:
+            moved = sum(self._move_sidecar(name) for name in sheet_names)
+            if self._moved_sidecars:
+                self.save()
+                print(f"{self.spreadsheet_name} - 사이드카 {moved}행을 엑셀 파일로 옮겼습니다.")
+        return moved
@@ -0,0 +1,169 @@
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+DEVICE_COL = "장비ID"
+TIME_COL = "시간"
+LAT_COL = "위도"
+LNG_COL = "경도"
+
+# 없는 장비ID를 조회할 때 쓰는 빈 행 번호 배열
+EMPTY_POSITIONS = np.array([], dtype=np.intp)
+
+
+class RecordView(Mapping):
+    """
+    FleetSnapshot의 한 행을 dict처럼 읽는 가벼운 뷰.
+    값을 복사하지 않고 읽을 때마다 컬럼 배열에서 바로 꺼낸다.
+    """
+
+    __slots__ = ("_arrays", "position")
+
+    def __init__(self, arrays: dict, position: int):
+        self._arrays = arrays
+        self.position = position
+
+    def __getitem__(self, key: str) -> Any:
+        return self._arrays[key][self.position]
+
+    def __iter__(self):
+        return iter(self._arrays)
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+
+class FleetSnapshot:
+    """
+    오토바이DB 시트 1개를 컬럼 형태(DataFrame)로 한 번만 들고 있는 읽기 전용 저장소.
+
+    - 행마다 dict를 만들지 않고, 표에는 RecordView로, 지도에는 to_json()으로 넘긴다.
+    - 생성 후에는 수정하지 않는다. 새 데이터가 오면 새 FleetSnapshot을 만든다.
+    - 장비별 조회용 인덱스(장비ID -> 시간 역순으로 정렬한 행 번호 배열)는
+      처음 조회할 때 스냅샷마다 한 번만 만든다.
+    """
+
+    def __init__(self, frame: DataFrame, version: int = 0):
+        """
+        :param frame: 스키마(TRACKER_SCHEMA)로 타입 변환된 시트 DataFrame
+        :param version: 데이터 버전 (새로 읽을 때마다 증가)
+        """
+        self.frame = frame.reset_index(drop=True)
+        self.version = version
+        # 컬럼별 배열 (RecordView가 행 단위로 꺼내 읽음)
+        self._arrays = {col: self.frame[col].array for col in self.frame.columns}
+
+        # 장비별 인덱스 (처음 조회할 때 _build_partitions()에서 생성)
+        self._partition_lock = threading.Lock()
+        self._partitions: Optional[Dict[str, np.ndarray]] = None
+        self._device_ids: Optional[List[str]] = None
+        self._device_snapshots: Dict[str, "FleetSnapshot"] = {}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.frame) == 0
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.frame.columns)
+
+    # -----------------------
+    # 행 읽기
+    # -----------------------
+    def record(self, position: int) -> RecordView:
+        if position < 0:
+            position += len(self.frame)
+        if not 0 <= position < len(self.frame):
+            raise IndexError(f"행 번호가 범위를 벗어났습니다: {position}")
+        return RecordView(self._arrays, position)
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[RecordView]:
+        """start ~ stop 행을 RecordView로 하나씩 돌려준다"""
+        stop = len(self.frame) if stop is None else min(stop, len(self.frame))
+        for position in range(start, stop):
+            yield RecordView(self._arrays, position)
+
+    def first_positioned_record(self) -> Optional[RecordView]:
+        """위도/경도가 비어있지 않고 0도 아닌 첫 행 (없으면 None)"""
+        if self.empty:
+            return None
+        lat = self.frame[LAT_COL]
+        lng = self.frame[LNG_COL]
+        mask = (lat.notna() & lng.notna() & (lat != 0) & (lng != 0)).to_numpy()
+        if not mask.any():
+            return None
+        return RecordView(self._arrays, int(mask.argmax()))
+
+    # -----------------------
+    # 장비별 조회
+    # -----------------------
+    def _build_partitions(self) -> None:
+        """
+        장비ID별로 self.frame 안의 행 번호 배열을 시간 역순으로 기록한다 (정렬된 DataFrame 복사본은 만들지 않음).
+        같은 시간끼리는 원래 행 순서를 유지하고, 시간이 빈 행은 맨 뒤로 보낸다.
+        """
+        with self._partition_lock:
+            if self._partitions is not None:
+                return
+
+            frame = self.frame
+            if DEVICE_COL not in frame.columns or frame.empty:
+                self._partitions = {}
+                self._device_ids = []
+                return
+
+            # 장비ID가 빈 행은 NaN으로 남겨서 groupby에서 빠지게 한다
+            device_keys = frame[DEVICE_COL].astype(str).where(frame[DEVICE_COL].notna())
+            indices = device_keys.groupby(device_keys, sort=True).indices
+            if TIME_COL in frame.columns:
+                # 시간 역순 순위 (같은 시간은 나온 순서대로, 빈 시간은 맨 뒤)
+                time_rank = frame[TIME_COL].rank(method="first", ascending=False, na_option="bottom").to_numpy()
+                indices = {key: positions[np.argsort(time_rank[positions])] for key, positions in indices.items()}
+
+            self._partitions = indices
+            self._device_ids = list(indices)
+
+    def device_ids(self) -> List[str]:
+        """장비ID 목록 (정렬됨, 스냅샷마다 한 번만 계산)"""
+        if self._partitions is None:
+            self._build_partitions()
+        return self._device_ids
+
+    def select_device(self, device_id: str) -> "FleetSnapshot":
+        """장비 1대의 데이터를 시간 역순으로 정렬한 FleetSnapshot (해당 장비 행 수만큼만 비용이 든다)"""
+        if self._partitions is None:
+            self._build_partitions()
+
+        device_snapshot = self._device_snapshots.get(device_id)
+        if device_snapshot is None:
+            positions = self._partitions.get(str(device_id), EMPTY_POSITIONS)
+            device_snapshot = FleetSnapshot(self.frame.take(positions), self.version)
+            self._device_snapshots[device_id] = device_snapshot
+        return device_snapshot
+
+    # -----------------------
+    # 직렬화
+    # -----------------------
+    def to_json(self, columns: Optional[List[str]] = None) -> str:
+        """
+        지도(JavaScript)에 넘길 JSON 배열 문자열.
+        pandas의 to_json을 한 번 호출해서 만든다 (행 단위 파이썬 반복 없음)
+
+        :param columns: 넣을 컬럼 목록 (None이면 전체)
+        """
+        frame = self.frame if columns is None else self.frame[columns]
+        return frame.to_json(orient="records", force_ascii=False, date_format="iso")
+
+    @classmethod
+    def from_frame(cls, frame: DataFrame, previous: Optional["FleetSnapshot"] = None) -> "FleetSnapshot":
+        """이전 스냅샷의 버전 + 1로 새 스냅샷을 만든다"""
+        version = previous.version + 1 if previous is not None else 1
+        return cls(frame, version)
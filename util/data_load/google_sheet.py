@@ -3,6 +3,12 @@ import string
 import re
 import time
 import json
+import random
+import functools
+import contextlib
+import hashlib
+import io
+import threading
 import gspread
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -12,17 +18,32 @@ import pandas as pd
 import streamlit as st
 from google.auth.exceptions import TransportError
 from gspread.exceptions import APIError
+from gspread.exceptions import WorksheetNotFound
 from requests.exceptions import HTTPError
 from requests.exceptions import ConnectionError
+from requests.exceptions import Timeout
 from googleapiclient.errors import HttpError
 from urllib3.exceptions import ReadTimeoutError
 from urllib3.exceptions import ProtocolError
 from google.oauth2 import service_account
 from gspread.utils import ValueInputOption
+from gspread.utils import InsertDataOption
+from gspread.utils import absolute_range_name
+from gspread.utils import ValueRenderOption
+from gspread.utils import DateTimeOption
+from gspread.urls import DRIVE_FILES_API_V3_URL
 
 import util.error_log.errors as errors
 import util.error_log.logger as loggers
 import util.os.path as path_util
+from util.data_load.schema import apply_schema
+from util.data_load.schema import concat_typed
+from util.data_load.schema import to_datetime_column
+from util.data_load.schema import SEOUL_TZ
+from util.data_load.sheet_mirror import SheetMirror
+from util.data_load.store import ConditionalLoads
+from util.data_load.store import parse_fetched_rows
+from util.data_load.store import rows_to_dataframe
 
 
 logging.basicConfig(level=logging.INFO)
@@ -77,31 +98,453 @@ class MaxRetryError(Exception):
     pass
 
 
-def exception_handler(method):
-    def wrapper(*args, **kwargs):
-        count = 0
-        while count < 10:
+def is_worksheet_missing_error(error: Exception) -> bool:
+    """워크시트 이름이 바뀌었거나 삭제되어서 범위를 찾지 못한 API 에러인지 확인"""
+    return isinstance(error, APIError) and "Unable to parse range" in str(error)
+
+
+class CircuitOpenError(MaxRetryError):
+    """연속 실패로 회로 차단기가 열려 있어서 호출하지 않고 바로 실패할 때 발생하는 예외"""
+    pass
+
+
+# 재시도 대상 네트워크/서버 에러
+RETRYABLE_ERRORS = (APIError, HTTPError, HttpError, ReadTimeoutError, ProtocolError, ConnectionError, TransportError, Timeout, RuntimeError)
+# 재시도해도 되는 HTTP 상태 코드 (그 외 4xx는 요청 자체가 잘못된 것이라 바로 실패)
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_quota_error(error: Exception) -> bool:
+    """429 / 할당량 초과 에러인지 확인"""
+    if get_status_code(error) == 429:
+        return True
+    message = str(error)
+    return "RATE_LIMIT_EXCEEDED" in message or "Quota exceeded" in message
+
+
+class TokenBucket:
+    """
+    구글 시트 API 호출 속도를 맞추는 토큰 버킷 (모든 세션 공유)
+
+    - 호출할 때마다 토큰 1개를 쓰고, 토큰은 rate_per_minute 속도로 다시 찬다.
+    - 429(할당량 초과)를 받으면 penalize()로 버킷을 비우고 잠시 막아서
+      다른 세션들도 같이 속도를 줄이게 한다.
+    """
+
+    def __init__(self, rate_per_minute: float = 60.0, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, deadline: float) -> float:
+        """
+        토큰 1개를 가져온다. 토큰이 없으면 생길 때까지 기다린다.
+
+        :param deadline: time.monotonic() 기준 마감 시각
+        :return: 기다린 시간(초)
+        :raises MaxRetryError: 마감 시각 안에 토큰을 못 받는 경우
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            if now + wait > deadline:
+                raise MaxRetryError(f"구글 시트 API 호출 한도 대기 중 마감 시간을 초과했습니다 ({wait:.1f}초 더 필요)")
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds: float) -> None:
+        """할당량 초과 응답을 받았을 때 버킷을 비우고 seconds 동안 모든 호출을 막는다"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = 0
+            self._updated_at = now
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+
+class RetryPolicy:
+    """
+    구글 시트 호출 재시도 정책
+
+    - 지수 백오프 + 지터(full jitter)
+    - 429/할당량 초과는 공유 TokenBucket을 비워서 모든 세션이 같이 쉰다.
+    - 가장 바깥 호출 1번에 마감 시간(deadline)과 재시도 횟수(max_retries)를 정하고,
+      안쪽에서 중첩 호출되는 메서드는 재시도하지 않고 바깥 호출에 에러를 넘긴다.
+      (load_as_dataframe -> load_as_fetched_data -> load_sheet 처럼 중첩돼도 시도 횟수가 곱해지지 않음)
+    - 소켓 타임아웃(timeout)은 GoogleSheet 생성 시 gspread client에 적용한다.
+    - 연속 실패가 breaker_threshold번 이상이면 breaker_cooldown초 동안 바로 실패(회로 차단)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 16.0,
+        deadline: float = 45.0,
+        timeout: tuple = (5.0, 20.0),
+        quota_delay: float = 10.0,
+        breaker_threshold: int = 8,
+        breaker_cooldown: float = 60.0,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        """
+        :param max_retries: 바깥 호출 1번에 허용하는 총 재시도 횟수
+        :param base_delay: 첫 재시도 백오프 기준 시간(초)
+        :param max_delay: 백오프 최대 시간(초)
+        :param deadline: 바깥 호출 1번의 마감 시간(초), 재시도 대기 포함
+        :param timeout: 요청별 소켓 타임아웃 (연결, 읽기) 초
+        :param quota_delay: 429를 받았을 때 모든 세션이 쉬는 최소 시간(초)
+        :param breaker_threshold: 회로 차단기를 여는 연속 실패 횟수
+        :param breaker_cooldown: 회로 차단기가 열려 있는 시간(초)
+        :param bucket: 호출 속도를 맞출 공유 TokenBucket
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.timeout = timeout
+        self.quota_delay = quota_delay
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.bucket = bucket if bucket is not None else TokenBucket()
+
+        # 카운터
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.quota_errors = 0
+        self.sleep_seconds = 0.0
+
+        # 회로 차단기 상태
+        self.breaker_state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False   # HALF_OPEN 시험 호출이 진행 중인지
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # -----------------------
+    # 회로 차단기
+    # -----------------------
+    def _before_call(self) -> bool:
+        """
+        :return: 이번 호출이 HALF_OPEN 시험 호출이면 True
+        :raises CircuitOpenError: 회로가 열려 있거나 다른 시험 호출이 진행 중인 경우
+        """
+        with self._lock:
+            if self.breaker_state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.breaker_cooldown:
+                    raise CircuitOpenError("구글 시트 연속 실패로 잠시 호출을 중단했습니다 (회로 차단)")
+                # 쿨다운이 끝나면 한 번 시험 호출을 허용
+                self.breaker_state = self.HALF_OPEN
+            if self.breaker_state == self.HALF_OPEN:
+                # 시험 호출은 1개만 - 결과가 나올 때까지 나머지 호출은 바로 실패
+                if self._probe_in_flight:
+                    raise CircuitOpenError("구글 시트 회로 차단 시험 호출 중입니다 (회로 차단)")
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def _end_probe(self, is_probe: bool) -> None:
+        """시험 호출이 성공/실패로 기록되지 않고 끝났을 때 (재시도하지 않는 에러) 다음 시험 호출을 허용"""
+        if not is_probe:
+            return
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self.breaker_state = self.CLOSED
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.breaker_state == self.HALF_OPEN or self._consecutive_failures >= self.breaker_threshold:
+                if self.breaker_state != self.OPEN:
+                    logging.error(f"구글 시트 회로 차단 - 연속 실패 {self._consecutive_failures}회")
+                self.breaker_state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    # -----------------------
+    # 재시도
+    # -----------------------
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간 (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def is_retryable(self, error: Exception) -> bool:
+        status_code = get_status_code(error)
+        if status_code is not None and status_code not in RETRYABLE_STATUS_CODES:
+            # 시트 이름이 바뀐 경우만 메타데이터를 갱신하고 한 번 더 시도
+            return is_worksheet_missing_error(error)
+        return isinstance(error, RETRYABLE_ERRORS)
+
+    @contextlib.contextmanager
+    def detached(self):
+        """
+        안쪽 호출을 지금 스레드의 바깥 재시도 호출과 분리한다.
+        다른 호출자의 작업을 모아서 대신 보낼 때, 그 요청이 자기 마감 시간 / 재시도 횟수로 실행되도록 쓴다.
+        """
+        active = getattr(self._local, "active", False)
+        self._local.active = False
+        try:
+            yield
+        finally:
+            self._local.active = active
+
+    def __call__(self, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            # 이미 다른 재시도 호출 안에서 실행 중이면 그대로 실행 (재시도는 바깥 호출이 담당)
+            if getattr(self._local, "active", False):
+                return method(*args, **kwargs)
+
+            self._local.active = True
             try:
-                return method(*args, **kwargs)  # 원래 메서드 실행
-            except (APIError, HTTPError, HttpError, ReadTimeoutError, ProtocolError, ConnectionError, TransportError, RuntimeError) as e:
-                count += 1
-                second = 5 * count                
-                print(f"{e} - 네트워크 오류 발생. {second}초 후 재시작. 재시도: {count}/10")
-                time.sleep(second)              
+                return self._call_with_retry(method, args, kwargs)
+            finally:
+                self._local.active = False
+        return wrapper
+
+    def _call_with_retry(self, method, args, kwargs):
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            is_probe = self._before_call()
+            try:
+                waited = self.bucket.acquire(deadline)
+                if waited:
+                    self._add_sleep(waited)
+                result = method(*args, **kwargs)  # 원래 메서드 실행
+            except Exception as e:
+                if not self.is_retryable(e):
+                    self._end_probe(is_probe)
+                    raise
+                self._record_failure()
+
+                # 캐시해둔 워크시트 정보가 오래된 경우 - 메타데이터를 새로 받아서 재시도
+                if is_worksheet_missing_error(e) and args and hasattr(args[0], "refresh_metadata"):
+                    args[0].refresh_metadata()
+
+                delay = self.backoff(attempt)
+                if is_quota_error(e):
+                    with self._lock:
+                        self.quota_errors += 1
+                    delay = max(delay, self.quota_delay)
+                    self.bucket.penalize(delay)
+
+                attempt += 1
+                remaining = deadline - time.monotonic()
+                if attempt > self.max_retries or delay > remaining:
+                    with self._lock:
+                        self.failures += 1
+                    raise MaxRetryError(
+                        f"GoogleSheet 클래스에서 시트 데이터에 접근할 수 없습니다 - 재시도 {attempt - 1}회, 마지막 에러: {e}"
+                    ) from e
+
+                with self._lock:
+                    self.retries += 1
+                print(f"{e} - 네트워크 오류 발생. {delay:.1f}초 후 재시작. 재시도: {attempt}/{self.max_retries}")
+                time.sleep(delay)
+                self._add_sleep(delay)
                 continue
-            print("googlesheet 에러 루프 - 끝")
-        raise MaxRetryError(f"GoogleSheet 클래스에서 시트 데이터에 접근할 수 없습니다 - 10번 시도 초과")
-    return wrapper
 
+            self._record_success()
+            return result
+
+    def _add_sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleep_seconds += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "quota_errors": self.quota_errors,
+                "sleep_seconds": round(self.sleep_seconds, 3),
+                "breaker_state": self.breaker_state,
+                "consecutive_failures": self._consecutive_failures,
+            }
+
+
+# 모든 GoogleSheet 메서드가 공유하는 재시도 정책
+RETRY_POLICY = RetryPolicy()
+
+
+class SheetCache:
+    """
+    프로세스 전체에서 공유하는 시트 읽기 캐시 (read-through + TTL)
+
+    - 키: (스프레드시트, 워크시트, A1 범위, 키 컬럼)
+    - 같은 키를 여러 세션이 동시에 요청하면 한 번만 가져오고 나머지는 그 결과를 기다린다.
+    - 쓰기 작업이 일어난 시트는 invalidate()로 바로 무효화한다.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        """
+        :param ttl: 캐시 유지 시간(초)
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[tuple, tuple] = {}
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(spreadsheet_name: str, sheet_name: str, cell_range: str, key_cols=(), variant: str = "") -> tuple:
+        """
+        :param variant: 같은 범위를 다른 방식으로 읽는 경우 구분용 (예: 스키마 타입 변환 여부)
+        """
+        key_cols = tuple(letter.upper() for letter in key_cols)
+        return (spreadsheet_name, sheet_name, cell_range.upper(), key_cols, variant)
+
+    def _get_fresh(self, key: tuple):
+        """만료되지 않은 캐시 값을 리턴 (없으면 None) - self._lock 안에서 호출"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            return None
+        return value
+
+    def get_or_load(self, key: tuple, loader, ttl: Optional[float] = None):
+        """
+        캐시에 값이 있으면 리턴하고, 없으면 loader()로 가져와서 저장 후 리턴한다.
+
+        :param key: make_key()로 만든 캐시 키
+        :param loader: 캐시 미스일 때 호출할 함수 (인자 없음)
+        :param ttl: 이번 키에만 적용할 유지 시간(초), None이면 self.ttl
+        """
+        with self._lock:
+            value = self._get_fresh(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # 같은 키는 한 세션만 가져오고, 나머지는 기다렸다가 결과를 같이 쓴다.
+        with key_lock:
+            with self._lock:
+                value = self._get_fresh(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+                self.misses += 1
+
+            value = loader()
+            self.put(key, value, ttl)
+            return value
+
+    def get(self, key: tuple):
+        """만료되지 않은 캐시 값을 리턴한다 (없으면 None, 가져오지는 않음)"""
+        with self._lock:
+            value = self._get_fresh(key)
+            if value is not None:
+                self.hits += 1
+            return value
+
+    def put(self, key: tuple, value, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, spreadsheet_name: Optional[str] = None, sheet_name: Optional[str] = None) -> int:
+        """
+        조건에 맞는 캐시를 지운다. 인자가 없으면 전체 삭제.
+
+        :return: 삭제된 항목 수
+        """
+        with self._lock:
+            targets = [
+                key for key in self._entries
+                if (spreadsheet_name is None or key[0] == spreadsheet_name)
+                and (sheet_name is None or key[1] == sheet_name)
+            ]
+            for key in targets:
+                del self._entries[key]
+        return len(targets)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "ttl": self.ttl,
+            }
+
+
+# 모든 GoogleSheet 인스턴스(= 모든 Streamlit 세션)가 공유하는 캐시
+SHEET_CACHE = SheetCache(ttl=30.0)
+
+# 스키마로 타입을 변환할 범위는 숫자를 표시 형식 없이 원래 값으로 읽는다 (날짜/시간은 표시 형식 문자열)
+TYPED_RENDER_OPTIONS = {
+    "value_render_option": ValueRenderOption.unformatted,
+    "date_time_render_option": DateTimeOption.formatted_string,
+}
+TYPED_RENDER_PARAMS = {
+    "valueRenderOption": ValueRenderOption.unformatted.value,
+    "dateTimeRenderOption": DateTimeOption.formatted_string.value,
+}
+
+# 스프레드시트 이름 -> key(ID)
+# 한 번 이름으로 연 스프레드시트는 다음부터 Drive 검색 없이 key로 바로 연다.
+SPREADSHEET_KEYS: Dict[str, str] = {}
+
+# 서버에서 조건을 걸어 행을 골라 오는 Visualization(gviz) 쿼리 주소
+# (테스트할 때는 GoogleSheet(gviz_base_url=...)로 로컬 HTTP 서버를 가리키게 한다)
+GVIZ_BASE_URL = "https://docs.google.com/spreadsheets/d/{spreadsheet_id}/gviz/tq"
 
 
 class GoogleSheet:
-    def __init__(self, spreadsheet_name: str):
+    # query_rows()의 조건 / 정렬 / offset, limit을 시트 서버(gviz)에서 처리하는지 (TabularStore.SERVER_QUERY)
+    SERVER_QUERY = True
+
+    # vlookup_update_many()의 key 인덱스를 다시 읽지 않고 쓰는 최대 시간(초) - 다른 곳에서 바뀐 행 번호 대비
+    KEY_INDEX_TTL = 300.0
+
+    def __init__(self, spreadsheet_name: str, spreadsheet_key: Optional[str] = None, mirror_dir: Optional[str] = None, mirror_sheets=(), gviz_base_url: str = GVIZ_BASE_URL):
         """
         구글 시트 인증 및 스프레드시트 선택 초기화
 
         :param credentials_path: 구글 서비스 계정 JSON 파일 경로
         :param spreadsheet_name: 액세스할 스프레드시트 이름
+        :param spreadsheet_key: 스프레드시트 key(URL의 /d/<key>/ 부분), 있으면 Drive 검색 없이 바로 연다
+        :param mirror_dir: 읽어온 데이터를 로컬에 저장해 둘 폴더 (None이면 미러 사용 안 함)
+        :param mirror_sheets: 로컬 미러에 저장할 시트 이름 목록 (비밀번호 등이 있는 시트는 넣지 않는다)
+        :param gviz_base_url: query_rows()에서 쓸 gviz 쿼리 주소 ({spreadsheet_id} 자리에 스프레드시트 id가 들어감)
         """
 
         SCOPE = [
@@ -128,28 +571,105 @@ class GoogleSheet:
             raise ValueError("json 자격증명 로드 과정에서 문제가 발생하여 None이 들어왔습니다")
                 
         self.client = gspread.authorize(self.credentials)
-        self.spreadsheet = self.client.open(spreadsheet_name)
+        # 요청별 소켓 타임아웃 (연결, 읽기) - 응답 없는 요청 하나가 세션을 오래 붙잡지 않도록
+        self.client.set_timeout(RETRY_POLICY.timeout)
+        self.spreadsheet_name = spreadsheet_name
+        spreadsheet_key = spreadsheet_key or SPREADSHEET_KEYS.get(spreadsheet_name)
+        if spreadsheet_key:
+            self.spreadsheet = self.client.open_by_key(spreadsheet_key)
+        else:
+            self.spreadsheet = self.client.open(spreadsheet_name)
+        SPREADSHEET_KEYS[spreadsheet_name] = self.spreadsheet.id
+
+        # 워크시트 메타데이터 캐시 (제목 -> properties / Worksheet 객체)
+        self._sheet_properties: Dict[str, dict] = {}
+        self._worksheets: Dict[str, gspread.Worksheet] = {}
+        self._metadata_lock = threading.Lock()
+        self.refresh_metadata()
+
+        # load_as_dataframe_incremental() 에서 사용하는 워크시트별 증분 로드 상태
+        self._tail_states: Dict[tuple, dict] = {}
+        self._tail_lock = threading.Lock()
+
+        # append_values() 에서 사용하는 (워크시트, 시작 열)별 다음 빈 행 번호와 대기 중인 append 요청
+        self._append_cursors: Dict[tuple, int] = {}
+        self._append_pending: Dict[tuple, List[dict]] = {}
+        self._append_lock = threading.Lock()
+        self._append_flush_lock = threading.Lock()
+
+        # vlookup_update_many() 에서 사용하는 (워크시트, key 열)별 key -> 행 번호 인덱스
+        # 잠금은 인덱스 dict를 읽고 바꿀 때만 잡는다 (시트 요청은 잠금 밖에서).
+        # 워크시트별 버전은 인덱스를 버릴 때마다 올라가서, 잠금 밖에서 읽은 key 열이 그 사이 낡았는지 확인하는 데 쓴다
+        self._key_indexes: Dict[tuple, dict] = {}
+        self._key_index_versions: Dict[str, int] = {}
+        # 행 번호를 예약했지만 아직 시트에 쓰지 않은 새 key (key 열을 다시 읽은 인덱스에 합친다)
+        self._key_reservations: Dict[tuple, Dict[str, int]] = {}
+        self._key_index_lock = threading.Lock()
+        self._grid_lock = threading.Lock()
+
+        # 로컬 미러 (재시작할 때 시트를 다시 받기 전에 바로 보여줄 데이터)
+        self.mirror = SheetMirror(mirror_dir) if mirror_dir else None
+        self.mirror_sheets = set(mirror_sheets)
+        self._mirror_save_lock = threading.Lock()
+
+        # load_as_dataframe_conditional() / load_many_conditional() 의 범위별 마지막 변경 신호 / 데이터 버전
+        self._conditional_loads = ConditionalLoads(self)
+
+        self.gviz_base_url = gviz_base_url
 
         logging.info("Success 스프레드시트 오픈(완료)")
     
     
-    @exception_handler    
+    def refresh_metadata(self) -> None:
+        """
+        스프레드시트 메타데이터를 한 번 받아서
+        워크시트 제목 -> sheetId / gridProperties 맵과 Worksheet 객체를 새로 만든다.
+        """
+        metadata = self.spreadsheet.fetch_sheet_metadata()
+        with self._metadata_lock:
+            self._sheet_properties = {
+                sheet["properties"]["title"]: sheet["properties"]
+                for sheet in metadata.get("sheets", [])
+            }
+            # properties dict를 Worksheet와 같이 쓰기 때문에 add_rows 등으로 바뀐 행 수가 그대로 반영된다.
+            self._worksheets = {
+                title: gspread.Worksheet(self.spreadsheet, properties, self.spreadsheet.id, self.spreadsheet.client)
+                for title, properties in self._sheet_properties.items()
+            }
+        print(f"구글 시트 메타데이터 로드 - 워크시트 {len(self._sheet_properties)}개")
+
+    def get_sheet_properties(self, sheet_name: str) -> dict:
+        """
+        캐시된 워크시트 properties (sheetId, index, gridProperties 등)
+
+        :raises gspread.exceptions.WorksheetNotFound: 메타데이터를 새로 받아도 없는 경우
+        """
+        self.load_sheet(sheet_name)
+        return self._sheet_properties[sheet_name]
+
+    @RETRY_POLICY    
     def load_sheet(self, sheet_name: str) -> gspread.Worksheet:
         """
         특정 워크시트를 가져옵니다.
+        캐시된 Worksheet 객체를 돌려주고, 없을 때만 메타데이터를 다시 받아서 찾는다.
 
         :param sheet_name: 워크시트 이름
         :return: gspread Worksheet 객체
         """
-        print(f"시트이름: {sheet_name}")
-        print("구글 시트 로드 - 시도중....")
-        sheet = self.spreadsheet.worksheet(sheet_name)    
-        print("구글 시트 로드 - 완료")
+        sheet = self._worksheets.get(sheet_name)
+        if sheet is None:
+            print(f"시트이름: {sheet_name}")
+            print("구글 시트 로드 - 메타데이터 갱신 시도중....")
+            self.refresh_metadata()
+            sheet = self._worksheets.get(sheet_name)
+            if sheet is None:
+                raise WorksheetNotFound(sheet_name)
+            print("구글 시트 로드 - 완료")
         return sheet
     
     
-    @exception_handler
-    def load_as_fetched_data(self, sheet_name, start_col_letter, end_col_letter, key_col_letters=[]):
+    @RETRY_POLICY
+    def load_as_fetched_data(self, sheet_name, start_col_letter, end_col_letter, key_col_letters=[], unformatted=False):
         if (sheet := self.load_sheet(sheet_name)) is None:
             raise ValueError("sheet 로드 과정에서 None 데이터가 들어왔습니다")
         
@@ -171,47 +691,15 @@ class GoogleSheet:
             
         sheet_data = [[]]
         cell_range = f"{start_col_letter}1:{end_col_letter}"
-        sheet_data = sheet.get(cell_range)
-        
-        col_len = string.ascii_uppercase.index(end_col_letter) - string.ascii_uppercase.index(start_col_letter) + 1
-        for row_index, row in enumerate(sheet_data):
-            for col_index in range(col_len):
-                if col_index >= len(row):
-                    sheet_data[row_index].append('')
-        
-        if sheet_data == [[]] or len(sheet_data) == 1:
-            print("Fail 구글 시트에서 데이터가 비어 있습니다. 시트와 범위를 확인해주세요.")
-            raise errors.EmptyDataError
-        elif len(sheet_data) == 2:
-            for row_index, row in enumerate(sheet_data):
-                for value in row:
-                    if value == "#N/A":
-                        print("Fail 구글 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
-                        raise errors.EmptyDataError
-            print(f"{sheet_name} - Success 구글 시트에서 데이터를 성공적으로 가져왔습니다.")
-        else:
-            for row_index, row in enumerate(sheet_data):
-                for value in row:
-                    if value == "#N/A":
-                        print("Fail 구글 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
-                        raise errors.EmptyDataError  
-                if row_index == 1:
-                    break
-            print(f"{sheet_name} - Success 구글 시트에서 데이터를 성공적으로 가져왔습니다.")
+        sheet_data = sheet.get(cell_range, **(TYPED_RENDER_OPTIONS if unformatted else {}))
+        return self._parse_fetched_data(sheet_name, sheet_data, start_col_letter, end_col_letter, key_col_letters)
 
-        fetched_data = sheet_data
-        key_col_indexs = [string.ascii_uppercase.index(key_col_letter) for key_col_letter in key_col_letters]            
-        for index, row in enumerate(sheet_data):
-            for key_col_index in key_col_indexs:
-                key_col_index = key_col_index - string.ascii_uppercase.index(start_col_letter)
-                if row[key_col_index] == '' or row[key_col_index] is None:                    
-                    fetched_data = sheet_data[:index]
-                    return fetched_data  
-
-        return fetched_data    
+    def _parse_fetched_data(self, sheet_name, sheet_data, start_col_letter, end_col_letter, key_col_letters):
+        """시트에서 받아온 2차원 값 목록을 검사하고, 키 컬럼이 비는 행 앞까지 잘라서 리턴한다"""
+        return parse_fetched_rows(sheet_name, sheet_data, start_col_letter, end_col_letter, key_col_letters)
 
     # 호환성 때문에 사용하는 함수            
-    @exception_handler    
+    @RETRY_POLICY    
     def load_as_dict_of_value_list(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[]):        
         load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_cols)  
         data_dict = {}
@@ -236,25 +724,531 @@ class GoogleSheet:
             data_dict[header] = data_list
         return data_dict
     
-    @exception_handler
-    def load_as_dataframe(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[]):        
-        load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_cols)        
-        
-        col_length = len(load_data[0])
-        for index, row in enumerate(load_data):
-            while len(load_data[index]) < col_length:
-                load_data[index].append("")                
-        
-        if len(load_data) == 1:
-            df_sheet = pd.DataFrame(load_data[1:], columns=load_data[0])
-            return pd.DataFrame(load_data)
-        elif len(load_data[0]) == len(load_data[1]):
-            df_sheet = pd.DataFrame(load_data[1:], columns=load_data[0])
+    @RETRY_POLICY
+    def load_as_dataframe(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], use_cache=True, cache_ttl=None, schema=None):
+        """
+        시트 범위를 DataFrame으로 가져온다. (SHEET_CACHE를 거쳐서 읽음)
+
+        :param use_cache: False면 캐시를 무시하고 새로 읽은 뒤 캐시를 갱신한다 (새로고침 용도)
+        :param cache_ttl: 이번 범위에만 적용할 캐시 유지 시간(초), None이면 SHEET_CACHE.ttl
+        :param schema: {컬럼 이름: 타입} (util.data_load.schema), 주면 숫자를 UNFORMATTED_VALUE로 읽어서 타입을 변환한다
+        """
+        cache_key = SHEET_CACHE.make_key(
+            self.spreadsheet_name, sheet_name, f"{start_col_letter}1:{end_col_letter}", key_cols,
+            variant="typed" if schema else "",
+        )
+        loader = lambda: self._fetch_dataframe(sheet_name, start_col_letter, end_col_letter, key_cols, schema)
+
+        if use_cache:
+            df_sheet = SHEET_CACHE.get_or_load(cache_key, loader, cache_ttl)
         else:
-            raise ValueError("Columns and data length do not match.")
-        return df_sheet    
+            df_sheet = loader()
+            SHEET_CACHE.put(cache_key, df_sheet, cache_ttl)
+
+        # 캐시에 들어있는 원본이 호출한 쪽에서 수정되지 않도록 복사본을 넘긴다.
+        return df_sheet.copy()
+
+    # -----------------------
+    # 변경 감지 (조건부 읽기)
+    # -----------------------
+    @RETRY_POLICY
+    def get_change_signal(self, sheet_name: Optional[str] = None, sentinel_range: Optional[str] = None) -> str:
+        """
+        데이터가 바뀌었는지 싸게 확인하기 위한 값.
+        - sentinel_range가 없으면: Drive 파일 version (스프레드시트 어디든 수정되면 바뀜, 요청 1번)
+        - sentinel_range가 있으면: sheet_name 시트의 작은 범위(예: 마지막 수정 시각 셀) 값의 해시
+        """
+        if sentinel_range is None:
+            response = self.client.http_client.request(
+                "get",
+                f"{DRIVE_FILES_API_V3_URL}/{self.spreadsheet.id}",
+                params={"fields": "version,modifiedTime", "supportsAllDrives": True},
+            )
+            metadata = response.json()
+            return f"drive:{metadata.get('version')}:{metadata.get('modifiedTime')}"
+
+        if (sheet := self.load_sheet(sheet_name)) is None:
+            raise ValueError(f"{sheet_name} 시트를 불러오지 못했습니다.")
+        values = sheet.get(sentinel_range, **TYPED_RENDER_OPTIONS)
+        digest = hashlib.sha1(json.dumps(values, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+        return f"range:{digest}"
+
+    def load_as_dataframe_conditional(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None, sentinel_range=None, max_age=None) -> tuple:
+        """
+        변경 신호(get_change_signal)를 먼저 확인해서, 바뀌지 않았으면 전체 범위를 받지도 파싱하지도 않고
+        마지막으로 읽은 DataFrame을 그대로 돌려준다.
+        신호가 바뀌어 다시 읽었어도 내용이 같으면(다른 시트만 수정된 경우 등) 데이터 버전은 그대로다.
+
+        :param sentinel_range: 변경 감지에 쓸 작은 범위 (None이면 Drive 파일 version)
+        :param max_age: 신호가 같아도 이 시간(초)이 지나면 전체를 다시 읽는다 (Drive version이 늦게 바뀌는 경우 대비)
+        :return: (DataFrame 복사본, 데이터 버전, 내용이 바뀌었는지)
+        """
+        return self._conditional_loads.load(sheet_name, start_col_letter, end_col_letter, key_cols, schema, sentinel_range, max_age)
+
+    def load_many_conditional(self, ranges: Dict[str, tuple], incremental=(), max_age=None, full_reload_after=None) -> Dict[str, tuple]:
+        """
+        load_many()의 조건부 버전 (백그라운드 폴러용).
+        Drive version을 한 번만 확인해서 그대로면 아무것도 읽지 않고, 바뀌었으면 load_many()로 한 번에 읽은 뒤
+        내용이 실제로 바뀐 범위만 돌려준다.
+        Drive version은 앱이 직접 쓰는 시트(로그인 기록 등)가 바뀌어도 올라가므로, 그런 경우에는 한 번 읽기만 하고 빈 dict가 된다.
+
+        :param ranges / incremental / full_reload_after: load_many()와 같음
+        :param max_age: 신호가 같아도 이 시간(초)이 지나면 다시 읽는다 (0이면 항상 읽음)
+        :return: {이름: (DataFrame 복사본, 데이터 버전)} - 내용이 바뀐 범위만
+        """
+        return self._conditional_loads.load_many(ranges, incremental, max_age, full_reload_after)
+
+    def get_data_version(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None, sentinel_range=None) -> Optional[int]:
+        """load_as_dataframe_conditional() / load_many_conditional()로 읽은 범위의 데이터 버전 (아직 읽지 않았으면 None)"""
+        return self._conditional_loads.version(sheet_name, start_col_letter, end_col_letter, key_cols, schema, sentinel_range)
+
+    def _fetch_dataframe(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None):
+        load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_cols, unformatted=bool(schema))
+        df_sheet = self._rows_to_dataframe(load_data, schema)
+        self._save_mirror_frame(sheet_name, start_col_letter, end_col_letter, key_cols, schema, df_sheet)
+        return df_sheet
+
+    _rows_to_dataframe = staticmethod(rows_to_dataframe)
+
+    @RETRY_POLICY
+    def load_as_dataframe_incremental(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], full_reload_after=None, schema=None):
+        """
+        아래로만 계속 쌓이는 시트(예: 오토바이DB_누적)를 증분으로 읽는다.
 
-    @exception_handler
+        마지막으로 읽은 행 번호(n)를 기억해두고, 다음 호출에서는
+        헤더 / n행 / {start}{n+1}:{end} 세 범위만 한 번에(batch_get) 가져와서
+        새로 생긴 행만 메모리의 DataFrame 뒤에 붙인다.
+        헤더나 n행 값이 기억한 값과 다르면(행 삭제, 위쪽 수정, 시트 초기화 등) 전체를 다시 읽는다.
+
+        주의: 확인하는 것은 헤더와 n행뿐이라서, 그 사이 중간 행이 수정된 것은 감지하지 못한다.
+        중간 행 수정은 full_reload_after가 지나서 전체를 다시 읽을 때 반영된다.
+
+        :param full_reload_after: 마지막 전체 로드 후 이 시간(초)이 지나면 전체를 다시 읽는다 (None이면 사용 안 함)
+        :param schema: {컬럼 이름: 타입}, 주면 새로 읽은 행만 타입을 변환해서 붙인다
+        :return: 지금까지 읽은 전체 데이터 DataFrame (복사본)
+        """
+        sheet_name, start_col_letter, end_col_letter, key_col_letters, schema = self._normalize_range(
+            (sheet_name, start_col_letter, end_col_letter, key_cols, schema)
+        )
+        state_key = self._tail_state_key(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+
+        # 잠금은 상태를 읽을 때 / 게시할 때만 잡고, 시트 요청은 잠금 밖에서 한다
+        with self._tail_lock:
+            base = self._tail_states.get(state_key)
+        is_expired = (
+            base is not None
+            and full_reload_after is not None
+            and time.monotonic() - base["loaded_at"] > full_reload_after
+        )
+        state = dict(base) if base is not None and not is_expired else None
+        if state is None or not self._fetch_tail(sheet_name, state, key_col_letters):
+            state = self._full_tail_state(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+        state = self._publish_tail_state(state_key, base, state)
+
+        self._save_mirror_tail_states()
+        return state["frame"].copy()
+
+    def _publish_tail_state(self, state_key: tuple, base: Optional[dict], state: dict) -> dict:
+        """
+        잠금 밖에서 만든 증분 로드 상태를 게시한다.
+        읽기 시작한 뒤 다른 스레드가 먼저 새 상태를 게시했으면(또는 reset_incremental로 지웠으면)
+        그 상태를 덮어쓰지 않는다.
+
+        :param base: 읽기 시작할 때의 상태 (없었으면 None)
+        :return: 게시된 상태 (다른 스레드가 먼저 게시했으면 그 상태)
+        """
+        with self._tail_lock:
+            current = self._tail_states.get(state_key)
+            if current is base:
+                self._tail_states[state_key] = state
+                return state
+            return current if current is not None else state
+
+    def reset_incremental(self, sheet_name: Optional[str] = None) -> None:
+        """증분 로드 상태를 지워서 다음 호출 때 전체를 다시 읽게 한다 (sheet_name이 없으면 전체)"""
+        with self._tail_lock:
+            for state_key in list(self._tail_states):
+                if sheet_name is None or state_key[0] == sheet_name:
+                    del self._tail_states[state_key]
+
+    # -----------------------
+    # 로컬 미러
+    # -----------------------
+    def _mirror_key(self, kind, sheet_name, start_col_letter, end_col_letter, key_col_letters, schema) -> Optional[tuple]:
+        """미러 파일 key (미러를 쓰지 않는 시트면 None)"""
+        if self.mirror is None or sheet_name not in self.mirror_sheets:
+            return None
+        return (kind, self.spreadsheet.id, sheet_name, start_col_letter.upper(), end_col_letter.upper(),
+                tuple(letter.upper() for letter in key_col_letters), bool(schema))
+
+    def _save_mirror_frame(self, sheet_name, start_col_letter, end_col_letter, key_col_letters, schema, df_sheet) -> None:
+        if (mirror_key := self._mirror_key("full", sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)) is None:
+            return
+        self.mirror.save(mirror_key, df_sheet)
+
+    def _save_mirror_tail_states(self) -> None:
+        """
+        증분 로드 상태 중 바뀐 것을 로컬 미러에 저장한다 (파일 쓰기는 _tail_lock 밖에서).
+        이미 미러에 있는 행 뒤에 새 행만 붙는 경우에는 새 행만 조각 파일로 쓰고(mirror.append),
+        전체를 다시 읽었거나 조각이 많이 쌓였으면 전체를 다시 쓴다(mirror.save).
+        """
+        if self.mirror is None:
+            return
+        # 조각 파일 순서가 뒤바뀌지 않도록 미러 쓰기는 한 번에 한 스레드만
+        with self._mirror_save_lock:
+            pending = []
+            with self._tail_lock:
+                for state_key, state in self._tail_states.items():
+                    if not state.get("mirror_dirty"):
+                        continue
+                    state["mirror_dirty"] = False
+                    mirrored_rows = state.get("mirrored_rows", 0)
+                    state["mirrored_rows"] = len(state["frame"])
+                    sheet_name, start_col_letter, end_col_letter, key_col_letters, schema = state_key
+                    mirror_key = self._mirror_key("tail", sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+                    if mirror_key is None:
+                        continue
+                    meta = {"header": state["header"], "last_row": state["last_row"], "last_values": state["last_values"]}
+                    pending.append((mirror_key, state["frame"], mirrored_rows, meta))
+
+            for mirror_key, frame, mirrored_rows, meta in pending:
+                if mirrored_rows and self.mirror.append(mirror_key, frame.iloc[mirrored_rows:], meta):
+                    continue
+                self.mirror.save(mirror_key, frame, meta)
+
+    def load_from_mirror(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None, incremental=False) -> Optional[pd.DataFrame]:
+        """
+        로컬 미러에 저장된 데이터를 시트 요청 없이 읽는다 (없으면 None).
+        incremental=True면 증분 로드 상태도 미러 기준으로 만들어 두어서,
+        다음 load_as_dataframe_incremental() / load_many()는 미러 이후에 생긴 행만 가져온다.
+        """
+        sheet_name, start_col_letter, end_col_letter, key_col_letters, schema = self._normalize_range(
+            (sheet_name, start_col_letter, end_col_letter, key_cols, schema)
+        )
+        kind = "tail" if incremental else "full"
+        if (mirror_key := self._mirror_key(kind, sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)) is None:
+            return None
+        if (loaded := self.mirror.load(mirror_key)) is None:
+            return None
+        frame, meta = loaded
+
+        if incremental:
+            state_key = self._tail_state_key(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+            with self._tail_lock:
+                if state_key not in self._tail_states:
+                    self._tail_states[state_key] = {
+                        "start_col_letter": start_col_letter,
+                        "end_col_letter": end_col_letter,
+                        "schema": schema,
+                        "header": meta["header"],
+                        "last_row": meta["last_row"],
+                        "last_values": meta["last_values"],
+                        "frame": frame,
+                        # 미러를 저장한 시각 기준으로 full_reload_after가 지나갔는지 판단하도록 맞춘다
+                        "loaded_at": time.monotonic() - (time.time() - meta["saved_at"]),
+                        "mirror_dirty": False,
+                        "mirrored_rows": len(frame),
+                    }
+        print(f"{sheet_name} - 로컬 미러에서 {len(frame)}행 로드")
+        return frame.copy()
+
+    @staticmethod
+    def _normalize_range(entry) -> tuple:
+        """(sheet_name, start_col_letter, end_col_letter, key_cols[, schema]) -> 대문자로 맞춘 5개 값"""
+        sheet_name, start_col_letter, end_col_letter, key_cols = entry[:4]
+        schema = entry[4] if len(entry) > 4 else None
+        key_col_letters = [letter.upper() for letter in key_cols]
+        return sheet_name, start_col_letter.upper(), end_col_letter.upper(), key_col_letters, schema
+
+    @staticmethod
+    def _tail_state_key(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema) -> tuple:
+        return (sheet_name, start_col_letter, end_col_letter, tuple(key_col_letters), bool(schema))
+
+    def _full_tail_state(self, sheet_name, start_col_letter, end_col_letter, key_col_letters, schema=None) -> dict:
+        """전체 범위를 읽어서 증분 로드 상태를 새로 만든다"""
+        load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_col_letters, unformatted=bool(schema))
+        return self._new_tail_state(sheet_name, start_col_letter, end_col_letter, load_data, schema)
+
+    @staticmethod
+    def _new_tail_state(sheet_name, start_col_letter, end_col_letter, load_data, schema=None) -> dict:
+        """load_as_fetched_data() 형태의 전체 데이터로 증분 로드 상태를 만든다"""
+        header = load_data[0]
+        frame = pd.DataFrame(load_data[1:], columns=header)
+        if schema:
+            frame = apply_schema(frame, schema)
+        print(f"{sheet_name} - 증분 로드: 전체 다시 읽기 ({len(load_data) - 1}행)")
+        return {
+            "start_col_letter": start_col_letter,
+            "end_col_letter": end_col_letter,
+            "schema": schema,
+            "header": header,
+            "last_row": len(load_data),         # 시트 기준 마지막 데이터 행 번호 (헤더 = 1행)
+            "last_values": load_data[-1],
+            "frame": frame,
+            "loaded_at": time.monotonic(),
+            "mirror_dirty": True,           # 로컬 미러에 아직 저장하지 않은 변경이 있는지
+            "mirrored_rows": 0,             # frame 앞쪽 중 로컬 미러에 이미 있는 행 수 (0이면 전체를 새로 씀)
+        }
+
+    def _fetch_tail(self, sheet_name, state: dict, key_col_letters) -> bool:
+        """
+        state의 마지막 행 이후로 새로 생긴 행만 가져와서 state에 붙인다.
+        (state를 직접 바꾸므로 게시된 상태가 아니라 복사본을 넘긴다)
+
+        :return: 성공하면 True, 위쪽 데이터가 바뀌어서 전체를 다시 읽어야 하면 False
+        """
+        if (sheet := self.load_sheet(sheet_name)) is None:
+            raise ValueError("sheet 로드 과정에서 None 데이터가 들어왔습니다")
+
+        render_options = TYPED_RENDER_OPTIONS if state["schema"] else {}
+        header_range, boundary_range, tail_range = sheet.batch_get(self._tail_ranges(state), **render_options)
+        return self._apply_tail(sheet_name, state, key_col_letters, header_range, boundary_range, tail_range)
+
+    @staticmethod
+    def _tail_ranges(state: dict) -> List[str]:
+        """증분 로드에 필요한 범위 (헤더 / 마지막으로 읽은 행 / 그 아래 전체)"""
+        start_col_letter = state["start_col_letter"]
+        end_col_letter = state["end_col_letter"]
+        last_row = state["last_row"]
+        return [
+            f"{start_col_letter}1:{end_col_letter}1",
+            f"{start_col_letter}{last_row}:{end_col_letter}{last_row}",
+            f"{start_col_letter}{last_row + 1}:{end_col_letter}",
+        ]
+
+    @staticmethod
+    def _apply_tail(sheet_name, state: dict, key_col_letters, header_range, boundary_range, tail_range) -> bool:
+        """
+        _tail_ranges()로 받아온 값을 검사하고, 새로 생긴 행을 state에 붙인다.
+
+        :return: 성공하면 True, 위쪽 데이터가 바뀌어서 전체를 다시 읽어야 하면 False
+        """
+        start_col_letter = state["start_col_letter"]
+        last_row = state["last_row"]
+        col_len = len(state["header"])
+
+        def pad(row):
+            return list(row) + [''] * (col_len - len(row))
+
+        header = pad(header_range[0]) if header_range else []
+        boundary = pad(boundary_range[0]) if boundary_range else []
+        if header != state["header"] or boundary != state["last_values"]:
+            print(f"{sheet_name} - 증분 로드: 기존 행이 변경되어 전체를 다시 읽습니다.")
+            return False
+
+        key_col_indexs = [
+            string.ascii_uppercase.index(letter) - string.ascii_uppercase.index(start_col_letter)
+            for letter in key_col_letters
+        ]
+        new_rows = []
+        for row in tail_range:
+            row = pad(row)
+            if any(row[index] == '' or row[index] is None for index in key_col_indexs):
+                break
+            new_rows.append(row)
+
+        if new_rows:
+            new_df = pd.DataFrame(new_rows, columns=state["header"])
+            if state["schema"]:
+                new_df = apply_schema(new_df, state["schema"])
+            state["frame"] = concat_typed([state["frame"], new_df])
+            state["last_row"] = last_row + len(new_rows)
+            state["last_values"] = new_rows[-1]
+            state["mirror_dirty"] = True
+        print(f"{sheet_name} - 증분 로드: 새 행 {len(new_rows)}개")
+        return True
+
+    @RETRY_POLICY
+    def load_many(self, ranges: Dict[str, tuple], incremental=(), use_cache=True, full_reload_after=None) -> Dict[str, pd.DataFrame]:
+        """
+        여러 시트 범위를 values_batchGet 한 번(HTTP 요청 1회)으로 읽어서 DataFrame으로 돌려준다.
+        (스키마가 있는 범위와 없는 범위는 읽는 방식이 달라서 각각 한 번씩 요청한다)
+
+        :param ranges: {이름: (sheet_name, start_col_letter, end_col_letter, key_cols[, schema])}
+        :param incremental: load_as_dataframe_incremental() 처럼 새로 생긴 행만 읽을 이름 목록
+            (헤더와 마지막 행만 비교하므로 중간 행 수정은 full_reload_after가 지나야 반영된다)
+        :param use_cache: False면 SHEET_CACHE를 무시하고 모두 새로 읽는다 (새로고침 용도)
+        :param full_reload_after: 증분 로드 상태가 이 시간(초)보다 오래되면 전체를 다시 읽는다
+        :return: {이름: DataFrame}
+        """
+        results = {}
+        requests = []   # (이름, 종류, 요청 범위 목록)
+        base_states = {}    # 증분 범위의 읽기 시작할 때 상태 (게시할 때 비교)
+        normalized = {name: self._normalize_range(entry) for name, entry in ranges.items()}
+
+        # 잠금은 상태를 읽을 때 / 게시할 때만 잡고, 시트 요청은 잠금 밖에서 한다
+        with self._tail_lock:
+            for name, (sheet_name, start_col_letter, end_col_letter, key_col_letters, schema) in normalized.items():
+                if name in incremental:
+                    state_key = self._tail_state_key(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+                    base_states[name] = self._tail_states.get(state_key)
+
+        for name, (sheet_name, start_col_letter, end_col_letter, key_col_letters, schema) in normalized.items():
+            if name in incremental:
+                state = base_states[name]
+                if state is not None and (
+                    full_reload_after is None or time.monotonic() - state["loaded_at"] <= full_reload_after
+                ):
+                    requests.append((name, "tail", self._tail_ranges(state)))
+                    continue
+            else:
+                cache_key = SHEET_CACHE.make_key(
+                    self.spreadsheet_name, sheet_name, f"{start_col_letter}1:{end_col_letter}", key_col_letters,
+                    variant="typed" if schema else "",
+                )
+                if use_cache and (cached := SHEET_CACHE.get(cache_key)) is not None:
+                    results[name] = cached.copy()
+                    continue
+            requests.append((name, "full", [f"{start_col_letter}1:{end_col_letter}"]))
+
+        if requests:
+            value_ranges = self._values_batch_get(requests, normalized)
+            for name, kind, _ in requests:
+                sheet_name, start_col_letter, end_col_letter, key_col_letters, schema = normalized[name]
+                state_key = self._tail_state_key(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+                fetched = value_ranges[name]
+
+                if kind == "tail":
+                    state = dict(base_states[name])
+                    if not self._apply_tail(sheet_name, state, key_col_letters, *fetched):
+                        state = self._full_tail_state(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema)
+                    state = self._publish_tail_state(state_key, base_states[name], state)
+                    results[name] = state["frame"].copy()
+                    continue
+
+                load_data = self._parse_fetched_data(sheet_name, fetched[0], start_col_letter, end_col_letter, key_col_letters)
+                if name in incremental:
+                    state = self._new_tail_state(sheet_name, start_col_letter, end_col_letter, load_data, schema)
+                    state = self._publish_tail_state(state_key, base_states[name], state)
+                    results[name] = state["frame"].copy()
+                else:
+                    df_sheet = self._rows_to_dataframe(load_data, schema)
+                    self._save_mirror_frame(sheet_name, start_col_letter, end_col_letter, key_col_letters, schema, df_sheet)
+                    cache_key = SHEET_CACHE.make_key(
+                        self.spreadsheet_name, sheet_name, f"{start_col_letter}1:{end_col_letter}", key_col_letters,
+                        variant="typed" if schema else "",
+                    )
+                    SHEET_CACHE.put(cache_key, df_sheet)
+                    results[name] = df_sheet.copy()
+
+        self._save_mirror_tail_states()
+        return {name: results[name] for name in ranges}
+
+    def _values_batch_get(self, requests, normalized) -> Dict[str, list]:
+        """
+        load_many()의 요청 목록을 values_batchGet으로 가져와서
+        {이름: [범위별 2차원 값 목록, ...]} 형태로 나눠준다.
+        (스키마 유무에 따라 읽는 방식이 달라서 많아야 두 번 요청)
+        """
+        fetched = {}
+        for typed in (False, True):
+            group = [request for request in requests if bool(normalized[request[0]][4]) == typed]
+            if not group:
+                continue
+
+            a1_ranges = []
+            for name, _, cell_ranges in group:
+                sheet_name = normalized[name][0]
+                a1_ranges.extend(absolute_range_name(sheet_name, cell_range) for cell_range in cell_ranges)
+
+            print(f"구글 시트 일괄 로드 - {len(a1_ranges)}개 범위")
+            response = self.spreadsheet.values_batch_get(a1_ranges, params=TYPED_RENDER_PARAMS if typed else None)
+            value_ranges = [value_range.get("values", []) for value_range in response.get("valueRanges", [])]
+
+            position = 0
+            for name, _, cell_ranges in group:
+                fetched[name] = value_ranges[position:position + len(cell_ranges)]
+                position += len(cell_ranges)
+        return fetched
+
+    # -----------------------
+    # 서버 필터 읽기 (gviz 쿼리)
+    # -----------------------
+    @staticmethod
+    def _gviz_literal(value) -> str:
+        """gviz 쿼리 문자열/숫자 값 표기 (작은따옴표가 있으면 큰따옴표로 감싼다)"""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return str(value)
+        value = str(value)
+        if "'" not in value:
+            return f"'{value}'"
+        if '"' not in value:
+            return f'"{value}"'
+        raise ValueError(f"작은따옴표와 큰따옴표가 같이 있는 값은 gviz 쿼리에 넣을 수 없습니다: {value}")
+
+    @classmethod
+    def build_gviz_query(cls, start_col_letter: str, end_col_letter: str, filters: Dict[str, Any] = None, order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None, offset: int = 0) -> str:
+        """
+        gviz 쿼리 문장을 만든다. 예) select A,B,C where A = 'dev1' order by D desc limit 100 offset 200
+
+        :param filters: {열 문자: 값} (모두 같아야 하는 조건, and로 연결)
+        :param order_by: 정렬 기준 열 문자
+        """
+        start_col_number = col_letter_to_number(start_col_letter)
+        end_col_number = col_letter_to_number(end_col_letter)
+        columns = ",".join(col_number_to_letter(number) for number in range(start_col_number, end_col_number + 1))
+        query = f"select {columns}"
+        if filters:
+            for col_letter in filters:
+                if not is_col_letter(col_letter):
+                    raise ValueError(f"filters에 알파벳이 아닌 열이 입력되었습니다: {col_letter}")
+            query += " where " + " and ".join(
+                f"{col_letter.upper()} = {cls._gviz_literal(value)}" for col_letter, value in filters.items()
+            )
+        if order_by:
+            query += f" order by {order_by.upper()}{' desc' if descending else ''}"
+        if limit is not None:
+            query += f" limit {int(limit)}"
+        if offset:
+            query += f" offset {int(offset)}"
+        return query
+
+    @RETRY_POLICY
+    def query_rows(self, sheet_name, start_col_letter :str, end_col_letter :str, filters: Dict[str, Any] = None, order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None, offset: int = 0, schema=None, use_cache=True, cache_ttl=None) -> pd.DataFrame:
+        """
+        조건에 맞는 행만 서버(gviz 쿼리)에서 골라서 DataFrame으로 가져온다.
+        예) 장비 1대의 기록만: query_rows("오토바이DB_누적", "A", "N", {"A": "dev1"}, order_by="D", descending=True, limit=500)
+        시트 전체를 받지 않으므로 결과 크기만큼만 비용이 든다. (SHEET_CACHE를 거쳐서 읽음)
+
+        :param filters: {열 문자: 값}
+        :param limit / offset: 페이지 나누기 (offset행 건너뛰고 limit행)
+        :param schema: {컬럼 이름: 타입}, 주면 타입을 변환한다
+        """
+        if (sheet := self.load_sheet(sheet_name)) is None:
+            raise ValueError(f"{sheet_name} 시트를 불러오지 못했습니다.")
+        query = self.build_gviz_query(start_col_letter, end_col_letter, filters, order_by, descending, limit, offset)
+
+        cache_key = SHEET_CACHE.make_key(
+            self.spreadsheet_name, sheet_name, f"{start_col_letter}1:{end_col_letter}", (),
+            variant=f"gviz:{query}:{'typed' if schema else ''}",
+        )
+        loader = lambda: self._fetch_gviz(sheet, query, schema)
+        if use_cache:
+            df_sheet = SHEET_CACHE.get_or_load(cache_key, loader, cache_ttl)
+        else:
+            df_sheet = loader()
+            SHEET_CACHE.put(cache_key, df_sheet, cache_ttl)
+        return df_sheet.copy()
+
+    def _fetch_gviz(self, sheet: gspread.Worksheet, query: str, schema=None) -> pd.DataFrame:
+        url = self.gviz_base_url.format(spreadsheet_id=self.spreadsheet.id)
+        params = {"tqx": "out:csv", "gid": sheet.id, "headers": 1, "tq": query}
+        response = self.client.http_client.session.get(url, params=params, timeout=RETRY_POLICY.timeout)
+        response.raise_for_status()
+
+        text = response.content.decode("utf-8")
+        if not text.strip():
+            return pd.DataFrame()
+        # 숫자/날짜도 화면에 보이는 문자열 그대로 받고, 변환은 스키마로 한다
+        df_sheet = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+        print(f"{sheet.title} - gviz 쿼리 {len(df_sheet)}행 : {query}")
+        if schema:
+            df_sheet = apply_schema(df_sheet, schema)
+        return df_sheet
+
+    @RETRY_POLICY
     def load_one_line(self, sheet_name:str, start_col_letter:str, end_col_letter:str) -> dict:
         if(sheet := self.load_sheet(sheet_name)) is None:
             raise ValueError
@@ -303,7 +1297,7 @@ class GoogleSheet:
         return oneline_dict             
     
     
-    @exception_handler
+    @RETRY_POLICY
     def load_one_line_revers_key(self, sheet_name, start_col_letter, end_col_letter, reverse_key_letter):
         if(sheet := self.load_sheet(sheet_name)) is None:
             raise ValueError
@@ -351,7 +1345,7 @@ class GoogleSheet:
         return oneline_dict
 
 
-    @exception_handler
+    @RETRY_POLICY
     def get_value_by_cell(self, sheet_name: str, cell_pos: str) -> str:
         """
         A1 표기법(예: 'B2', 'C8')으로 특정 셀의 값을 가져옵니다.
@@ -375,7 +1369,7 @@ class GoogleSheet:
 
         return sheet.acell(cell_pos).value        
 
-    @exception_handler
+    @RETRY_POLICY
     def set_value_by_cell(self, sheet_name: str, cell_pos: str, update_data: str) -> None:
         """
         A1 표기법(예: 'B2', 'C8')으로 특정 셀의 값을 설정합니다.
@@ -405,9 +1399,10 @@ class GoogleSheet:
 
         
         sheet.update_acell(cell_pos, update_data)
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
 
 
-    @exception_handler
+    @RETRY_POLICY
     def get_value(self, sheet_name: str, row_value: int, col_value: int) -> str:
         """
         특정 셀의 값을 얻는다
@@ -431,7 +1426,7 @@ class GoogleSheet:
         cell_range = f"{col_letter}{row_value}"        
         return sheet.get(cell_range)
 
-    @exception_handler
+    @RETRY_POLICY
     def set_value(self, sheet_name: str, row_value: int, col_value: int, update_data: str) -> None:
         """
         특정 셀의 값을 변경한다
@@ -461,8 +1456,9 @@ class GoogleSheet:
             raise ValueError(f"col_value는 0보다 큰 수를 입력해야합니다. {col_value}")
 
         sheet.update_cell(row_value, col_value, update_data)
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
 
-    @exception_handler
+    @RETRY_POLICY
     def clear_column_range(self, sheet_name: str, start_cell: str, end_col: str) -> None:
         """
         지정한 시작 셀부터 지정한 열 끝까지의 값을 빈 문자열로 지웁니다.
@@ -494,9 +1490,11 @@ class GoogleSheet:
         for cell in cells:
             cell.value = ''
         sheet.update_cells(cells)
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
+        self._forget_row_layout(sheet_name)
 
 
-    @exception_handler
+    @RETRY_POLICY
     def delete_row(self, sheet_name: str, row_index: int) -> bool:
         """
         지정한 시트(sheet_name)에서 특정 행(row_index)을 삭제합니다.
@@ -507,153 +1505,423 @@ class GoogleSheet:
         if not isinstance(row_index, int):
             raise ValueError(f"row_index에 숫자 데이터가 아닌 값이 입력되었습니다: {row_index}")    
         
-        row_count = len(sheet.get_all_values())
+        # 시트 전체를 읽지 않고 캐시된 시트 크기(gridProperties)로 확인
+        row_count = sheet.row_count
         if row_index < 1 or row_index > row_count:
             print(f"[오류] 유효하지 않은 행 번호입니다. (현재 시트 행 수: {row_count})")
             return False
 
         try:
-            sheet.delete_rows(row_index, row_index)
+            self.delete_row_ranges(sheet_name, [(row_index, row_index)])
             print(f"[성공] {sheet_name} 시트의 {row_index}번째 행이 삭제되었습니다.")
             return True
         except Exception as e:
             print(f"[오류] 행 삭제 중 예외 발생: {e}")
             return False
 
-    @exception_handler
-    def write_rows(self, sheet_name, output_rows):
+    @RETRY_POLICY
+    def delete_row_ranges(self, sheet_name: str, row_ranges: List[tuple]) -> int:
+        """
+        여러 행 범위를 batchUpdate(deleteDimension) 1번으로 삭제한다.
+        범위는 아래쪽부터 지워서 앞에서 지운 행 때문에 뒤 범위의 행 번호가 밀리지 않게 한다.
+
+        :param row_ranges: [(시작 행, 끝 행), ...] (1부터 시작, 끝 행 포함)
+        :return: 삭제한 행 수
+        """
+        if (sheet := self.load_sheet(sheet_name)) is None:
+            raise ValueError(f"{sheet_name} 시트를 불러오지 못했습니다.")
+
+        merged = []
+        for start_row, end_row in sorted(row_ranges):
+            if start_row < 1 or end_row < start_row or end_row > sheet.row_count:
+                raise ValueError(f"유효하지 않은 행 범위입니다: {start_row}~{end_row} (현재 시트 행 수: {sheet.row_count})")
+            if merged and start_row <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end_row)
+            else:
+                merged.append([start_row, end_row])
+        if not merged:
+            return 0
+
+        requests = [
+            {
+                "deleteDimension": {
+                    "range": {
+                        "sheetId": sheet.id,
+                        "dimension": "ROWS",
+                        "startIndex": start_row - 1,
+                        "endIndex": end_row,
+                    }
+                }
+            }
+            for start_row, end_row in reversed(merged)
+        ]
+        self.spreadsheet.batch_update({"requests": requests})
+
+        deleted = sum(end_row - start_row + 1 for start_row, end_row in merged)
+        sheet._properties["gridProperties"]["rowCount"] -= deleted
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
+        # 행이 지워지면 행 번호가 바뀌므로 append 위치, key 인덱스, 증분 로드 상태를 다시 만들게 한다
+        self._forget_row_layout(sheet_name)
+        self.reset_incremental(sheet_name)
+        return deleted
+
+    def apply_retention(
+        self,
+        sheet_name: str,
+        start_col_letter: str,
+        end_col_letter: str,
+        key_cols=[],
+        time_col: str = "시간",
+        device_col: str = "장비ID",
+        older_than=None,
+        keep_latest: Optional[int] = None,
+        schema=None,
+    ) -> int:
+        """
+        누적 시트에서 오래된 행을 한 번에 정리한다.
+        - older_than: 이 시간보다 오래된 행 삭제 (시간이 비어있거나 읽을 수 없는 행은 남김)
+        - keep_latest: 장비별로 최신 N개만 남기고 나머지 삭제
+        둘 다 주면 둘 중 하나라도 해당되는 행을 삭제한다. 삭제는 delete_row_ranges() 1번으로 보낸다.
+
+        :return: 삭제한 행 수
+        """
+        if older_than is None and keep_latest is None:
+            raise ValueError("older_than 또는 keep_latest 중 하나는 입력해야 합니다.")
+
+        df = self.load_as_dataframe(sheet_name, start_col_letter, end_col_letter, key_cols, use_cache=False, schema=schema)
+        if df.empty:
+            return 0
+
+        times = df[time_col]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = to_datetime_column(times.astype(str))
+
+        drop_mask = pd.Series(False, index=df.index)
+        if older_than is not None:
+            cutoff = pd.Timestamp(older_than)
+            if cutoff.tzinfo is None:
+                cutoff = cutoff.tz_localize(SEOUL_TZ)
+            drop_mask |= (times < cutoff).fillna(False)
+        if keep_latest is not None:
+            newest_first = times.sort_values(ascending=False, kind="stable").index
+            rank = df.loc[newest_first].groupby(device_col, observed=True, sort=False).cumcount()
+            drop_mask |= (rank >= keep_latest).reindex(df.index, fill_value=False)
+
+        # DataFrame 0번째 행 = 시트 2행 (1행은 헤더)
+        positions = drop_mask.to_numpy().nonzero()[0]
+        if len(positions) == 0:
+            print(f"{sheet_name} - 정리할 행이 없습니다.")
+            return 0
+
+        row_ranges = []
+        run_start = prev = int(positions[0])
+        for position in positions[1:]:
+            position = int(position)
+            if position != prev + 1:
+                row_ranges.append((run_start + 2, prev + 2))
+                run_start = position
+            prev = position
+        row_ranges.append((run_start + 2, prev + 2))
+
+        deleted = self.delete_row_ranges(sheet_name, row_ranges)
+        print(f"{sheet_name} - Success 오래된 행 {deleted}개 삭제 ({len(row_ranges)}개 범위)")
+        return deleted
+
+    # append_values()가 요청마다 재시도하므로 RETRY_POLICY로 감싸지 않는다
+    def write_rows(self, sheet_name, output_rows, value_input_option="RAW"):
         if(sheet := self.load_sheet(sheet_name)) is None:
             raise ValueError
         if not output_rows:  
             raise ValueError("출력할 데이터가 입력되지 않았습니다.")
 
-        sheet.append_rows(output_rows)        
+        self.append_values(sheet_name, output_rows, "A", value_input_option=value_input_option)
         return
 
 
-    @exception_handler
+    @RETRY_POLICY
     def vlookup_update(self, sheet_name: str, key_value: str, key_col_letter: str, start_col_letter: str, data: list[list[Any]]):
         """
             구글 시트에 데이터를 vlookup 방식처럼 업데이트하는 함수
+            (key 1개짜리 vlookup_update_many)
         
             key_value: key 값이 일치하는지 판단할 값 
             key_col_letter: key 값을 찾을 열 부분
             start_col_letter: (key 값이 같은 행에서) 데이터 입력을 시작하는 열 부분 
         """        
-        if(sheet := self.load_sheet(sheet_name)) is None:
-            raise ValueError
         if not data:  
             raise ValueError("Data list is empty. Update not performed.")
-        if not is_col_letter(start_col_letter):
-            raise ValueError(f"start_col_letter에 알파벳이 아닌 문자 데이터가 입력되었습니다: {start_col_letter}")       
-            
-        # 시작하는 열
-        start_col_number = col_letter_to_number(start_col_letter)
-        data_row_count = 1
-        data_column_count = len(data[0])
-
-        key_data = self.load_as_dataframe(sheet_name, key_col_letter, key_col_letter, key_col_letter)
-        start_row_number = 0
-        for index, key in enumerate(key_data[key_data.columns[0]], 1):
-            if key == key_value:
-                start_row_number = index + 1
-                break            
-        end_row_number = start_row_number + data_row_count - 1      
-        
-        end_col_number = start_col_number + data_column_count - 1    
-        end_col_letter = col_number_to_letter(end_col_number)
+        self.vlookup_update_many(sheet_name, key_col_letter, {key_value: data[0]}, start_col_letter)
+
+    @RETRY_POLICY
+    def vlookup_update_many(self, sheet_name: str, key_col_letter: str, updates: Dict[str, list], start_col_letter: Optional[str] = None) -> Dict[str, int]:
+        """
+        여러 key의 행을 vlookup 방식으로 한 번에 업데이트한다 (없는 key는 맨 아래에 추가).
+        key 열은 인덱스(key -> 행 번호)로 캐시해 두고, 바뀐 내용은 values.batchUpdate 1번으로 보낸다.
 
-        cell_range = f'{start_col_letter}{start_row_number}:{end_col_letter}{end_row_number}'
-        cell_list = sheet.range(cell_range) # 1차원 리스트 '셀' 객체(위치 값이 들어있음)
+        인덱스는 이 객체를 거친 쓰기(추가 / 삭제 / 비우기)에만 맞춰진다.
+        다른 프로세스나 사람이 시트에서 행을 추가 / 삭제 / 정렬한 것은 알 수 없으므로,
+        KEY_INDEX_TTL초가 지난 인덱스는 key 열을 다시 읽어서 만든다. (그 사이에는 틀린 행에 쓸 수 있다)
 
-        flat_data = [value for sublist in data for value in sublist]
+        :param key_col_letter: key 값을 찾을 열
+        :param updates: {key: 해당 행에 쓸 값 리스트}
+        :param start_col_letter: 값을 쓰기 시작하는 열 (None이면 key 열부터)
+        :return: {key: 쓴 행 번호}
+        """
+        if not updates:
+            raise ValueError("Data list is empty. Update not performed.")
+        start_col_letter = start_col_letter or key_col_letter
+        if not is_col_letter(start_col_letter) or not is_col_letter(key_col_letter):
+            raise ValueError(f"열에 알파벳이 아닌 문자 데이터가 입력되었습니다: {key_col_letter}, {start_col_letter}")
 
-        for i, value in enumerate(flat_data):
-            cell_list[i].value = value
+        if (sheet := self.load_sheet(sheet_name)) is None:
+            raise ValueError(f"{sheet_name} 시트를 불러오지 못했습니다.")
 
-        sheet.update_cells(cell_list, value_input_option='USER_ENTERED') 
-    
+        key_col_number = col_letter_to_number(key_col_letter)
+        start_col_number = col_letter_to_number(start_col_letter)
+        index_key = (sheet.title, key_col_letter)
+        built = None
+        while True:
+            with self._key_index_lock:
+                index = self._key_indexes.get(index_key)
+                version = self._key_index_versions.get(sheet.title, 0)
+                # 인덱스가 없거나 오래됐거나, 인덱스에 없는 key가 있으면 (다른 곳에서 추가됐을 수 있으므로) key 열을 다시 읽는다
+                # (방금 다시 읽어서 게시한 인덱스면 없는 key는 새 key다)
+                is_stale = index is None or (
+                    index is not built
+                    and (
+                        time.monotonic() - index["built_at"] > self.KEY_INDEX_TTL
+                        or any(str(key) not in index["rows"] for key in updates)
+                    )
+                )
+                if not is_stale:
+                    # 새 key의 행 번호는 잠금 안에서 바로 예약해서, 동시에 들어온 다른 호출이 같은 행을 받지 않게 한다
+                    data, new_rows = self._plan_key_rows(sheet.title, index, updates, key_col_letter, key_col_number, start_col_letter, start_col_number)
+                    self._key_reservations.setdefault(index_key, {}).update(new_rows)
+                    result = {str(key): index["rows"][str(key)] for key in updates}
+                    next_row = max(result.values()) + 1
+                    break
+
+            # key 열 읽기는 잠금 밖에서 하고, 그 사이 인덱스가 버려지거나 바뀌지 않았을 때만(버전이 같을 때만) 게시한다.
+            # 게시하지 못했으면 다시 확인한다
+            built = self._build_key_index(sheet, key_col_letter)
+            with self._key_index_lock:
+                if self._key_index_versions.get(sheet.title, 0) == version and self._key_indexes.get(index_key) is index:
+                    # 다른 호출이 예약만 하고 아직 쓰지 않은 행은 시트에서 읽은 key 열에 없으므로 합친다
+                    for key, row_number in self._key_reservations.get(index_key, {}).items():
+                        built["rows"].setdefault(key, row_number)
+                        built["next_row"] = max(built["next_row"], row_number + 1)
+                    self._key_indexes[index_key] = built
+
+        try:
+            # 새 key 때문에 시트 행 수가 부족하면 먼저 늘린다 (캐시된 rowCount 기준, 늘리는 호출은 1개씩)
+            if next_row - 1 > sheet.row_count:
+                with self._grid_lock:
+                    if next_row - 1 > sheet.row_count:
+                        sheet.add_rows(next_row - 1 - sheet.row_count)
+
+            self.spreadsheet.values_batch_update({"valueInputOption": "USER_ENTERED", "data": data})
+        except Exception:
+            # 예약한 행에 쓰지 못했으므로 인덱스를 버려서 다음 호출이 시트에서 다시 읽게 한다
+            if new_rows:
+                self._release_key_rows(index_key, new_rows)
+                self._forget_key_indexes(sheet.title)
+            raise
+        finally:
+            SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
+
+        self._release_key_rows(index_key, new_rows)
+        if new_rows:
+            self._forget_append_cursors(sheet_name)
+        return result
+
+    @staticmethod
+    def _plan_key_rows(sheet_title: str, index: dict, updates: Dict[str, list], key_col_letter: str, key_col_number: int, start_col_letter: str, start_col_number: int) -> tuple:
+        """
+        updates를 쓸 values.batchUpdate 범위 목록을 만들고, 새 key는 index에 다음 행 번호로 예약한다 (_key_index_lock 안에서 호출)
+
+        :return: (batchUpdate data 목록, {새 key: 행 번호})
+        """
+        new_rows: Dict[str, int] = {}
+        data = []
+        for key, row_values in updates.items():
+            row_values = list(row_values)
+            row_number = index["rows"].get(str(key))
+            if row_number is None:
+                row_number = index["rows"][str(key)] = index["next_row"]
+                index["next_row"] += 1
+                new_rows[str(key)] = row_number
+                # 새 행은 key 열에도 key를 써야 한다 (값 범위 밖에 있을 때만 따로 씀)
+                if not start_col_number <= key_col_number < start_col_number + len(row_values):
+                    data.append({"range": absolute_range_name(sheet_title, f"{key_col_letter}{row_number}"), "values": [[key]]})
+
+            end_col_letter = col_number_to_letter(start_col_number + len(row_values) - 1)
+            data.append({
+                "range": absolute_range_name(sheet_title, f"{start_col_letter}{row_number}:{end_col_letter}{row_number}"),
+                "values": [row_values],
+            })
+        return data, new_rows
+
+    def _release_key_rows(self, index_key: tuple, new_rows: Dict[str, int]) -> None:
+        """예약했던 새 key 행을 예약 목록에서 뺀다 (시트에 썼거나 쓰기에 실패했을 때)"""
+        with self._key_index_lock:
+            reservations = self._key_reservations.get(index_key, {})
+            for key in new_rows:
+                reservations.pop(key, None)
+            if not reservations:
+                self._key_reservations.pop(index_key, None)
+
+    def _build_key_index(self, sheet: gspread.Worksheet, key_col_letter: str) -> dict:
+        """key 열을 1번 읽어서 {key: 행 번호} 인덱스를 만든다 (같은 key가 여러 행이면 첫 행, 게시는 호출한 쪽에서)"""
+        column_values = sheet.col_values(col_letter_to_number(key_col_letter))
+        rows: Dict[str, int] = {}
+        for row_number, value in enumerate(column_values, 1):
+            if value != "":
+                rows.setdefault(str(value), row_number)
+        return {"rows": rows, "next_row": len(column_values) + 1, "built_at": time.monotonic()}
+
+    def _forget_key_indexes(self, sheet_name: str) -> None:
+        with self._key_index_lock:
+            self._key_index_versions[sheet_name] = self._key_index_versions.get(sheet_name, 0) + 1
+            for index_key in [index_key for index_key in self._key_indexes if index_key[0] == sheet_name]:
+                self._key_indexes.pop(index_key, None)
+
+    def _forget_append_cursors(self, sheet_name: str) -> None:
+        for cursor_key in [cursor_key for cursor_key in self._append_cursors if cursor_key[0] == sheet_name]:
+            self._append_cursors.pop(cursor_key, None)
+
+    def _forget_row_layout(self, sheet_name: str) -> None:
+        """행이 지워지거나 비워졌을 때 행 번호 기준 캐시(append 위치, key 인덱스)를 버린다"""
+        self._forget_append_cursors(sheet_name)
+        self._forget_key_indexes(sheet_name)
     
+    # -----------------------
+    # 행 추가 (values.append)
+    # -----------------------
+    @staticmethod
+    def _parse_updated_range(updated_range: str) -> Optional[tuple]:
+        """append 응답의 updatedRange에서 행 범위를 꺼낸다 (예: '시트'!A5:N7 -> (5, 7))"""
+        match = re.search(r"!\$?[A-Z]+\$?(\d+)(?::\$?[A-Z]+\$?(\d+))?$", updated_range or "")
+        if not match:
+            return None
+        start_row = int(match.group(1))
+        end_row = int(match.group(2) or start_row)
+        return start_row, end_row
+
+    def get_append_cursor(self, sheet_name: str, start_col_letter: str = "A") -> Optional[int]:
+        """start_col_letter 열에서 시작하는 표의 마지막 append 결과로 알고 있는 다음 빈 행 번호 (아직 append한 적 없으면 None)"""
+        return self._append_cursors.get((sheet_name, start_col_letter.upper()))
+
+    def append_values(self, sheet_name: str, rows: List[list], start_col_letter: str = "A", value_input_option: str = "USER_ENTERED") -> tuple:
+        """
+        sheet_name 시트의 start_col_letter 열부터 시작하는 표 아래에 rows를 붙인다.
+        열 전체를 읽어서 빈 행을 찾지 않고 values.append(OVERWRITE, 알고 있는 다음 빈 행부터) 1번으로 쓰기 때문에
+        시트 행 수와 상관없이 비용이 일정하다.
+
+        여러 스레드에서 동시에 들어온 append는 먼저 잠금을 잡은 스레드가 모아서
+        (시트, 시작 열, 입력 방식)별로 1번의 요청으로 보낸다.
+        요청마다 자기 재시도 정책(_values_append)으로 실행되므로, 이 메서드는 RETRY_POLICY로 감싼
+        메서드 안에서 부르지 않는다 (감싸면 바깥 호출의 재시도만 남는다).
+
+        :return: 이번 rows가 쓰인 (시작 행, 끝 행)
+        """
+        entry = {"rows": [list(row) for row in rows], "done": False, "error": None, "rows_range": None}
+        group_key = (sheet_name, start_col_letter, value_input_option)
+        with self._append_lock:
+            self._append_pending.setdefault(group_key, []).append(entry)
+
+        with self._append_flush_lock:
+            # 다른 스레드가 이미 같이 보냈으면 결과만 돌려준다
+            if not entry["done"]:
+                with self._append_lock:
+                    pending, self._append_pending = self._append_pending, {}
+                for key, entries in pending.items():
+                    self._flush_append_group(key, entries)
+
+        if entry["error"] is not None:
+            raise entry["error"]
+        return entry["rows_range"]
+
+    def _flush_append_group(self, group_key: tuple, entries: List[dict]) -> None:
+        """같은 (시트, 시작 열, 입력 방식)의 대기 중인 append를 한 번의 요청으로 보낸다"""
+        sheet_name, start_col_letter, value_input_option = group_key
+        values = [row for entry in entries for row in entry["rows"]]
+        try:
+            # 다른 스레드의 행도 같이 보내므로 보내는 스레드의 재시도 호출과 분리해서 이 요청만의 재시도로 실행한다
+            with RETRY_POLICY.detached():
+                rows_range = self._values_append(sheet_name, start_col_letter, values, value_input_option)
+        except Exception as e:
+            for entry in entries:
+                entry["error"] = e
+                entry["done"] = True
+            return
+
+        start_row = rows_range[0] if rows_range else None
+        for entry in entries:
+            if start_row is not None:
+                entry["rows_range"] = (start_row, start_row + len(entry["rows"]) - 1)
+                start_row += len(entry["rows"])
+            entry["done"] = True
+
+    @RETRY_POLICY
+    def _values_append(self, sheet_name: str, start_col_letter: str, values: List[list], value_input_option: str) -> Optional[tuple]:
+        if (sheet := self.load_sheet(sheet_name)) is None:
+            raise ValueError(f"{sheet_name} 시트를 불러오지 못했습니다.")
+
+        # 알고 있는 다음 빈 행부터 표를 찾게 해서 위쪽 데이터를 훑지 않도록 한다
+        # OVERWRITE - 표 아래 빈 행에 덮어쓴다 (INSERT_ROWS처럼 행을 끼워 넣으면 같은 행에 있는 다른 열의 표까지 밀린다)
+        cursor_key = (sheet_name, start_col_letter.upper())
+        cursor = self._append_cursors.get(cursor_key, 1)
+        params = {
+            "valueInputOption": value_input_option,
+            "insertDataOption": InsertDataOption.overwrite,
+        }
+        response = self.spreadsheet.values_append(
+            absolute_range_name(sheet.title, f"{start_col_letter}{cursor}"),
+            params,
+            {"values": values},
+        )
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
+        self._forget_key_indexes(sheet_name)
+
+        rows_range = self._parse_updated_range(response.get("updates", {}).get("updatedRange"))
+        if rows_range:
+            # 시트 끝을 넘겨서 쓰면 시트 행이 늘어나므로 캐시된 시트 크기도 맞춘다
+            grid = sheet._properties["gridProperties"]
+            grid["rowCount"] = max(grid["rowCount"], rows_range[1])
+            # 이번에 쓴 열에서 시작하는 다른 표의 다음 빈 행도 쓴 행 아래로 맞춘다
+            start_col_number = col_letter_to_number(start_col_letter)
+            width = max((len(row) for row in values), default=0)
+            for other_key, other_cursor in list(self._append_cursors.items()):
+                if other_key[0] == sheet_name and 0 <= col_letter_to_number(other_key[1]) - start_col_number < width:
+                    self._append_cursors[other_key] = max(other_cursor, rows_range[1] + 1)
+            self._append_cursors[cursor_key] = rows_range[1] + 1
+        else:
+            self._forget_append_cursors(sheet_name)
+        return rows_range
+
     # TODO 매개변수 data 유효성 검사
     # def googlesheet_update(jason_file_full_name, spreadsheetname, sheetname, data, start_col_letter):
-    @exception_handler
+    # append_values()가 요청마다 재시도하므로 RETRY_POLICY로 감싸지 않는다
     def update(self, sheet_name, output_rows, start_col_letter):
-        if(sheet := self.load_sheet(sheet_name)) is None:
-            raise ValueError
+        """시트 맨 아래(start_col_letter 열 기준)에 output_rows를 추가한다"""
         if not output_rows:  
             raise ValueError(f"{sheet_name}에 출력할 데이터가 입력되지 않았습니다.")
         if not is_col_letter(start_col_letter):
             raise ValueError(f"start_col_letter에 알파벳이 아닌 문자 데이터가 입력되었습니다: {start_col_letter}")       
 
-        # 시작하는 열
-        start_col_number = col_letter_to_number(start_col_letter)
-        data_row_count = len(output_rows)
-        data_column_count = len(output_rows[0])
-
-        # 해당 열 데이터가 어디까지 입력되어있는지 찾음 (빈셀 포함)
-        column_values = sheet.col_values(start_col_number)    
-        
-        # 아래 칸의 빈 셀로 간다.
-        start_row_number = len(column_values) + 1
-        end_row_number = start_row_number + data_row_count - 1        
-        
-        # 시트의 최대 열을 초과하는지 확인 후 부족한 열 추가
-        if end_row_number > sheet.row_count:
-            extra_rows = end_row_number - sheet.row_count
-            sheet.add_rows(extra_rows)              
-        
-        end_col_number = start_col_number + data_column_count - 1     
-        end_col_letter = col_number_to_letter(end_col_number)
+        self.append_values(sheet_name, output_rows, start_col_letter, value_input_option="USER_ENTERED")
 
-        cell_range = '{}{}:{}{}'.format(start_col_letter, start_row_number, end_col_letter, end_row_number)
-        cell_list = sheet.range(cell_range) # 1차원 리스트 '셀' 객체(위치 값이 들어있음)
-
-        for i, row_data in enumerate(output_rows):
-            for j, value in enumerate(row_data):
-                cell_list[i * len(row_data) + j].value = value
-
-        sheet.update_cells(cell_list, value_input_option='USER_ENTERED')    
-
-
-    @exception_handler
+    # append_values()가 요청마다 재시도하므로 RETRY_POLICY로 감싸지 않는다
     def update_oneline(self, sheet_name: str, oneline_data: list, start_col_letter: str):
-        if(sheet := self.load_sheet(sheet_name)) is None:
-            raise ValueError
+        """시트 맨 아래(start_col_letter 열 기준)에 한 줄을 추가한다"""
         if not oneline_data:  
             raise ValueError("Data list is empty. Update not performed.")
         if not is_col_letter(start_col_letter):
             raise ValueError(f"start_col_letter에 알파벳이 아닌 문자 데이터가 입력되었습니다: {start_col_letter}")       
             
-        # 시작하는 열
-        start_col_number = col_letter_to_number(start_col_letter)
-        data_row_count = 1
-        data_column_count = len(oneline_data)
-
-        # 해당 열 데이터가 어디까지 입력되어있는지 찾음 (빈셀 포함)
-        column_values = sheet.col_values(start_col_number)    
-        
-        # 아래 칸의 빈 셀로 간다.
-        start_row_number = len(column_values) + 1
-        end_row_number = start_row_number + data_row_count - 1
-
-        # 시트의 최대 열을 초과하는지 확인 후 부족한 열 추가
-        if end_row_number > sheet.row_count:
-            extra_rows = end_row_number - sheet.row_count
-            sheet.add_rows(extra_rows)       
-        
-        end_col_number = start_col_number + data_column_count - 1     
-        end_col_letter = col_number_to_letter(end_col_number)
-
-        cell_range = f'{start_col_letter}{start_row_number}:{end_col_letter}{end_row_number}'
-        cell_list = sheet.range(cell_range) # 1차원 리스트 '셀' 객체(위치 값이 들어있음)
-
-        # 이 부분 최적화 예정
-        for i, value in enumerate(oneline_data):
-            cell_list[i].value = value
-    
-        sheet.update_cells(cell_list, value_input_option='USER_ENTERED')  
+        self.append_values(sheet_name, [oneline_data], start_col_letter, value_input_option="USER_ENTERED")
     
-    @exception_handler
+    @RETRY_POLICY
     def write_range_rows(self, sheet_name, output_rows, range_letter :str):
         if(sheet := self.load_sheet(sheet_name)) is None:
             raise ValueError
@@ -662,9 +1930,12 @@ class GoogleSheet:
 
         print(sheet.title, range_letter)
         sheet.append_rows(values=output_rows, table_range=range_letter)        
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
+        # 행이 추가됐으므로 append 위치 / key 인덱스(next_row)를 다시 만들게 한다
+        self._forget_row_layout(sheet_name)
         return    
 
-    @exception_handler
+    @RETRY_POLICY
     def clear_columns(self, sheet_name: str, start_cells: List[str]):
         """
         여러 개의 셀 주소를 입력하면 해당 열의 해당 행부터 끝까지 데이터를 삭제하는 함수.
@@ -679,7 +1950,7 @@ class GoogleSheet:
         for start_cell in start_cells:
             self.clear_column(sheet_name, start_cell)
     
-    @exception_handler
+    @RETRY_POLICY
     def clear_column(self, sheet_name: str, start_cell: str):
         """
         특정 셀을 입력하면 해당 행의 A열 데이터를 지움
@@ -718,4 +1989,6 @@ class GoogleSheet:
 
         # 업데이트 적용
         sheet.update_cells(cells, value_input_option='USER_ENTERED')
+        SHEET_CACHE.invalidate(self.spreadsheet_name, sheet_name)
+        self._forget_row_layout(sheet_name)
         print(f"Success {col_letter}{start_row}부터 {col_letter}{last_row}까지 값 삭제")
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from pandas.api.types import union_categoricals
+
+
+SEOUL_TZ = "Asia/Seoul"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 스키마에서 쓰는 타입 이름
+DATETIME = "datetime"       # datetime64[ns, Asia/Seoul]
+CATEGORY = "category"
+FLOAT64 = "float64"
+FLOAT32 = "float32"
+STRING = "string"
+
+# 오토바이DB_현재 / 오토바이DB_누적 시트 컬럼 스키마 (컬럼 이름 -> 타입)
+TRACKER_SCHEMA: Dict[str, str] = {
+    "장비ID": CATEGORY,
+    "클라이언트ID": CATEGORY,
+    "차량번호": CATEGORY,
+    "시간": DATETIME,
+    "위도": FLOAT64,
+    "경도": FLOAT64,
+    "속도": FLOAT32,
+    "상태": CATEGORY,
+    "모션데이터\naccx": FLOAT32,
+    "모션데이터\naccy": FLOAT32,
+    "모션데이터\naccz": FLOAT32,
+    "모션데이터\ngyrox": FLOAT32,
+    "모션데이터\ngyroy": FLOAT32,
+    "모션데이터\ngyroz": FLOAT32,
+}
+
+
+def to_datetime_column(values: pd.Series) -> pd.Series:
+    """
+    시간 컬럼을 datetime64[ns, Asia/Seoul]로 변환한다.
+    시트 기본 형식(TIME_FORMAT)으로 한 번에 변환하고, 형식이 다른 값만 다시 추론한다.
+    """
+    values = values.replace("", None)
+    converted = pd.to_datetime(values, format=TIME_FORMAT, errors="coerce")
+
+    retry_mask = converted.isna() & values.notna()
+    if retry_mask.any():
+        converted[retry_mask] = pd.to_datetime(values[retry_mask], format="mixed", errors="coerce")
+
+    converted = converted.astype("datetime64[ns]")
+    return converted.dt.tz_localize(SEOUL_TZ)
+
+
+def to_float_column(values: pd.Series, dtype: str) -> pd.Series:
+    """숫자 컬럼을 float로 변환한다 (빈칸/숫자가 아닌 값은 NaN)"""
+    return pd.to_numeric(values.replace("", np.nan), errors="coerce").astype(dtype)
+
+
+def to_category_column(values: pd.Series) -> pd.Series:
+    """반복되는 문자열 컬럼(장비ID, 상태 등)을 category로 변환한다"""
+    return values.astype(str).astype("category")
+
+
+def apply_schema(df: pd.DataFrame, schema: Dict[str, str]) -> pd.DataFrame:
+    """
+    스키마에 있는 컬럼을 컬럼 단위(벡터화)로 한 번에 변환한다.
+    스키마에 없는 컬럼과 DataFrame에 없는 스키마 컬럼은 건너뛴다.
+
+    :param df: 시트에서 읽어온 DataFrame
+    :param schema: {컬럼 이름: 타입} (DATETIME / CATEGORY / FLOAT64 / FLOAT32 / STRING)
+    :return: 타입이 변환된 새 DataFrame
+    """
+    converted = {}
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+
+        if dtype == DATETIME:
+            converted[col] = to_datetime_column(df[col])
+        elif dtype in (FLOAT64, FLOAT32):
+            converted[col] = to_float_column(df[col], dtype)
+        elif dtype == CATEGORY:
+            converted[col] = to_category_column(df[col])
+        elif dtype == STRING:
+            converted[col] = df[col].astype(str)
+        else:
+            raise ValueError(f"지원하지 않는 스키마 타입입니다: {col} - {dtype}")
+
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def concat_typed(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    apply_schema()로 변환한 DataFrame들을 이어 붙인다.
+    category 컬럼은 카테고리를 합쳐서 붙이기 때문에 object로 바뀌지 않는다.
+    """
+    frames = [frame for frame in frames if frame is not None]
+    if len(frames) == 1:
+        return frames[0]
+
+    first = frames[0]
+    category_cols = [col for col in first.columns if isinstance(first[col].dtype, pd.CategoricalDtype)]
+    if category_cols:
+        frames = [frame.copy() for frame in frames]
+        for col in category_cols:
+            categories = union_categoricals([frame[col] for frame in frames]).categories
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
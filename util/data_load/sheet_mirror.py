@@ -0,0 +1,147 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from util.data_load.schema import concat_typed
+
+
+class SheetMirror:
+    """
+    시트에서 읽어온 DataFrame을 로컬 디스크(cache_dir)에 Parquet 파일로 저장해 두는 미러.
+
+    - 범위 1개당 <hash>.parquet (데이터) + <hash>.json (메타데이터: 저장 시각, 증분 로드 위치 등) 2개 파일
+    - 아래로만 쌓이는 범위는 append()로 새 행만 <hash>.<번호>.parquet 조각 파일에 쓰고,
+      조각이 max_segments개를 넘으면 호출한 쪽이 save()로 전체를 다시 써서 합친다 (compaction).
+    - 파일은 임시 파일에 쓴 뒤 os.replace로 바꿔치기해서, 쓰는 도중에 읽어도 깨진 파일을 보지 않는다.
+      (메타데이터를 마지막에 바꾸므로 메타데이터에 없는 조각 파일은 읽지 않고, 다음 save()에서 지운다)
+    - 미러는 보조 수단이라 읽기/쓰기 실패는 로그만 남기고 None / False를 돌려준다.
+    """
+
+    def __init__(self, cache_dir: str, max_segments: int = 24):
+        """
+        :param max_segments: append()로 쌓을 조각 파일 최대 개수 (넘으면 append()가 False를 돌려줘서 전체를 다시 쓰게 함)
+        """
+        self.cache_dir = cache_dir
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, key: tuple) -> Tuple[str, str]:
+        digest = hashlib.sha1(json.dumps([str(part) for part in key], ensure_ascii=False).encode("utf-8")).hexdigest()[:20]
+        base = os.path.join(self.cache_dir, digest)
+        return f"{base}.parquet", f"{base}.json"
+
+    @staticmethod
+    def _segment_path(data_path: str, number: int) -> str:
+        return f"{data_path[:-len('.parquet')]}.{number:06d}.parquet"
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: dict, suffix: str) -> None:
+        with open(meta_path + suffix, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+        os.replace(meta_path + suffix, meta_path)
+
+    def _read_meta(self, meta_path: str) -> Optional[dict]:
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, key: tuple, frame: pd.DataFrame, meta: Optional[dict] = None) -> bool:
+        """
+        전체 데이터를 새로 쓴다 (append()로 쌓인 조각 파일은 지운다)
+
+        :param key: 범위를 구분하는 값 (스프레드시트 id, 시트 이름, 범위 등)
+        :param meta: 같이 저장할 JSON 메타데이터
+        """
+        data_path, meta_path = self._paths(key)
+        meta = dict(meta or {})
+        meta.update({"key": [str(part) for part in key], "rows": len(frame), "base_rows": len(frame),
+                     "segments": [], "saved_at": time.time()})
+        suffix = f".{os.getpid()}.{time.monotonic_ns()}.tmp"
+        with self._lock:
+            try:
+                frame.to_parquet(data_path + suffix, index=False)
+                # 데이터 먼저, 메타데이터 나중에 바꿔서 메타데이터가 가리키는 데이터가 항상 같거나 더 새 것이 되도록 한다
+                os.replace(data_path + suffix, data_path)
+                self._write_meta(meta_path, meta, suffix)
+            except Exception as e:
+                logging.error(f"로컬 미러 저장 실패 : {key} - {e}")
+                for path in (data_path + suffix, meta_path + suffix):
+                    if os.path.exists(path):
+                        os.remove(path)
+                return False
+
+            # 이제 메타데이터가 가리키지 않는 조각 파일 정리
+            for segment_path in glob.glob(f"{data_path[:-len('.parquet')]}.{'[0-9]' * 6}.parquet"):
+                try:
+                    os.remove(segment_path)
+                except OSError as e:
+                    logging.warning(f"로컬 미러 조각 파일 삭제 실패 : {segment_path} - {e}")
+            return True
+
+    def append(self, key: tuple, new_rows: pd.DataFrame, meta: Optional[dict] = None) -> bool:
+        """
+        이미 저장된 데이터 뒤에 새 행만 조각 파일 1개로 붙인다 (새 행 수만큼만 디스크에 씀).
+
+        :param meta: 메타데이터에 덮어쓸 값 (증분 로드 위치 등)
+        :return: 붙였으면 True, 저장된 데이터가 없거나 조각이 max_segments개를 넘으면 False (save()로 전체를 다시 써야 함)
+        """
+        data_path, meta_path = self._paths(key)
+        suffix = f".{os.getpid()}.{time.monotonic_ns()}.tmp"
+        with self._lock:
+            try:
+                stored = self._read_meta(meta_path)
+            except Exception as e:
+                logging.error(f"로컬 미러 메타데이터 읽기 실패 : {key} - {e}")
+                return False
+            if stored is None or len(stored.get("segments", [])) >= self.max_segments:
+                return False
+            if new_rows.empty:
+                return True
+
+            number = stored.get("next_segment", len(stored.get("segments", [])))
+            segment_path = self._segment_path(data_path, number)
+            stored.update(meta or {})
+            stored["segments"] = stored.get("segments", []) + [{"file": os.path.basename(segment_path), "rows": len(new_rows)}]
+            stored["next_segment"] = number + 1
+            stored["rows"] = stored["rows"] + len(new_rows)
+            stored["saved_at"] = time.time()
+            try:
+                new_rows.to_parquet(segment_path + suffix, index=False)
+                os.replace(segment_path + suffix, segment_path)
+                self._write_meta(meta_path, stored, suffix)
+                return True
+            except Exception as e:
+                logging.error(f"로컬 미러 조각 저장 실패 : {key} - {e}")
+                for path in (segment_path + suffix, meta_path + suffix):
+                    if os.path.exists(path):
+                        os.remove(path)
+                return False
+
+    def load(self, key: tuple) -> Optional[Tuple[pd.DataFrame, dict]]:
+        """저장된 (DataFrame, 메타데이터), 없거나 읽지 못하면 None (조각 파일은 이어 붙여서 돌려준다)"""
+        data_path, meta_path = self._paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with self._lock:
+                meta = self._read_meta(meta_path)
+                frames = [pd.read_parquet(data_path)]
+                for segment in meta.get("segments", []):
+                    frames.append(pd.read_parquet(os.path.join(self.cache_dir, segment["file"])))
+            frame = concat_typed(frames)
+        except Exception as e:
+            logging.error(f"로컬 미러 읽기 실패 : {key} - {e}")
+            return None
+        if len(frame) != meta.get("rows"):
+            logging.warning(f"로컬 미러 데이터와 메타데이터가 맞지 않아 사용하지 않습니다 : {key}")
+            return None
+        return frame, meta
@@ -0,0 +1,104 @@
+import logging
+import threading
+from typing import Callable, Dict, Mapping, Optional
+
+from util.data_load.fleet_snapshot import FleetSnapshot
+from util.data_load.snapshot_holder import SnapshotHolder
+
+
+class SheetPoller:
+    """
+    지도 데이터 시트를 백그라운드 스레드에서 주기적으로 읽어서
+    SnapshotHolder의 FleetSnapshot 묶음을 새 버전으로 교체하는 폴러.
+
+    - 화면(render)에서는 holder.get()만 읽기 때문에 네트워크를 기다리지 않는다.
+    - 읽기에 실패하면 로그만 남기고 이전 스냅샷을 그대로 둔다.
+    - load_snapshots가 빈 dict를 돌려주면(데이터 변경 없음) 새 버전을 게시하지 않는다.
+    - get_app()(cache_resource)의 SecureLoginApp이 1개만 만들어서 모든 세션이 같이 쓴다.
+    """
+
+    def __init__(
+        self,
+        load_snapshots: Callable[[Mapping[str, FleetSnapshot], bool], Dict[str, FleetSnapshot]],
+        holder: SnapshotHolder,
+        interval: float = 30.0,
+        name: str = "sheet-poller",
+    ):
+        """
+        :param load_snapshots: (이전 스냅샷 묶음, 강제로 읽을지)를 받아서 새 스냅샷 묶음을 읽어오는 함수
+        :param holder: 스냅샷을 게시할 공용 저장소
+        :param interval: 폴링 간격(초)
+        """
+        self.load_snapshots = load_snapshots
+        self.holder = holder
+        self.interval = interval
+        self.name = name
+
+        self._refresh_requested = threading.Event()
+        self._force_requested = False
+        self._stop_requested = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.polls = 0
+        self.failures = 0
+        self.unchanged = 0
+
+    # -----------------------
+    # 스레드 제어
+    # -----------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_requested.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_requested.set()
+        self._refresh_requested.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request_refresh(self, wait: float = 0.0) -> bool:
+        """
+        다음 주기를 기다리지 않고 바로 다시 읽도록 요청한다. (변경 감지와 상관없이 강제로 읽음)
+
+        :param wait: 새 버전이 게시될 때까지 기다릴 최대 시간(초), 0이면 기다리지 않음
+        :return: 기다리는 동안 새 버전이 게시됐으면 True
+        """
+        version = self.holder.version
+        self._force_requested = True
+        self._refresh_requested.set()
+        if wait <= 0:
+            return False
+        return self.holder.wait_for_version(version, wait)
+
+    # -----------------------
+    # 폴링
+    # -----------------------
+    def poll_once(self, force: bool = False) -> bool:
+        """시트를 한 번 읽어서 새 버전으로 게시한다 (실패하면 False)"""
+        # 네트워크 요청은 잠금 밖에서 하고, 게시할 때만 holder의 잠금을 잡는다
+        current = self.holder.get()
+        self.polls += 1
+        try:
+            snapshots = self.load_snapshots(current.snapshots, force)
+        except Exception as e:
+            self.failures += 1
+            logging.error(f"시트 폴링 실패 - 이전 스냅샷 유지 (버전 {current.version}) : {e}")
+            return False
+
+        if not snapshots:
+            self.unchanged += 1
+            return True
+        self.holder.update(lambda state: state.with_snapshots(snapshots))
+        return True
+
+    def _run(self) -> None:
+        while not self._stop_requested.is_set():
+            self._refresh_requested.wait(self.interval)
+            self._refresh_requested.clear()
+            if self._stop_requested.is_set():
+                break
+            force, self._force_requested = self._force_requested, False
+            self.poll_once(force)
@@ -0,0 +1,69 @@
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class SharedState:
+    """
+    모든 세션이 같이 보는 앱 데이터 (읽기 전용).
+    값을 바꿀 때는 SnapshotHolder.update()로 새 SharedState를 만들어서 통째로 교체한다.
+    """
+    version: int = 0
+    snapshots: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    user_db: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    updated_at: float = 0.0
+
+    def __post_init__(self):
+        # 밖에서 넘긴 dict를 나중에 수정해도 state가 바뀌지 않도록 복사해서 읽기 전용으로 감싼다
+        object.__setattr__(self, "snapshots", MappingProxyType(dict(self.snapshots)))
+        object.__setattr__(self, "user_db", MappingProxyType(dict(self.user_db)))
+
+    def with_snapshots(self, snapshots: Mapping[str, Any]) -> "SharedState":
+        merged = dict(self.snapshots)
+        merged.update(snapshots)
+        return replace(self, snapshots=merged)
+
+    def with_user_db(self, user_db: Mapping[str, str]) -> "SharedState":
+        return replace(self, user_db=user_db)
+
+
+class SnapshotHolder:
+    """
+    SharedState를 copy-on-write로 들고 있는 저장소.
+
+    - 읽기(get)는 잠금 없이 현재 state 참조 1개만 리턴한다. state는 수정되지 않으므로
+      읽는 도중에 값이 섞이는(torn read) 일이 없다.
+    - 쓰기(update)는 잠금 안에서 현재 state를 받아 새 state를 만들고 버전을 1 올려서 교체한다.
+      폴러/새로고침/로그인 잠금 처리가 동시에 써도 서로의 변경을 덮어쓰지 않는다.
+    """
+
+    def __init__(self, initial: Optional[SharedState] = None):
+        self._state = initial or SharedState()
+        self._condition = threading.Condition()
+
+    def get(self) -> SharedState:
+        return self._state
+
+    @property
+    def version(self) -> int:
+        return self._state.version
+
+    def update(self, mutate: Callable[[SharedState], SharedState]) -> SharedState:
+        """
+        :param mutate: 현재 state를 받아서 새 state를 리턴하는 함수 (잠금 안에서 호출되므로 네트워크 요청 금지)
+        :return: 새로 게시된 state
+        """
+        with self._condition:
+            state = mutate(self._state)
+            state = replace(state, version=self._state.version + 1, updated_at=time.time())
+            self._state = state
+            self._condition.notify_all()
+        return state
+
+    def wait_for_version(self, version: int, timeout: float) -> bool:
+        """version보다 새 버전이 게시될 때까지 최대 timeout초 기다린다"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._state.version > version, timeout=timeout)
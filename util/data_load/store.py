@@ -0,0 +1,553 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import string
+import threading
+import time
+from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+
+import pandas as pd
+
+import util.error_log.errors as errors
+from util.data_load.schema import apply_schema
+
+
+# 설정(STORE_BACKEND)으로 고를 수 있는 저장소 종류
+STORE_BACKENDS = ("google", "excel", "memory")
+
+
+@runtime_checkable
+class TabularStore(Protocol):
+    """
+    앱이 시트 데이터를 읽고 쓸 때 쓰는 저장소 인터페이스.
+    구현: GoogleSheet (구글 시트), ExcelSheet (.xlsx 파일), MemorySheet (메모리, 오프라인 테스트용)
+
+    - 시트 1행은 헤더, 2행부터 데이터
+    - key_cols를 주면 key 열이 처음 비는 행 앞까지만 읽는다 (parse_fetched_rows)
+    - schema를 주면 숫자/날짜를 원래 값으로 읽어서 타입을 변환한다 (util.data_load.schema)
+    - 헤더만 있는 시트는 구글 시트 / 메모리는 EmptyDataError, 엑셀은 원래 동작대로 헤더만 있는 빈 DataFrame
+    """
+    spreadsheet_name: str
+    # query_rows()가 조건 / 페이지를 서버에서 처리하면 True (False면 전체를 읽어서 거르므로 메모리에 있는 데이터를 쓰는 편이 낫다)
+    SERVER_QUERY: bool
+
+    def load_as_dataframe(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], use_cache=True, cache_ttl=None, schema=None) -> pd.DataFrame: ...
+
+    def load_as_dataframe_incremental(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], full_reload_after=None, schema=None) -> pd.DataFrame: ...
+
+    def load_many(self, ranges: Dict[str, tuple], incremental=(), use_cache=True, full_reload_after=None) -> Dict[str, pd.DataFrame]: ...
+
+    def load_from_mirror(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], schema=None, incremental=False) -> Optional[pd.DataFrame]: ...
+
+    def query_rows(self, sheet_name, start_col_letter: str, end_col_letter: str, filters: Dict[str, Any] = None, order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None, offset: int = 0, schema=None, use_cache=True, cache_ttl=None) -> pd.DataFrame: ...
+
+    def get_change_signal(self, sheet_name: Optional[str] = None, sentinel_range: Optional[str] = None) -> str: ...
+
+    def load_as_dataframe_conditional(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], schema=None, sentinel_range=None, max_age=None) -> tuple: ...
+
+    def load_many_conditional(self, ranges: Dict[str, tuple], incremental=(), max_age=None, full_reload_after=None) -> Dict[str, tuple]: ...
+
+    def get_data_version(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], schema=None, sentinel_range=None) -> Optional[int]: ...
+
+    def load_one_line(self, sheet_name: str, start_col_letter: str, end_col_letter: str) -> dict: ...
+
+    def get_value_by_cell(self, sheet_name: str, cell_pos: str) -> str: ...
+
+    def set_value_by_cell(self, sheet_name: str, cell_pos: str, update_data: str) -> None: ...
+
+    def write_rows(self, sheet_name, output_rows, value_input_option="RAW"): ...
+
+    def update(self, sheet_name, output_rows, start_col_letter): ...
+
+    def update_oneline(self, sheet_name: str, oneline_data: list, start_col_letter: str): ...
+
+
+# -----------------------
+# 공통 파싱 (모든 저장소가 같은 규칙으로 읽도록)
+# -----------------------
+def parse_fetched_rows(sheet_name, sheet_data, start_col_letter, end_col_letter, key_col_letters):
+    """시트에서 받아온 2차원 값 목록을 검사하고, 키 컬럼이 비는 행 앞까지 잘라서 리턴한다"""
+    sheet_data = [list(row) for row in sheet_data] or [[]]
+    col_len = string.ascii_uppercase.index(end_col_letter) - string.ascii_uppercase.index(start_col_letter) + 1
+    for row_index, row in enumerate(sheet_data):
+        for col_index in range(col_len):
+            if col_index >= len(row):
+                sheet_data[row_index].append('')
+
+    if sheet_data == [[]] or len(sheet_data) == 1:
+        print("Fail 구글 시트에서 데이터가 비어 있습니다. 시트와 범위를 확인해주세요.")
+        raise errors.EmptyDataError
+    elif len(sheet_data) == 2:
+        for row_index, row in enumerate(sheet_data):
+            for value in row:
+                if value == "#N/A":
+                    print("Fail 구글 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
+                    raise errors.EmptyDataError
+        print(f"{sheet_name} - Success 구글 시트에서 데이터를 성공적으로 가져왔습니다.")
+    else:
+        for row_index, row in enumerate(sheet_data):
+            for value in row:
+                if value == "#N/A":
+                    print("Fail 구글 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
+                    raise errors.EmptyDataError
+            if row_index == 1:
+                break
+        print(f"{sheet_name} - Success 구글 시트에서 데이터를 성공적으로 가져왔습니다.")
+
+    fetched_data = sheet_data
+    key_col_indexs = [string.ascii_uppercase.index(key_col_letter) for key_col_letter in key_col_letters]
+    for index, row in enumerate(sheet_data):
+        for key_col_index in key_col_indexs:
+            key_col_index = key_col_index - string.ascii_uppercase.index(start_col_letter)
+            if row[key_col_index] == '' or row[key_col_index] is None:
+                fetched_data = sheet_data[:index]
+                return fetched_data
+
+    return fetched_data
+
+
+def rows_to_dataframe(load_data, schema=None):
+    col_length = len(load_data[0])
+    for index, row in enumerate(load_data):
+        while len(load_data[index]) < col_length:
+            load_data[index].append("")
+
+    if len(load_data) == 1:
+        df_sheet = pd.DataFrame(load_data[1:], columns=load_data[0])
+        return pd.DataFrame(load_data)
+    elif len(load_data[0]) == len(load_data[1]):
+        df_sheet = pd.DataFrame(load_data[1:], columns=load_data[0])
+    else:
+        raise ValueError("Columns and data length do not match.")
+
+    if schema:
+        df_sheet = apply_schema(df_sheet, schema)
+    return df_sheet
+
+
+def parse_one_line(sheet_name, sheet_data) -> dict:
+    """헤더(1행) + 값(2행)을 {헤더: 값}으로 만든다 (load_one_line 공통)"""
+    if sheet_data == [[]] or len(sheet_data) <= 1:
+        print("Fail 구글 시트에서 데이터가 비어 있습니다. 시트와 범위를 확인해주세요.")
+        raise errors.EmptyDataError
+    for row in sheet_data[:2]:
+        for value in row:
+            if value == "#N/A":
+                print("Fail 구글 시트에서 데이터가 비어 있거나 함수오류로 #N/A가 데이터에 있습니다")
+                raise errors.EmptyDataError
+    print(f"{sheet_name} - Success 구글 시트에서 데이터를 가져왔습니다.")
+
+    oneline_dict = {}
+    for col_index, header in enumerate(sheet_data[0]):
+        oneline_dict[header] = sheet_data[1][col_index] if col_index < len(sheet_data[1]) else ''
+    return oneline_dict
+
+
+def col_letter_to_index(letter: str) -> int:
+    """A -> 0, B -> 1, ..., AA -> 26"""
+    number = 0
+    for char in letter.upper():
+        number = number * 26 + (ord(char) - ord("A")) + 1
+    return number - 1
+
+
+def split_cell_pos(cell_pos: str) -> tuple:
+    """'B2' -> (행 번호 2, 열 문자 'B')"""
+    if not isinstance(cell_pos, str):
+        raise ValueError(f"cell_pos는 문자열이어야 합니다: {cell_pos}")
+    match = re.match(r"^([A-Z]+)(\d+)$", cell_pos.strip().upper())
+    if not match:
+        raise ValueError("cell_pos는 'B2'처럼 A1 표기 형식이어야 합니다.")
+    return int(match.group(2)), match.group(1)
+
+
+def filter_rows(df_sheet: pd.DataFrame, start_col_letter: str, filters: Dict[str, Any] = None, order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
+    """
+    query_rows()를 서버 쿼리 없이 DataFrame에서 흉내낸다 (열 문자 기준, 값은 문자열로 비교)
+    """
+    start_index = col_letter_to_index(start_col_letter)
+    if filters:
+        mask = pd.Series(True, index=df_sheet.index)
+        for col_letter, value in filters.items():
+            column = df_sheet.iloc[:, col_letter_to_index(col_letter) - start_index]
+            mask &= column.astype(str) == str(value)
+        df_sheet = df_sheet[mask]
+    if order_by:
+        column_name = df_sheet.columns[col_letter_to_index(order_by) - start_index]
+        df_sheet = df_sheet.sort_values(column_name, ascending=not descending, kind="stable")
+    stop = offset + limit if limit is not None else None
+    return df_sheet.iloc[offset:stop].reset_index(drop=True)
+
+
+# -----------------------
+# 조건부 읽기 (모든 저장소 공통)
+# -----------------------
+class ConditionalLoads:
+    """
+    저장소의 변경 신호(get_change_signal)를 먼저 확인해서, 바뀌지 않았으면 시트를 읽지 않는 조건부 읽기.
+    범위별로 마지막 변경 신호 / 마지막으로 읽은 DataFrame / 데이터 버전을 기억한다.
+
+    변경 신호(Drive version 등)는 스프레드시트 전체 단위라서 다른 시트만 바뀌어도(예: 앱이 직접 쓰는 로그인 기록) 바뀐다.
+    그래서 신호가 바뀌어 다시 읽었어도 그 범위의 내용이 이전과 같으면 데이터 버전을 올리지 않는다.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._states: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], schema=None, sentinel_range=None) -> tuple:
+        return (sheet_name, start_col_letter.upper(), end_col_letter.upper(),
+                tuple(letter.upper() for letter in key_cols or []), bool(schema), sentinel_range)
+
+    def _signal(self, sheet_name=None, sentinel_range=None) -> Optional[str]:
+        try:
+            return self.store.get_change_signal(sheet_name, sentinel_range)
+        except Exception as e:
+            # 신호를 못 받으면 바뀐 것으로 보고 다시 읽는다
+            logging.error(f"변경 신호 확인 실패 - 다시 읽습니다 : {sheet_name or self.store.spreadsheet_name} - {e}")
+            return None
+
+    def _is_unchanged(self, state: Optional[dict], signal: Optional[str], max_age) -> bool:
+        """신호가 같고 max_age(초)가 지나지 않았으면 True"""
+        if signal is None or state is None or state["signal"] != signal:
+            return False
+        return max_age is None or time.monotonic() - state["loaded_at"] <= max_age
+
+    def _publish(self, state_key: tuple, signal: Optional[str], frame: pd.DataFrame) -> tuple:
+        """
+        새로 읽은 DataFrame을 기록한다. 내용이 이전과 같으면 이전 DataFrame / 버전을 그대로 둔다.
+        :return: (DataFrame, 데이터 버전, 내용이 바뀌었는지)
+        """
+        with self._lock:
+            state = self._states.get(state_key)
+            changed = state is None or not state["frame"].equals(frame)
+            if changed:
+                version = state["version"] + 1 if state is not None else 1
+            else:
+                frame, version = state["frame"], state["version"]
+            self._states[state_key] = {"signal": signal, "frame": frame, "version": version, "loaded_at": time.monotonic()}
+        return frame, version, changed
+
+    def load(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], schema=None, sentinel_range=None, max_age=None) -> tuple:
+        """load_as_dataframe_conditional() 구현"""
+        state_key = self.make_key(sheet_name, start_col_letter, end_col_letter, key_cols, schema, sentinel_range)
+        signal = self._signal(sheet_name, sentinel_range)
+        with self._lock:
+            state = self._states.get(state_key)
+            if self._is_unchanged(state, signal, max_age):
+                return state["frame"].copy(), state["version"], False
+
+        df_sheet = self.store.load_as_dataframe(sheet_name, start_col_letter, end_col_letter, key_cols, use_cache=False, schema=schema)
+        df_sheet, version, changed = self._publish(state_key, signal, df_sheet)
+        return df_sheet.copy(), version, changed
+
+    def load_many(self, ranges: Dict[str, tuple], incremental=(), max_age=None, full_reload_after=None) -> Dict[str, tuple]:
+        """load_many_conditional() 구현 (변경 신호는 전체 범위에 대해 한 번만 확인)"""
+        state_keys = {}
+        for name, entry in ranges.items():
+            sheet_name, start_col_letter, end_col_letter, key_cols, schema = (tuple(entry) + ([], None))[:5]
+            state_keys[name] = self.make_key(sheet_name, start_col_letter, end_col_letter, key_cols, schema)
+
+        signal = self._signal()
+        with self._lock:
+            if all(self._is_unchanged(self._states.get(state_key), signal, max_age) for state_key in state_keys.values()):
+                return {}
+
+        frames = self.store.load_many(ranges, incremental=incremental, use_cache=False, full_reload_after=full_reload_after)
+        changed_frames = {}
+        for name, frame in frames.items():
+            frame, version, changed = self._publish(state_keys[name], signal, frame)
+            if changed:
+                changed_frames[name] = (frame.copy(), version)
+        return changed_frames
+
+    def version(self, sheet_name, start_col_letter: str, end_col_letter: str, key_cols=[], schema=None, sentinel_range=None) -> Optional[int]:
+        """get_data_version() 구현"""
+        state_key = self.make_key(sheet_name, start_col_letter, end_col_letter, key_cols, schema, sentinel_range)
+        with self._lock:
+            state = self._states.get(state_key)
+        return state["version"] if state is not None else None
+
+
+class TabularStoreBase:
+    """
+    구글 시트 전용 기능(증분 로드, 여러 범위 한 번에 읽기, 로컬 미러, gviz 쿼리)을
+    load_as_dataframe() 기준으로 똑같은 결과가 나오게 흉내내는 기본 구현.
+    ExcelSheet / MemorySheet가 상속해서 쓴다.
+    """
+    # query_rows()도 전체를 읽어서 메모리에서 거른다
+    SERVER_QUERY = False
+
+    def load_as_dataframe_incremental(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], full_reload_after=None, schema=None):
+        return self.load_as_dataframe(sheet_name, start_col_letter, end_col_letter, key_cols, use_cache=False, schema=schema)
+
+    def load_many(self, ranges: Dict[str, tuple], incremental=(), use_cache=True, full_reload_after=None) -> Dict[str, pd.DataFrame]:
+        frames = {}
+        for name, entry in ranges.items():
+            sheet_name, start_col_letter, end_col_letter, key_cols, schema = (tuple(entry) + ([], None))[:5]
+            frames[name] = self.load_as_dataframe(sheet_name, start_col_letter, end_col_letter, key_cols, use_cache=use_cache, schema=schema)
+        return frames
+
+    def load_from_mirror(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None, incremental=False):
+        """로컬 미러 없음 (원본이 로컬이라 필요 없음)"""
+        return None
+
+    def load_as_dataframe_conditional(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None, sentinel_range=None, max_age=None) -> tuple:
+        return self._conditional_loads.load(sheet_name, start_col_letter, end_col_letter, key_cols, schema, sentinel_range, max_age)
+
+    def load_many_conditional(self, ranges: Dict[str, tuple], incremental=(), max_age=None, full_reload_after=None) -> Dict[str, tuple]:
+        return self._conditional_loads.load_many(ranges, incremental, max_age, full_reload_after)
+
+    def get_data_version(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], schema=None, sentinel_range=None) -> Optional[int]:
+        return self._conditional_loads.version(sheet_name, start_col_letter, end_col_letter, key_cols, schema, sentinel_range)
+
+    def query_rows(self, sheet_name, start_col_letter :str, end_col_letter :str, filters: Dict[str, Any] = None, order_by: Optional[str] = None, descending: bool = False, limit: Optional[int] = None, offset: int = 0, schema=None, use_cache=True, cache_ttl=None) -> pd.DataFrame:
+        df_sheet = self.load_as_dataframe(sheet_name, start_col_letter, end_col_letter, use_cache=use_cache, cache_ttl=cache_ttl, schema=schema)
+        return filter_rows(df_sheet, start_col_letter, filters, order_by, descending, limit, offset)
+
+    def write_rows(self, sheet_name, output_rows, value_input_option="RAW"):
+        if not output_rows:
+            raise ValueError("출력할 데이터가 입력되지 않았습니다.")
+        self.update(sheet_name, output_rows, "A")
+
+    def update_oneline(self, sheet_name: str, oneline_data: list, start_col_letter: str):
+        if not oneline_data:
+            raise ValueError("Data list is empty. Update not performed.")
+        self.update(sheet_name, [oneline_data], start_col_letter)
+
+    def _range_signal(self, sheet_name: str, sentinel_range: str) -> str:
+        """작은 범위 값의 해시 (get_change_signal의 sentinel_range용)"""
+        start, _, end = sentinel_range.partition(":")
+        first_row, start_col_letter = split_cell_pos(start)
+        last_row, end_col_letter = split_cell_pos(end or start)
+        values = self._get_values(sheet_name, start_col_letter, end_col_letter, first_row, last_row, unformatted=True)
+        digest = hashlib.sha1(json.dumps(values, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+        return f"range:{digest}"
+
+
+def format_cell_value(value) -> str:
+    """화면에 보이는 값(FORMATTED_VALUE)처럼 문자열로 바꾼다"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def trim_values(rows, unformatted=False) -> List[list]:
+    """
+    2차원 값 목록을 구글 시트 API 응답 모양으로 만든다.
+    (행 끝의 빈칸과 맨 아래 빈 행은 잘라내고, unformatted가 아니면 값을 문자열로 바꾼다)
+    """
+    values = []
+    for row in rows:
+        row = [("" if value is None else value) if unformatted else format_cell_value(value) for value in row]
+        while row and row[-1] == "":
+            row.pop()
+        values.append(row)
+    while values and not values[-1]:
+        values.pop()
+    return values
+
+
+class MemorySheet(TabularStoreBase):
+    """
+    시트를 메모리의 2차원 리스트로 흉내내는 저장소 (네트워크 없음).
+    성능 작업 / 부하 테스트를 구글 시트와 같은 읽기 규칙으로 오프라인에서 돌릴 때 쓴다.
+
+    - 셀 값은 넣은 그대로 들고 있고, 읽을 때 schema가 없으면 문자열(FORMATTED_VALUE)로, 있으면 원래 값으로 돌려준다.
+    - 값을 돌려줄 때 구글 시트 API처럼 행 끝의 빈칸과 맨 아래 빈 행은 잘라낸다.
+    - latency를 주면 요청마다 그만큼 기다려서 네트워크 지연을 흉내낸다.
+    """
+
+    def __init__(self, spreadsheet_name: str = "memory", sheets: Optional[Dict[str, List[list]]] = None, latency: float = 0.0):
+        """
+        :param sheets: {시트 이름: 2차원 값 리스트 (1행 = 헤더)}
+        :param latency: 요청 1번당 기다릴 시간(초)
+        """
+        self.spreadsheet_name = spreadsheet_name
+        self.latency = latency
+        self._sheets: Dict[str, List[list]] = {
+            sheet_name: [list(row) for row in rows] for sheet_name, rows in (sheets or {}).items()
+        }
+        self._lock = threading.RLock()
+        # 쓰기가 있을 때마다 1씩 올라가는 값 (get_change_signal)
+        self.revision = 0
+        self.requests = 0
+        self._conditional_loads = ConditionalLoads(self)
+
+    @classmethod
+    def from_excel(cls, spreadsheet_path: str, latency: float = 0.0) -> "MemorySheet":
+        """엑셀 파일의 모든 시트를 읽어서 메모리 저장소를 만든다"""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(spreadsheet_path, read_only=True, data_only=True)
+        try:
+            sheets = {
+                worksheet.title: [list(row) for row in worksheet.iter_rows(values_only=True)]
+                for worksheet in workbook.worksheets
+            }
+        finally:
+            workbook.close()
+        return cls(os.path.splitext(os.path.basename(spreadsheet_path))[0], sheets, latency)
+
+    def add_sheet(self, sheet_name: str, rows: Optional[List[list]] = None) -> None:
+        with self._lock:
+            self._sheets[sheet_name] = [list(row) for row in rows or []]
+            self.revision += 1
+
+    def load_sheet(self, sheet_name: str) -> List[list]:
+        """시트의 2차원 값 리스트 (원본이므로 직접 수정하지 말 것)"""
+        sheet = self._sheets.get(sheet_name)
+        if sheet is None:
+            raise ValueError(f"{sheet_name} 시트를 불러오지 못했습니다.")
+        return sheet
+
+    def _request(self) -> None:
+        self.requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _get_values(self, sheet_name, start_col_letter, end_col_letter, first_row=1, last_row=None, unformatted=False) -> List[list]:
+        """A1 범위 값을 구글 시트 API 응답 모양으로 돌려준다"""
+        start_index = col_letter_to_index(start_col_letter)
+        end_index = col_letter_to_index(end_col_letter)
+        with self._lock:
+            rows = [row[start_index:end_index + 1] for row in self.load_sheet(sheet_name)[first_row - 1:last_row]]
+        return trim_values(rows, unformatted)
+
+    def _set_values(self, sheet, row_number: int, col_index: int, values: list) -> None:
+        while len(sheet) < row_number:
+            sheet.append([])
+        row = sheet[row_number - 1]
+        while len(row) < col_index + len(values):
+            row.append(None)
+        row[col_index:col_index + len(values)] = values
+
+    # -----------------------
+    # 읽기
+    # -----------------------
+    def load_as_fetched_data(self, sheet_name, start_col_letter, end_col_letter, key_col_letters=[], unformatted=False):
+        self._request()
+        start_col_letter = start_col_letter.upper()
+        end_col_letter = end_col_letter.upper()
+        key_col_letters = [letter.upper() for letter in key_col_letters]
+        for key_col_letter in key_col_letters:
+            if not(start_col_letter <= key_col_letter <= end_col_letter):
+                raise ValueError(f"key_col_letter이 start_col와 end_col 사이의 범위를 벗어났습니다: {key_col_letter}")
+        sheet_data = self._get_values(sheet_name, start_col_letter, end_col_letter, unformatted=unformatted)
+        return parse_fetched_rows(sheet_name, sheet_data, start_col_letter, end_col_letter, key_col_letters)
+
+    def load_as_dataframe(self, sheet_name, start_col_letter :str, end_col_letter :str, key_cols=[], use_cache=True, cache_ttl=None, schema=None):
+        load_data = self.load_as_fetched_data(sheet_name, start_col_letter, end_col_letter, key_cols, unformatted=bool(schema))
+        return rows_to_dataframe(load_data, schema)
+
+    def load_one_line(self, sheet_name:str, start_col_letter:str, end_col_letter:str) -> dict:
+        self._request()
+        sheet_data = self._get_values(sheet_name, start_col_letter, end_col_letter, 1, 2) or [[]]
+        return parse_one_line(sheet_name, sheet_data)
+
+    def get_change_signal(self, sheet_name: Optional[str] = None, sentinel_range: Optional[str] = None) -> str:
+        self._request()
+        if sentinel_range is None:
+            return f"memory:{self.revision}"
+        return self._range_signal(sheet_name, sentinel_range)
+
+    def get_value_by_cell(self, sheet_name: str, cell_pos: str) -> str:
+        self._request()
+        row_number, col_letter = split_cell_pos(cell_pos)
+        values = self._get_values(sheet_name, col_letter, col_letter, row_number, row_number)
+        return values[0][0] if values and values[0] else None
+
+    # -----------------------
+    # 쓰기
+    # -----------------------
+    def set_value_by_cell(self, sheet_name: str, cell_pos: str, update_data: str) -> None:
+        self._request()
+        row_number, col_letter = split_cell_pos(cell_pos)
+        with self._lock:
+            self._set_values(self.load_sheet(sheet_name), row_number, col_letter_to_index(col_letter), [str(update_data)])
+            self.revision += 1
+
+    def update(self, sheet_name, output_rows, start_col_letter):
+        """start_col_letter 열에서 값이 있는 마지막 행 다음에 output_rows를 추가한다 (다른 열의 표는 보지 않음)"""
+        if not output_rows:
+            raise ValueError(f"{sheet_name}에 출력할 데이터가 입력되지 않았습니다.")
+        self._request()
+        col_index = col_letter_to_index(start_col_letter)
+        with self._lock:
+            sheet = self.load_sheet(sheet_name)
+            next_row = len(sheet) + 1
+            while next_row > 1 and (col_index >= len(sheet[next_row - 2]) or sheet[next_row - 2][col_index] in (None, "")):
+                next_row -= 1
+            for offset, row in enumerate(output_rows):
+                self._set_values(sheet, next_row + offset, col_index, list(row))
+            self.revision += 1
+
+    def vlookup_update_many(self, sheet_name: str, key_col_letter: str, updates: Dict[str, list], start_col_letter: Optional[str] = None) -> Dict[str, int]:
+        """여러 key의 행을 vlookup 방식으로 업데이트한다 (없는 key는 맨 아래에 추가)"""
+        if not updates:
+            raise ValueError("Data list is empty. Update not performed.")
+        self._request()
+        start_col_letter = start_col_letter or key_col_letter
+        key_index = col_letter_to_index(key_col_letter)
+        start_index = col_letter_to_index(start_col_letter)
+        with self._lock:
+            sheet = self.load_sheet(sheet_name)
+            rows: Dict[str, int] = {}
+            last_key_row = 0
+            for row_number, row in enumerate(sheet, 1):
+                value = row[key_index] if key_index < len(row) else None
+                if value not in (None, ""):
+                    rows.setdefault(format_cell_value(value), row_number)
+                    last_key_row = row_number
+            result = {}
+            for key, row_values in updates.items():
+                row_number = rows.get(str(key))
+                if row_number is None:
+                    last_key_row += 1
+                    row_number = rows[str(key)] = last_key_row
+                    self._set_values(sheet, row_number, key_index, [key])
+                self._set_values(sheet, row_number, start_index, list(row_values))
+                result[str(key)] = row_number
+            self.revision += 1
+        return result
+
+    def vlookup_update(self, sheet_name: str, key_value: str, key_col_letter: str, start_col_letter: str, data: list):
+        if not data:
+            raise ValueError("Data list is empty. Update not performed.")
+        self.vlookup_update_many(sheet_name, key_col_letter, {key_value: data[0]}, start_col_letter)
+
+
+def create_store(backend: str, spreadsheet_name: str, **options) -> TabularStore:
+    """
+    설정값으로 저장소를 만든다.
+
+    :param backend: "google" | "excel" | "memory"
+    :param options: google - GoogleSheet 인자 (spreadsheet_key, mirror_dir, mirror_sheets ...)
+                    excel - spreadsheet_path, read_only, autosave, sidecar_sheets
+                    memory - spreadsheet_path (있으면 엑셀 파일 내용으로 채움), latency
+    """
+    backend = (backend or "google").lower()
+    if backend == "google":
+        from util.data_load.google_sheet import GoogleSheet
+        return GoogleSheet(spreadsheet_name, **options)
+    if backend == "excel":
+        from util.data_load.excel import ExcelSheet
+        return ExcelSheet(
+            options["spreadsheet_path"],
+            read_only=options.get("read_only", False),
+            autosave=options.get("autosave", True),
+            sidecar_sheets=options.get("sidecar_sheets", ()),
+        )
+    if backend == "memory":
+        if options.get("spreadsheet_path"):
+            return MemorySheet.from_excel(options["spreadsheet_path"], latency=options.get("latency", 0.0))
+        return MemorySheet(spreadsheet_name, latency=options.get("latency", 0.0))
+    raise ValueError(f"알 수 없는 저장소 종류입니다: {backend} (가능한 값: {', '.join(STORE_BACKENDS)})")
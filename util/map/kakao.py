@@ -0,0 +1,94 @@
+# 카카오 지도 Streamlit 컴포넌트 (지도는 한 번만 만들고 바뀐 부분만 보낸다)
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+
+# clusterer 라이브러리를 같이 불러오는 카카오 지도 SDK 주소 (appkey는 format으로 넣는다)
+# autoload=false - 컴포넌트가 스크립트를 나중에 붙이고 kakao.maps.load()로 초기화한다
+KAKAO_SDK_URL = "https://dapi.kakao.com/v2/maps/sdk.js?appkey={appkey}&libraries=clusterer&autoload=false"
+
+# 이 레벨 이상(더 축소)이면 가까운 마커를 클러스터 1개로 묶는다
+CLUSTER_MIN_LEVEL = 4
+
+# 지도 높이(px) - 로드뷰를 같이 보여줄 때는 로드뷰(280) 아래에 지도를 붙인다
+MAP_HEIGHT = 400
+MAP_HEIGHT_WITH_ROADVIEW = 280
+
+_kakao_map_component = components.declare_component(
+    "kakao_map",
+    path=str(Path(__file__).resolve().parent / "frontend"),
+)
+
+
+def kakao_map(
+    key: str,
+    sdk_src: str,
+    points: Callable[[], bytes],
+    points_version: str,
+    view: Mapping[str, Any],
+    selected: Optional[Mapping[str, Any]] = None,
+    track: bool = False,
+    roadview: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    카카오 지도 컴포넌트를 그린다.
+    iframe은 key마다 한 번만 만들어지고, rerun마다 args에서 바뀐 부분만 지도에 반영된다.
+
+    - 점 데이터는 points_version이 바뀔 때만 보낸다. 같은 버전이면 None을 보내서 메시지가 작다.
+      (컴포넌트가 새로 만들어져서 데이터가 없으면 지도가 다시 요청하고, 그때 다시 보낸다)
+    - view(위도/경도/레벨)가 바뀔 때만 지도를 옮긴다. 사용자가 움직인 위치는 rerun으로 되돌리지 않는다.
+    - 선택 지점이 바뀌면 선택 마커 / 인포윈도우 / 로드뷰만 옮긴다.
+
+    :param points: 점 데이터 payload(util.map.payload.build_map_payload)를 돌려주는 함수 (보낼 때만 호출)
+    :param points_version: 점 데이터 버전 (스냅샷 버전, 장비, 페이지 등으로 만든 문자열)
+    :param view: {"lat", "lng", "level"} 지도 중심과 확대 레벨
+    :param selected: 선택 지점 행 (장비ID/차량번호/위도/경도), 없으면 None
+    :param track: 점들을 시간 순서로 이은 경로 선도 그릴지
+    :param roadview: 선택 지점 로드뷰를 지도 위에 같이 보여줄지
+    :return: 이번 rerun에 새로 들어온 마커 클릭 행, 없으면 None
+    """
+    sent_key = f"{key}__points_version"
+    event_key = f"{key}__last_event"
+
+    send_points = st.session_state.get(sent_key) != points_version
+    view = {"lat": float(view["lat"]), "lng": float(view["lng"]), "level": int(view["level"])}
+    if selected is not None:
+        selected = {
+            "장비ID": str(selected["장비ID"]),
+            "차량번호": str(selected["차량번호"]),
+            "위도": float(selected["위도"]),
+            "경도": float(selected["경도"]),
+        }
+
+    event = _kakao_map_component(
+        key=key,
+        default=None,
+        sdk_url=sdk_src,
+        points=points() if send_points else None,
+        points_version=points_version,
+        track=track,
+        view=view,
+        view_id=json.dumps([view["lat"], view["lng"], view["level"], roadview]),
+        selected=selected,
+        roadview=roadview,
+        cluster_min_level=CLUSTER_MIN_LEVEL,
+        map_height=MAP_HEIGHT,
+        map_height_with_roadview=MAP_HEIGHT_WITH_ROADVIEW,
+    )
+    st.session_state[sent_key] = points_version
+
+    # 컴포넌트 값은 다음 rerun에도 그대로 남아 있으므로 (mount, seq)로 처음 보는 이벤트만 처리한다
+    if not event or [event.get("mount"), event.get("seq")] == st.session_state.get(event_key):
+        return None
+    st.session_state[event_key] = [event.get("mount"), event.get("seq")]
+
+    if event.get("event") == "need_points":
+        st.session_state.pop(sent_key, None)
+        st.rerun()
+    if event.get("event") == "click":
+        return event.get("row")
+    return None
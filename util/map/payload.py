@@ -0,0 +1,141 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from util.data_load.schema import SEOUL_TZ
+
+
+# 지도(마커 / 인포윈도우 / 클릭 행)에서 쓰는 컬럼만 보낸다 (모션데이터 등은 보내지 않음)
+MAP_COLUMNS = ("장비ID", "차량번호", "위도", "경도", "시간")
+
+# 좌표 소수점 자리수 (6자리 = 약 0.1m)
+COORD_PRECISION = 6
+
+
+def encode_polyline(lat: np.ndarray, lng: np.ndarray, precision: int = COORD_PRECISION) -> str:
+    """
+    좌표 목록을 Google encoded polyline 문자열로 바꾼다.
+    (precision 자리로 정수화 -> 앞 점과의 차이 -> 부호 비트 -> 5비트씩 잘라서 ASCII)
+    문자 계산은 NumPy로 한 번에 하고, 파이썬에서는 마지막 join만 한다.
+    """
+    scale = 10 ** precision
+    coords = np.column_stack([
+        np.round(np.asarray(lat, dtype=np.float64) * scale),
+        np.round(np.asarray(lng, dtype=np.float64) * scale),
+    ]).astype(np.int64)
+    if len(coords) == 0:
+        return ""
+    deltas = np.diff(coords, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    values = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+
+    # 값 1개당 5비트 조각 최대 7개 (경도 180도 * 10^6 정도까지)
+    shifts = np.arange(7, dtype=np.int64) * 5
+    chunks = (values[:, None] >> shifts) & 0x1F
+    used = np.ones_like(chunks, dtype=bool)
+    used[:, 1:] = (values[:, None] >> shifts[1:]) > 0
+    has_next = np.zeros_like(used)
+    has_next[:, :-1] = used[:, 1:]
+    codes = (chunks | np.where(has_next, 0x20, 0)) + 63
+    return codes[used].astype(np.uint8).tobytes().decode("ascii")
+
+
+def _dictionary_column(values: pd.Series) -> Dict[str, list]:
+    """반복되는 문자열 컬럼을 {"dict": 고유값 목록, "codes": 행별 번호}로"""
+    codes, uniques = pd.factorize(values.astype("string").fillna(""))
+    return {"dict": [str(value) for value in uniques], "codes": codes.tolist()}
+
+
+def _time_column(values: pd.Series) -> list:
+    """시간 컬럼을 epoch 초(정수)로, 비어 있으면 None"""
+    # 저장 단위(ns/us)와 상관없이 초 단위로 바꿔서 정수로 읽는다
+    seconds = values.dt.as_unit("s").array.asi8.tolist()
+    for position in np.flatnonzero(values.isna().to_numpy()):
+        seconds[position] = None
+    return seconds
+
+
+def build_map_payload(
+    frame: pd.DataFrame,
+    columns: Sequence[str] = MAP_COLUMNS,
+    precision: int = COORD_PRECISION,
+    polyline: bool = False,
+    lat_col: str = "위도",
+    lng_col: str = "경도",
+) -> bytes:
+    """
+    지도 컴포넌트에 보낼 점 데이터 (UTF-8 JSON bytes).
+    행마다 key를 반복하는 records 대신 컬럼별 배열(struct-of-arrays)로 보낸다.
+
+    {"n": 행 수, "columns": {컬럼: 배열 | {"dict", "codes"}}, "polyline": 문자열, "precision": 자리수}
+
+    - columns에 있는 컬럼만 보낸다 (시트에 없는 컬럼은 건너뜀)
+    - 좌표가 없는 행은 지도에 그릴 수 없으므로 뺀다
+    - 좌표는 precision 자리로 반올림, 시간은 epoch 초, 문자열은 사전(dict) + 번호(codes)
+    - polyline=True면 위도/경도 배열 대신 encoded polyline 문자열 1개로 보낸다 (경로용)
+    """
+    frame = frame[frame[lat_col].notna() & frame[lng_col].notna()]
+    payload_columns = {}
+    for col in columns:
+        if col not in frame.columns:
+            continue
+        values = frame[col]
+        if col in (lat_col, lng_col):
+            if not polyline:
+                payload_columns[col] = np.round(values.to_numpy(dtype=np.float64), precision).tolist()
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            payload_columns[col] = _time_column(values)
+        elif pd.api.types.is_numeric_dtype(values):
+            payload_columns[col] = [None if pd.isna(value) else value for value in values.tolist()]
+        else:
+            payload_columns[col] = _dictionary_column(values)
+
+    payload = {"n": len(frame), "columns": payload_columns}
+    if polyline:
+        payload["polyline"] = encode_polyline(frame[lat_col].to_numpy(), frame[lng_col].to_numpy(), precision)
+        payload["precision"] = precision
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def payload_time(value) -> Optional[pd.Timestamp]:
+    """payload의 시간 값(epoch 초)을 서울 시간 Timestamp로 (지도에서 클릭한 행을 되돌릴 때)"""
+    if value is None:
+        return None
+    return pd.Timestamp(int(value), unit="s", tz="UTC").tz_convert(SEOUL_TZ)
+
+
+class MapPayloadCache:
+    """
+    지도 payload를 버전 문자열(스냅샷 버전, 장비, 페이지 등)마다 한 번만 만들어 두는 캐시.
+    get_app()의 SecureLoginApp에 1개만 두고 모든 세션이 같이 쓴다.
+    오래된 버전은 max_entries를 넘으면 먼저 들어온 것부터 버린다.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._payloads: "OrderedDict[str, bytes]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: str, build: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            payload = self._payloads.get(version)
+            if payload is not None:
+                self._payloads.move_to_end(version)
+                self.hits += 1
+                return payload
+
+        # 만드는 동안은 잠금을 잡지 않는다 (같은 버전을 두 세션이 동시에 만들면 한 번 더 만들 뿐)
+        payload = build()
+        with self._lock:
+            self.misses += 1
+            self._payloads[version] = payload
+            self._payloads.move_to_end(version)
+            while len(self._payloads) > self.max_entries:
+                self._payloads.popitem(last=False)
+        return payload
@@ -0,0 +1,164 @@
+import heapq
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+EARTH_RADIUS_METERS = 6_371_008.8
+
+DOUGLAS_PEUCKER = "douglas_peucker"
+VISVALINGAM = "visvalingam"
+
+
+def project_to_meters(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """
+    위도/경도를 첫 점 기준 평면 좌표(m, equirectangular)로 바꾼다.
+    오토바이 1대의 경로 정도 범위(수십 km)에서는 오차가 작아서 거리 비교용으로 충분하다.
+
+    :return: (N, 2) 배열 [x(동쪽), y(북쪽)]
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lng = np.asarray(lng, dtype=np.float64)
+    if len(lat) == 0:
+        return np.empty((0, 2))
+    lat_rad = np.radians(lat)
+    lng_rad = np.radians(lng)
+    cos_lat = np.cos(np.mean(lat_rad))
+    x = (lng_rad - lng_rad[0]) * cos_lat * EARTH_RADIUS_METERS
+    y = (lat_rad - lat_rad[0]) * EARTH_RADIUS_METERS
+    return np.column_stack([x, y])
+
+
+def _segment_distances(points: np.ndarray, start: int, end: int) -> np.ndarray:
+    """points[start+1:end]의 각 점에서 선분 points[start]-points[end]까지 거리(m)"""
+    a = points[start]
+    b = points[end]
+    inner = points[start + 1:end]
+    ab = b - a
+    length_sq = float(ab @ ab)
+    if length_sq == 0.0:
+        return np.hypot(*(inner - a).T)
+    t = np.clip(((inner - a) @ ab) / length_sq, 0.0, 1.0)
+    nearest = a + t[:, None] * ab
+    return np.hypot(*(inner - nearest).T)
+
+
+def douglas_peucker(lat, lng, tolerance_m: float) -> np.ndarray:
+    """
+    Douglas-Peucker 단순화. 경로에서 tolerance_m 이상 벗어나는 점만 남긴다.
+    구간마다 거리 계산은 NumPy로 한 번에 하고, 재귀 대신 스택으로 구간을 나눈다.
+
+    :return: 남길 점 bool 마스크 (처음/마지막 점은 항상 True)
+    """
+    points = project_to_meters(lat, lng)
+    count = len(points)
+    keep = np.zeros(count, dtype=bool)
+    if count <= 2:
+        keep[:] = True
+        return keep
+
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(points, start, end)
+        offset = int(np.argmax(distances))
+        if distances[offset] > tolerance_m:
+            split = start + 1 + offset
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return keep
+
+
+def _triangle_areas(points: np.ndarray, prev_idx: np.ndarray, idx: np.ndarray, next_idx: np.ndarray) -> np.ndarray:
+    a = points[prev_idx]
+    b = points[idx]
+    c = points[next_idx]
+    return 0.5 * np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (b[:, 1] - a[:, 1]))
+
+
+def visvalingam(lat, lng, tolerance_m: float) -> np.ndarray:
+    """
+    Visvalingam-Whyatt 단순화. 앞뒤 점과 만드는 삼각형 넓이가 가장 작은 점부터 지우고,
+    남은 점의 최소 넓이가 tolerance_m^2 이상이 되면 멈춘다.
+    처음 넓이는 NumPy로 한 번에 계산하고, 지운 점의 이웃만 다시 계산한다 (힙 사용).
+
+    :return: 남길 점 bool 마스크 (처음/마지막 점은 항상 True)
+    """
+    points = project_to_meters(lat, lng)
+    count = len(points)
+    keep = np.ones(count, dtype=bool)
+    if count <= 2:
+        return keep
+
+    min_area = float(tolerance_m) ** 2
+    prev_idx = np.arange(-1, count - 1)
+    next_idx = np.arange(1, count + 1)
+    areas = np.full(count, np.inf)
+    inner = np.arange(1, count - 1)
+    areas[inner] = _triangle_areas(points, prev_idx[inner], inner, next_idx[inner])
+
+    heap = [(areas[i], i) for i in inner if areas[i] < min_area]
+    heapq.heapify(heap)
+    while heap:
+        area, i = heapq.heappop(heap)
+        if not keep[i] or area != areas[i]:
+            continue  # 이미 지웠거나 넓이가 다시 계산된 오래된 항목
+        keep[i] = False
+        before, after = prev_idx[i], next_idx[i]
+        next_idx[before] = after
+        prev_idx[after] = before
+        for neighbor in (before, after):
+            if 0 < neighbor < count - 1:
+                # 이웃 넓이가 지운 점보다 작아지면 지운 점 넓이로 맞춘다 (지우는 순서가 뒤집히지 않도록)
+                new_area = max(float(_triangle_areas(points, prev_idx[[neighbor]], np.array([neighbor]), next_idx[[neighbor]])[0]), area)
+                areas[neighbor] = new_area
+                if new_area < min_area:
+                    heapq.heappush(heap, (new_area, neighbor))
+    return keep
+
+
+SIMPLIFIERS = {
+    DOUGLAS_PEUCKER: douglas_peucker,
+    VISVALINGAM: visvalingam,
+}
+
+
+def simplify_track(
+    frame: pd.DataFrame,
+    tolerance_m: float,
+    method: str = DOUGLAS_PEUCKER,
+    device_col: str = "장비ID",
+    time_col: Optional[str] = "시간",
+    lat_col: str = "위도",
+    lng_col: str = "경도",
+) -> pd.DataFrame:
+    """
+    장비별 경로를 단순화해서 남긴 행만 돌려준다 (시간 순서, 좌표가 없는 행은 뺌).
+
+    :param tolerance_m: 허용 오차(m), 0 이하면 단순화하지 않는다
+    :param method: "douglas_peucker" | "visvalingam"
+    :param time_col: 정렬 기준 시간 컬럼 (None이면 지금 행 순서 그대로)
+    """
+    if method not in SIMPLIFIERS:
+        raise ValueError(f"지원하지 않는 단순화 방식입니다: {method}")
+    simplifier = SIMPLIFIERS[method]
+
+    frame = frame[frame[lat_col].notna() & frame[lng_col].notna()]
+    if time_col is not None and time_col in frame.columns:
+        frame = frame.sort_values(time_col, kind="stable")
+    if tolerance_m <= 0 or len(frame) <= 2:
+        return frame
+
+    keep = np.zeros(len(frame), dtype=bool)
+    device_codes = pd.factorize(frame[device_col])[0] if device_col in frame.columns else np.zeros(len(frame), dtype=np.int64)
+    lat = frame[lat_col].to_numpy(dtype=np.float64)
+    lng = frame[lng_col].to_numpy(dtype=np.float64)
+    for code in np.unique(device_codes):
+        positions = np.flatnonzero(device_codes == code)
+        keep[positions[simplifier(lat[positions], lng[positions], tolerance_m)]] = True
+    return frame[keep]